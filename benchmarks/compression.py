@@ -0,0 +1,102 @@
+"""
+Compression ratio and CPU cost of streamed chat responses, per protocol and encoding.
+
+Replays a synthetic answer framed the way each HTTP server frames it (NDJSON for
+streamable HTTP, SSE events, one JSON body for REST) through every available
+encoder, flushing per chunk, per coalescing window, or only at the end.
+
+Usage:
+    python benchmarks/compression.py --words 600 --window 4
+"""
+
+from shared.compression import COMPRESSORS
+from colorama import Style
+from colorama import Fore
+from colorama import init
+from datetime import datetime
+from typing import Optional
+from typing import List
+import argparse
+import random
+import json
+import time
+
+# Initialize colorama for cross-platform colored output
+init(autoreset=True)
+
+VOCABULARY = ('the', 'model', 'stream', 'latency', 'token', 'response', 'session', 'protocol', 'network', 'server',
+              'client', 'chunk', 'buffer', 'compress', 'mobile', 'bandwidth', 'answer', 'request', 'a', 'of', 'and', 'to')
+
+
+def chunk_events(words: int, words_per_chunk: int = 4) -> List[dict]:
+    """
+    Build the chunk events of one synthetic answer
+    """
+    rng = random.Random(42)
+    text = [rng.choice(VOCABULARY) for _ in range(words)]
+    events = []
+    for start in range(0, words, words_per_chunk):
+        events.append({
+            'type': 'chunk',
+            'text': ' '.join(text[start:start + words_per_chunk]),
+            'chunk_number': len(events) + 1,
+            'is_final': start + words_per_chunk >= words,
+            'timestamp': datetime.now().isoformat()
+        })
+    return events
+
+
+def frame(protocol: str, events: List[dict]) -> List[bytes]:
+    """
+    Frame events as the given server writes them to the wire
+    """
+    if protocol == 'ndjson':
+        return [(json.dumps(event) + '\n').encode() for event in events]
+    if protocol == 'sse':
+        return [f"id: 1.{number}\r\ndata: {json.dumps(event)}\r\n\r\n".encode() for number, event in enumerate(events)]
+    return [json.dumps({'response': ' '.join(event['text'] for event in events), 'timestamp': datetime.now().isoformat()}).encode()]
+
+
+def measure(encoding: str, frames: List[bytes], window: Optional[int]) -> dict:
+    """
+    Compress frames, flushing every ``window`` frames (None flushes only at the end)
+    """
+    compressor = COMPRESSORS[encoding]()
+    output = 0
+    started = time.thread_time()
+    for index, data in enumerate(frames, start=1):
+        output += len(compressor.compress(data))
+        if window and index % window == 0 and index < len(frames):
+            output += len(compressor.flush())
+    output += len(compressor.finish())
+    cpu = time.thread_time() - started
+
+    raw = sum(len(data) for data in frames)
+    return {'raw': raw, 'compressed': output, 'ratio': raw / output, 'cpu_us_per_frame': cpu * 1e6 / len(frames)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming compression benchmark')
+    parser.add_argument('--words', type=int, default=600, help='Words in the synthetic answer')
+    parser.add_argument('--window', type=int, default=4, help='Chunks per coalesced flush')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs averaged per measurement')
+    args = parser.parse_args()
+
+    events = chunk_events(args.words)
+    print(f"{Fore.YELLOW}📦 {len(events)} chunks, encoders: {', '.join(COMPRESSORS)}{Style.RESET_ALL}")
+    print(f"{'protocol':<9} {'encoding':<9} {'flush':<12} {'raw B':>8} {'wire B':>8} {'ratio':>7} {'CPU µs/frame':>13}")
+
+    for protocol in ('ndjson', 'sse', 'rest'):
+        frames = frame(protocol, events)
+        modes = [('per chunk', 1), (f'every {args.window}', args.window), ('end only', None)] if protocol != 'rest' else [('whole', None)]
+        for encoding in COMPRESSORS:
+            for label, window in modes:
+                runs = [measure(encoding, frames, window) for _ in range(args.repeat)]
+                result = runs[-1]
+                cpu = sum(run['cpu_us_per_frame'] for run in runs) / len(runs)
+                print(f"{Fore.CYAN}{protocol:<9}{Style.RESET_ALL} {encoding:<9} {label:<12} "
+                      f"{result['raw']:>8} {result['compressed']:>8} {result['ratio']:>7.2f} {cpu:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Messages and bytes on the wire per answer for the gRPC Chat stream.
+
+Runs chat turns on concurrent sessions through a local TCP proxy that counts the bytes each
+way, so the byte counts include HTTP/2 framing and whatever compression was negotiated.
+Chunk batching and response compression are server settings: run once against a server
+started with per-word chunks and no compression, then once with the defaults. ``--rpc``
+picks the v1 Chat RPC or ChatV2 (typed events, session ID sent once per stream).
+
+Usage:
+    GRPC_CHUNK_TOKENS=1 GRPC_COMPRESSION=none python protocols/grpc/server.py   # before
+    python benchmarks/grpc_chunks.py --sessions 20 --turns 3
+    python protocols/grpc/server.py                                             # after
+    python benchmarks/grpc_chunks.py --sessions 20 --turns 3
+    python benchmarks/grpc_chunks.py --sessions 20 --turns 3 --rpc v1                 # v1 vs v2
+"""
+
+from colorama import Style
+from colorama import Fore
+from colorama import init
+from typing import Dict
+from typing import List
+import statistics
+import argparse
+import asyncio
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'protocols', 'grpc'))
+
+from codegen import load_stubs
+import grpc
+
+chat_pb2, chat_pb2_grpc = load_stubs()  # generated gRPC code, checked against chat.proto
+
+# Initialize colorama for cross-platform colored output
+init(autoreset=True)
+
+COMPRESSION_ALGORITHMS = {
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+    'none': grpc.Compression.NoCompression
+}
+
+
+class CountingProxy:
+    """
+    TCP proxy that forwards to the server and counts the bytes in each direction
+    """
+
+    def __init__(self, target_host: str, target_port: int):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.bytes_up = 0
+        self.bytes_down = 0
+
+    async def pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, upstream: bool):
+        try:
+            while data := await reader.read(65536):
+                if upstream:
+                    self.bytes_up += len(data)
+                else:
+                    self.bytes_down += len(data)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+        server_reader, server_writer = await asyncio.open_connection(self.target_host, self.target_port)
+        try:
+            await asyncio.gather(
+                self.pipe(client_reader, server_writer, upstream=True),
+                self.pipe(server_reader, client_writer, upstream=False)
+            )
+        except asyncio.CancelledError:
+            pass  # the benchmark finished while the connection was still open
+
+    def reset(self):
+        self.bytes_up = self.bytes_down = 0
+
+
+def response_kind(response) -> str:
+    """
+    Map a v1 ChatResponse or a v2 ChatEvent onto the v2 event kind
+    """
+    if isinstance(response, chat_pb2.ChatEvent):
+        return response.WhichOneof('event')
+    return {
+        chat_pb2.ChatResponse.CHUNK: 'chunk',
+        chat_pb2.ChatResponse.RESPONSE_COMPLETE: 'complete',
+        chat_pb2.ChatResponse.ERROR: 'error'
+    }.get(response.type, 'other')
+
+
+async def run_turn(stub: chat_pb2_grpc.ChatServiceStub, session_id: str, message: str, rpc: str) -> Dict:
+    """
+    Send one message on a Chat stream and count what comes back
+    """
+    async def requests():
+        yield chat_pb2.ChatRequest(type=chat_pb2.ChatRequest.MESSAGE, session_id=session_id, message=message)
+
+    start = time.perf_counter()
+    first_chunk_at = None
+    messages = chunks = payload_bytes = chunk_bytes = 0
+    async for response in (stub.ChatV2 if rpc == 'v2' else stub.Chat)(requests()):
+        kind = response_kind(response)
+        if kind == 'started':
+            continue  # once per stream, not per answer
+        messages += 1
+        payload_bytes += response.ByteSize()
+        if kind == 'chunk':
+            chunks += 1
+            chunk_bytes += response.ByteSize()
+            first_chunk_at = first_chunk_at or time.perf_counter()
+        elif kind in ('complete', 'error'):
+            break
+    end = time.perf_counter()
+    return {
+        'messages': messages,
+        'chunks': chunks,
+        'payload_bytes': payload_bytes,
+        'chunk_bytes': chunk_bytes,
+        'first_chunk': (first_chunk_at or end) - start,
+        'total': end - start
+    }
+
+
+async def run(args) -> None:
+    host, port = args.server.rsplit(':', 1)
+    proxy = CountingProxy(host, int(port))
+    listener = await asyncio.start_server(proxy.handle, '127.0.0.1', 0)
+    proxy_port = listener.sockets[0].getsockname()[1]
+
+    channel = grpc.aio.insecure_channel(f'127.0.0.1:{proxy_port}', compression=COMPRESSION_ALGORITHMS[args.compression])
+    stub = chat_pb2_grpc.ChatServiceStub(channel)
+
+    sessions: List[str] = []
+    for _ in range(args.sessions):
+        response = await stub.CreateSession(chat_pb2.CreateSessionRequest())
+        sessions.append(response.session_id)
+
+    async def converse(session_id: str) -> List[Dict]:
+        return [await run_turn(stub, session_id, args.message, args.rpc) for _ in range(args.turns)]
+
+    proxy.reset()
+    start = time.perf_counter()
+    results = [turn for turns in await asyncio.gather(*(converse(s) for s in sessions)) for turn in turns]
+    elapsed = time.perf_counter() - start
+
+    for session_id in sessions:
+        await stub.DeleteSession(chat_pb2.DeleteSessionRequest(session_id=session_id))
+    await channel.close()
+    listener.close()
+
+    answers = len(results)
+    messages = sum(r['messages'] for r in results)
+    chunks = sum(r['chunks'] for r in results)
+    print(f"{Fore.YELLOW}🧪 {args.sessions} sessions x {args.turns} turns via {args.server} ({args.rpc}), client compression: {args.compression}{Style.RESET_ALL}")
+    print(f"  Answers:               {answers}")
+    print(f"  Messages/answer:       {messages / answers:.1f} ({sum(r['chunks'] for r in results) / answers:.1f} chunks)")
+    print(f"  Messages/sec:          {messages / elapsed:.0f}")
+    print(f"  Payload bytes/answer:  {sum(r['payload_bytes'] for r in results) / answers:.0f}")
+    print(f"  Payload bytes/chunk:   {sum(r['chunk_bytes'] for r in results) / max(chunks, 1):.1f}")
+    print(f"  Wire bytes/answer:     {Fore.CYAN}{proxy.bytes_down / answers:.0f}{Style.RESET_ALL} down, {proxy.bytes_up / answers:.0f} up")
+    print(f"  First chunk (median):  {statistics.median(r['first_chunk'] for r in results) * 1000:.0f} ms")
+    print(f"  Answer time (median):  {statistics.median(r['total'] for r in results) * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='gRPC Chat chunking and compression benchmark')
+    parser.add_argument('--server', default='localhost:50051', help='gRPC server address')
+    parser.add_argument('--sessions', type=int, default=20, help='Concurrent sessions')
+    parser.add_argument('--turns', type=int, default=3, help='Turns per session')
+    parser.add_argument('--message', default='Explain HTTP/2 flow control in one paragraph.', help='Message sent each turn')
+    parser.add_argument('--compression', choices=sorted(COMPRESSION_ALGORITHMS), default='gzip', help='Client request compression')
+    parser.add_argument('--rpc', choices=('v1', 'v2'), default='v2', help='Chat RPC version')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Compare HTTP/1.1 and HTTP/2 for many concurrent chat streams against one server.
+
+Usage (server started with HTTP_MODE=h2c for the HTTP/2 run; HTTP/2 needs `pip install 'httpx[http2]'`):
+    python benchmarks/http2_streams.py --server-url http://localhost:8000 --path /chat/stream --streams 50
+"""
+
+from colorama import Style
+from colorama import Fore
+from colorama import init
+from typing import Optional
+from typing import Dict
+from typing import List
+import statistics
+import argparse
+import asyncio
+import httpx
+import time
+
+# Initialize colorama for cross-platform colored output
+init(autoreset=True)
+
+
+async def run_stream(client: httpx.AsyncClient, url: str, session_id: str, message: str) -> Dict:
+    """
+    Send one streaming chat request and time its first and last line
+    """
+    start = time.perf_counter()
+    first_line_at: Optional[float] = None
+    lines = 0
+
+    async with client.stream('POST', url, json={'message': message, 'session_id': session_id}) as response:
+        stream = response.extensions.get('network_stream')
+        connection = stream.get_extra_info('client_addr') if stream is not None else None
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+            if first_line_at is None:
+                first_line_at = time.perf_counter()
+            lines += 1
+
+    end = time.perf_counter()
+    return {
+        'status': response.status_code,
+        'http_version': response.http_version,
+        'connection': connection,
+        'first_line': (first_line_at or end) - start,
+        'total': end - start,
+        'lines': lines
+    }
+
+
+async def run_round(server_url: str, path: str, streams: int, http2: bool, message: str) -> Dict:
+    """
+    Open ``streams`` concurrent chat streams over a single client
+    """
+    # Leave the pool unbounded so HTTP/1.1 opens as many connections as it needs
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=server_url, http1=not http2, http2=http2, limits=limits, timeout=120) as client:
+        sessions: List[str] = []
+        for _ in range(streams):
+            response = await client.post('/sessions/new', json={})
+            response.raise_for_status()
+            sessions.append(response.json()['session_id'])
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_stream(client, path, session_id, message) for session_id in sessions))
+        wall = time.perf_counter() - start
+
+        for session_id in sessions:
+            await client.delete(f'/sessions/{session_id}')
+
+    first_lines = sorted(result['first_line'] for result in results)
+    totals = sorted(result['total'] for result in results)
+    return {
+        'label': 'HTTP/2' if http2 else 'HTTP/1.1',
+        'negotiated': sorted({result['http_version'] for result in results}),
+        'connections': len({result['connection'] for result in results if result['connection']}),
+        'errors': sum(1 for result in results if result['status'] != 200),
+        'wall': wall,
+        'first_line_p50': statistics.median(first_lines),
+        'first_line_p95': first_lines[max(0, int(len(first_lines) * 0.95) - 1)],
+        'total_p50': statistics.median(totals),
+        'total_p95': totals[max(0, int(len(totals) * 0.95) - 1)],
+        'lines': sum(result['lines'] for result in results)
+    }
+
+
+def print_result(result: Dict):
+    print(f"{Fore.CYAN}{result['label']:<9}{Style.RESET_ALL} "
+          f"negotiated={','.join(result['negotiated'])} "
+          f"connections={result['connections']} "
+          f"errors={result['errors']} "
+          f"wall={result['wall']:.2f}s "
+          f"first-line p50/p95={result['first_line_p50'] * 1000:.0f}/{result['first_line_p95'] * 1000:.0f}ms "
+          f"total p50/p95={result['total_p50'] * 1000:.0f}/{result['total_p95'] * 1000:.0f}ms "
+          f"lines={result['lines']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='HTTP/1.1 vs HTTP/2 concurrent stream benchmark')
+    parser.add_argument('--server-url', default='http://localhost:8000')
+    parser.add_argument('--path', default='/chat/stream', help='Streaming endpoint: /chat/stream (NDJSON or SSE) or /chat (REST)')
+    parser.add_argument('--streams', type=int, default=50, help='Concurrent sessions, one stream each')
+    parser.add_argument('--message', default='Say hello in one short sentence.')
+    parser.add_argument('--protocols', default='1.1,2', help='Comma-separated HTTP versions to run')
+    args = parser.parse_args()
+
+    print(f"{Fore.YELLOW}🏁 {args.streams} concurrent streams → {args.server_url}{args.path}{Style.RESET_ALL}")
+    for version in args.protocols.split(','):
+        http2 = version.strip() == '2'
+        try:
+            print_result(await run_round(args.server_url, args.path, args.streams, http2, args.message))
+        except ImportError:
+            print(f"{Fore.RED}HTTP/2 needs the h2 package: pip install 'httpx[http2]'{Style.RESET_ALL}")
+        except httpx.HTTPError as e:
+            print(f"{Fore.RED}{'HTTP/2' if http2 else 'HTTP/1.1'} round failed: {e}{Style.RESET_ALL}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Per-chunk serialization cost of streamed chat events, before and after the fast encoding path.
+
+Encodes the chunk events each server emits (streamable HTTP NDJSON, SSE, WebSocket JSON) three ways:
+a fresh dict through json.dumps with datetime.now().isoformat() (the old path), a fresh dict through
+the shared encoder with cached timestamps, and the per-turn pre-encoded envelope. Also times
+rendering a REST chat response with the default and the fast JSONResponse.
+
+Usage (JSON_ENCODER=stdlib measures the path used when orjson is not installed):
+    python benchmarks/serialization.py --chunks 20000
+"""
+
+from shared.serialization import FastJSONResponse
+from shared.serialization import ENCODER_NAME
+from shared.serialization import EventEnvelope
+from shared.serialization import timestamps
+from shared.serialization import dumps
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime
+from colorama import Style
+from colorama import Fore
+from colorama import init
+from typing import Callable
+import argparse
+import random
+import json
+import time
+import uuid
+
+# Initialize colorama for cross-platform colored output
+init(autoreset=True)
+
+VOCABULARY = ('the', 'model', 'stream', 'latency', 'token', 'response', 'session', 'protocol', 'network', 'server',
+              'client', 'chunk', 'buffer', 'encode', 'mobile', 'bandwidth', 'answer', 'request', 'a', 'of', 'and', 'to')
+
+
+def chunk_texts(count: int, words_per_chunk: int = 4) -> list:
+    rng = random.Random(42)
+    return [' '.join(rng.choice(VOCABULARY) for _ in range(words_per_chunk)) for _ in range(count)]
+
+
+def time_per_call(encode: Callable[[str, int], str], texts: list, repeat: int) -> float:
+    """
+    Best-of-``repeat`` microseconds per encoded chunk
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for number, text in enumerate(texts, start=1):
+            encode(text, number)
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6 / len(texts)
+
+
+def ndjson_paths(texts: list) -> dict:
+    envelope = EventEnvelope({'type': 'chunk'}, ('text', 'chunk_number', 'is_final', 'timestamp'))
+    last = len(texts)
+    return {
+        'json.dumps + isoformat': lambda text, number: json.dumps({
+            'type': 'chunk', 'text': text, 'chunk_number': number, 'is_final': number == last,
+            'timestamp': datetime.now().isoformat()}) + '\n',
+        'fast dumps + cached ts': lambda text, number: dumps({
+            'type': 'chunk', 'text': text, 'chunk_number': number, 'is_final': number == last,
+            'timestamp': timestamps.now()}) + '\n',
+        'envelope + cached ts': lambda text, number: envelope.encode({
+            'type': 'chunk', 'text': text, 'chunk_number': number, 'is_final': number == last,
+            'timestamp': timestamps.now()}) + '\n'
+    }
+
+
+def sse_paths(texts: list) -> dict:
+    envelope = EventEnvelope({'type': 'chunk'}, ('text', 'chunk_number', 'is_final'))
+    last = len(texts)
+    return {
+        'json.dumps': lambda text, number: json.dumps({
+            'type': 'chunk', 'text': text, 'chunk_number': number, 'is_final': number == last}),
+        'fast dumps': lambda text, number: dumps({
+            'type': 'chunk', 'text': text, 'chunk_number': number, 'is_final': number == last}),
+        'envelope': lambda text, number: envelope.encode({
+            'type': 'chunk', 'text': text, 'chunk_number': number, 'is_final': number == last})
+    }
+
+
+def websocket_paths(texts: list) -> dict:
+    turn_id, request_id, session_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+    envelope = EventEnvelope({'type': 'chunk', 'turn_id': turn_id, 'request_id': request_id, 'session_id': session_id},
+                             ('timestamp', 'text', 'chunk_number', 'is_final'))
+    last = len(texts)
+
+    def message(text, number, timestamp):
+        return {'type': 'chunk', 'timestamp': timestamp, 'turn_id': turn_id, 'request_id': request_id,
+                'text': text, 'chunk_number': number, 'is_final': number == last, 'session_id': session_id}
+
+    return {
+        'json.dumps + isoformat': lambda text, number: json.dumps(message(text, number, datetime.now().isoformat())),
+        'fast dumps + cached ts': lambda text, number: dumps(message(text, number, timestamps.now())),
+        'envelope + cached ts': lambda text, number: envelope.encode(message(text, number, timestamps.now()))
+    }
+
+
+def rest_paths(texts: list) -> dict:
+    body = {
+        'response': ' '.join(texts[:150]),
+        'session_id': str(uuid.uuid4()),
+        'message_count': 12,
+        'processing_time': 1.234,
+        'timestamp': datetime.now().isoformat(),
+        'is_new_session': False
+    }
+    return {
+        'JSONResponse': lambda text, number: JSONResponse(jsonable_encoder(body)).body,
+        'FastJSONResponse': lambda text, number: FastJSONResponse(jsonable_encoder(body)).body
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunk serialization benchmark')
+    parser.add_argument('--chunks', type=int, default=20000, help='Chunks encoded per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    texts = chunk_texts(args.chunks)
+    print(f"{Fore.YELLOW}🧪 {args.chunks} chunks per run, shared encoder: {ENCODER_NAME}{Style.RESET_ALL}")
+    print(f"{'shape':<10} {'path':<24} {'µs/chunk':>9} {'speedup':>8}")
+
+    for shape, paths in (('ndjson', ndjson_paths(texts)), ('sse', sse_paths(texts)),
+                         ('websocket', websocket_paths(texts)), ('rest', rest_paths(texts[:2000]))):
+        baseline = None
+        for label, encode in paths.items():
+            cost = time_per_call(encode, texts if shape != 'rest' else texts[:2000], args.repeat)
+            baseline = baseline or cost
+            print(f"{Fore.CYAN}{shape:<10}{Style.RESET_ALL} {label:<24} {cost:>9.2f} {baseline / cost:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
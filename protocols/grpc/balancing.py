@@ -0,0 +1,142 @@
+"""
+Client-side load balancing across gRPC server replicas
+
+Stateless RPCs (Ask, ChatBatch, stats, health) share one channel that spreads calls
+round-robin over every replica. Sessions live in one server's memory, so everything bound
+to a session (CreateSession, GetSessionInfo, DeleteSession and its Chat stream) goes to the
+replica a consistent-hash ring picks for the session ID. Adding or removing a replica only
+moves the sessions on its part of the ring, and a session whose replica goes away moves to
+the next replica clockwise.
+"""
+
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import List
+import hashlib
+import asyncio
+import bisect
+import socket
+import grpc
+
+
+RING_POINTS = 100  # points per replica on the ring; more points spread sessions more evenly
+DEFAULT_PORT = 50051
+
+ROUND_ROBIN_CONFIG = {'loadBalancingConfig': [{'round_robin': {}}]}
+
+
+def parse_targets(value: str) -> List[str]:
+    """
+    Split a comma-separated GRPC_TARGETS value into targets
+    """
+    return [target.strip() for target in value.split(',') if target.strip()]
+
+
+def split_host_port(target: str) -> Tuple[str, int]:
+    """
+    Host and port of 'host:port', '[v6]:port' or 'dns:///host:port' (port defaults to 50051)
+    """
+    address = target.split('///', 1)[1] if '///' in target else target
+    if address.startswith('['):
+        host, _, rest = address[1:].partition(']')
+        return host, int(rest.lstrip(':') or DEFAULT_PORT)
+    host, _, port = address.rpartition(':') if ':' in address else (address, '', '')
+    return host, int(port or DEFAULT_PORT)
+
+
+def resolve(target: str) -> List[Tuple[socket.AddressFamily, str, int]]:
+    """
+    Every (family, address, port) the target's host resolves to, IPv4 first
+    """
+    host, port = split_host_port(target)
+    addresses = []
+    for family, _, _, _, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+        if (family, sockaddr[0], port) not in addresses:
+            addresses.append((family, sockaddr[0], port))
+    return sorted(addresses, key=lambda address: address[0] != socket.AF_INET)
+
+
+def format_address(family: socket.AddressFamily, address: str, port: int) -> str:
+    return f'[{address}]:{port}' if family == socket.AF_INET6 else f'{address}:{port}'
+
+
+def round_robin_target(targets: List[str]) -> str:
+    """
+    One channel target covering every replica
+
+    A single target is used as-is (the DNS resolver hands round_robin every address behind
+    the name); a list is resolved once into an ipv4: or ipv6: address list.
+    """
+    if len(targets) == 1:
+        return targets[0]
+    addresses = [resolve(target)[0] for target in targets]
+    families = {family for family, _, _ in addresses}
+    if len(families) > 1:
+        raise ValueError("GRPC_TARGETS mixes IPv4 and IPv6 replicas; list them all in one family")
+    scheme = 'ipv6' if families == {socket.AF_INET6} else 'ipv4'
+    return f"{scheme}:{','.join(format_address(*address) for address in addresses)}"
+
+
+def ring_nodes(targets: List[str]) -> List[str]:
+    """
+    The replicas sessions are pinned to: the targets themselves, or the addresses behind a
+    single dns:/// name (resolved once, at startup)
+    """
+    if len(targets) == 1 and targets[0].startswith('dns:'):
+        return [format_address(*address) for address in resolve(targets[0])]
+    return list(targets)
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping session IDs to replicas
+    """
+
+    def __init__(self, nodes: List[str], points: int = RING_POINTS):
+        self.nodes = list(dict.fromkeys(nodes))
+        ring = sorted((self.hash(f'{node}#{i}'), node) for node in self.nodes for i in range(points))
+        self.hashes = [point for point, _ in ring]
+        self.owners = [node for _, node in ring]
+
+    @staticmethod
+    def hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+    def nodes_for(self, key: str) -> Iterator[str]:
+        """
+        Every replica in ring order from the key: its owner first, then the failover order
+        """
+        if not self.owners:
+            return
+        start = bisect.bisect(self.hashes, self.hash(key))
+        seen = set()
+        for i in range(len(self.owners)):
+            node = self.owners[(start + i) % len(self.owners)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self.nodes):
+                    return
+
+    def node_for(self, key: str) -> Optional[str]:
+        return next(self.nodes_for(key), None)
+
+
+async def wait_until_connected(channel: grpc.aio.Channel, timeout: float) -> bool:
+    """
+    Wait for the channel to connect, giving up as soon as a connection attempt fails
+    (unlike channel_ready(), which keeps retrying until the timeout)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    state = channel.get_state(try_to_connect=True)
+    while state != grpc.ChannelConnectivity.READY:
+        if state in (grpc.ChannelConnectivity.TRANSIENT_FAILURE, grpc.ChannelConnectivity.SHUTDOWN):
+            return False
+        try:
+            await asyncio.wait_for(channel.wait_for_state_change(state), timeout=max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            return False
+        state = channel.get_state(try_to_connect=True)
+    return True
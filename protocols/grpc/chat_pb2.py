@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nchat.proto\x12\x04\x63hat\"(\n\x14\x43reateSessionRequest\x12\x10\n\x08model_id\x18\x01 \x01(\t\"\\\n\x15\x43reateSessionResponse\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x0f\n\x07message\x18\x04 \x01(\t\"(\n\x12SessionInfoRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xce\x01\n\x13SessionInfoResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\r\n\x05model\x18\x04 \x01(\t\x12\x15\n\rmessage_count\x18\x05 \x01(\x05\x12\x15\n\ruser_messages\x18\x06 \x01(\x05\x12\x16\n\x0emodel_messages\x18\x07 \x01(\x05\x12\x18\n\x10\x64uration_seconds\x18\x08 \x01(\x05\x12\x12\n\ncreated_at\x18\t \x01(\t\"\x15\n\x13ListSessionsRequest\"x\n\x0eSessionSummary\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x15\n\rmessage_count\x18\x03 \x01(\x05\x12\x18\n\x10\x64uration_minutes\x18\x04 \x01(\x05\x12\x12\n\ncreated_at\x18\x05 \x01(\t\"W\n\x14ListSessionsResponse\x12&\n\x08sessions\x18\x01 \x03(\x0b\x32\x14.chat.SessionSummary\x12\x17\n\x0f\x61\x63tive_sessions\x18\x02 \x01(\x05\"*\n\x14\x44\x65leteSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"9\n\x15\x44\x65leteSessionResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x14\n\x12ServerStatsRequest\"\xf5\x01\n\x13ServerStatsResponse\x12\x16\n\x0euptime_seconds\x18\x01 \x01(\x05\x12\x16\n\x0etotal_requests\x18\x02 \x01(\x05\x12\x1b\n\x13successful_requests\x18\x03 \x01(\x05\x12\x17\n\x0f\x66\x61iled_requests\x18\x04 \x01(\x05\x12\x17\n\x0f\x61\x63tive_sessions\x18\x05 \x01(\x05\x12\x1e\n\x16total_sessions_created\x18\x06 \x01(\x05\x12\x1d\n\x15\x61verage_response_time\x18\x07 \x01(\x01\x12\r\n\x05model\x18\x08 \x01(\t\x12\x11\n\tframework\x18\t \x01(\t\"\xad\x01\n\x0b\x43hatRequest\x12$\n\x04type\x18\x01 \x01(\x0e\x32\x16.chat.ChatRequest.Type\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\t\"@\n\x04Type\x12\x0b\n\x07MESSAGE\x10\x00\x12\x08\n\x04PING\x10\x01\x12\x10\n\x0cTYPING_START\x10\x02\x12\x0f\n\x0bTYPING_STOP\x10\x03\"\xc4\x03\n\x0c\x43hatResponse\x12%\n\x04type\x18\x01 \x01(\x0e\x32\x17.chat.ChatResponse.Type\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x16\n\x0estatus_message\x18\x03 \x01(\t\x12\x18\n\x10\x63ontext_messages\x18\x04 \x01(\x05\x12\x12\n\nchunk_text\x18\x05 \x01(\t\x12\x14\n\x0c\x63hunk_number\x18\x06 \x01(\x05\x12\x10\n\x08is_final\x18\x07 \x01(\x08\x12\x14\n\x0ctotal_chunks\x18\x08 \x01(\x05\x12\x17\n\x0fprocessing_time\x18\t \x01(\x01\x12\x15\n\rmessage_count\x18\n \x01(\x05\x12\x15\n\rerror_message\x18\x0b \x01(\t\x12\x13\n\x0bupdate_type\x18\x0c \x01(\t\x12\x13\n\x0bupdate_data\x18\r \x01(\t\x12\x11\n\ttimestamp\x18\x0e \x01(\t\"q\n\x04Type\x12\n\n\x06STATUS\x10\x00\x12\x12\n\x0eRESPONSE_START\x10\x01\x12\t\n\x05\x43HUNK\x10\x02\x12\x15\n\x11RESPONSE_COMPLETE\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x12\x08\n\x04PONG\x10\x05\x12\x12\n\x0eSESSION_UPDATE\x10\x06\"\x0f\n\rHealthRequest\"~\n\x0eHealthResponse\x12\x0f\n\x07healthy\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\r\n\x05model\x18\x03 \x01(\t\x12\x0f\n\x07ping_ms\x18\x04 \x01(\x01\x12\x17\n\x0f\x61\x63tive_sessions\x18\x05 \x01(\x05\x12\x11\n\tframework\x18\x06 \x01(\t2\xa9\x03\n\x0b\x43hatService\x12H\n\rCreateSession\x12\x1a.chat.CreateSessionRequest\x1a\x1b.chat.CreateSessionResponse\x12\x45\n\x0eGetSessionInfo\x12\x18.chat.SessionInfoRequest\x1a\x19.chat.SessionInfoResponse\x12\x45\n\x0cListSessions\x12\x19.chat.ListSessionsRequest\x1a\x1a.chat.ListSessionsResponse\x12H\n\rDeleteSession\x12\x1a.chat.DeleteSessionRequest\x1a\x1b.chat.DeleteSessionResponse\x12\x45\n\x0eGetServerStats\x12\x18.chat.ServerStatsRequest\x1a\x19.chat.ServerStatsResponse\x12\x31\n\x04\x43hat\x12\x11.chat.ChatRequest\x1a\x12.chat.ChatResponse(\x01\x30\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nchat.proto\x12\x04\x63hat\"<\n\x14\x43reateSessionRequest\x12\x10\n\x08model_id\x18\x01 \x01(\t\x12\x12\n\nsession_id\x18\x02 \x01(\t\"\\\n\x15\x43reateSessionResponse\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x0f\n\x07message\x18\x04 \x01(\t\"(\n\x12SessionInfoRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"\xce\x01\n\x13SessionInfoResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\r\n\x05model\x18\x04 \x01(\t\x12\x15\n\rmessage_count\x18\x05 \x01(\x05\x12\x15\n\ruser_messages\x18\x06 \x01(\x05\x12\x16\n\x0emodel_messages\x18\x07 \x01(\x05\x12\x18\n\x10\x64uration_seconds\x18\x08 \x01(\x05\x12\x12\n\ncreated_at\x18\t \x01(\t\"`\n\x13ListSessionsRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\x12\r\n\x05model\x18\x03 \x01(\t\x12\x0c\n\x04sort\x18\x04 \x01(\t\x12\r\n\x05order\x18\x05 \x01(\t\"\x8f\x01\n\x0eSessionSummary\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x15\n\rmessage_count\x18\x03 \x01(\x05\x12\x18\n\x10\x64uration_minutes\x18\x04 \x01(\x05\x12\x12\n\ncreated_at\x18\x05 \x01(\t\x12\x15\n\rlast_activity\x18\x06 \x01(\t\"l\n\x14ListSessionsResponse\x12&\n\x08sessions\x18\x01 \x03(\x0b\x32\x14.chat.SessionSummary\x12\x17\n\x0f\x61\x63tive_sessions\x18\x02 \x01(\x05\x12\x13\n\x0bnext_cursor\x18\x03 \x01(\t\"*\n\x14\x44\x65leteSessionRequest\x12\x12\n\nsession_id\x18\x01 \x01(\t\"9\n\x15\x44\x65leteSessionResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"=\n\x1a\x42\x61tchCreateSessionsRequest\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x10\n\x08model_id\x18\x02 \x01(\t\"A\n\x1b\x42\x61tchCreateSessionsResponse\x12\x13\n\x0bsession_ids\x18\x01 \x03(\t\x12\r\n\x05model\x18\x02 \x01(\t\"1\n\x1a\x42\x61tchDeleteSessionsRequest\x12\x13\n\x0bsession_ids\x18\x01 \x03(\t\"A\n\x1b\x42\x61tchDeleteSessionsResponse\x12\x0f\n\x07\x64\x65leted\x18\x01 \x01(\x05\x12\x11\n\tnot_found\x18\x02 \x03(\t\"\x98\x01\n\x15StreamSessionsRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12\x0c\n\x04sort\x18\x02 \x01(\t\x12\r\n\x05order\x18\x03 \x01(\t\x12\x18\n\x10min_idle_seconds\x18\x04 \x01(\x05\x12\x14\n\x0cmin_messages\x18\x05 \x01(\x05\x12\x14\n\x0cmax_messages\x18\x06 \x01(\x05\x12\r\n\x05limit\x18\x07 \x01(\x05\"\x14\n\x12ServerStatsRequest\"\xa3\x02\n\x13ServerStatsResponse\x12\x16\n\x0euptime_seconds\x18\x01 \x01(\x05\x12\x16\n\x0etotal_requests\x18\x02 \x01(\x05\x12\x1b\n\x13successful_requests\x18\x03 \x01(\x05\x12\x17\n\x0f\x66\x61iled_requests\x18\x04 \x01(\x05\x12\x17\n\x0f\x61\x63tive_sessions\x18\x05 \x01(\x05\x12\x1e\n\x16total_sessions_created\x18\x06 \x01(\x05\x12\x1d\n\x15\x61verage_response_time\x18\x07 \x01(\x01\x12\r\n\x05model\x18\x08 \x01(\t\x12\x11\n\tframework\x18\t \x01(\t\x12\x16\n\x0e\x61\x63tive_streams\x18\n \x01(\x05\x12\x14\n\x0c\x61\x63tive_turns\x18\x0b \x01(\x05\"\xad\x01\n\x0b\x43hatRequest\x12$\n\x04type\x18\x01 \x01(\x0e\x32\x16.chat.ChatRequest.Type\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\t\"@\n\x04Type\x12\x0b\n\x07MESSAGE\x10\x00\x12\x08\n\x04PING\x10\x01\x12\x10\n\x0cTYPING_START\x10\x02\x12\x0f\n\x0bTYPING_STOP\x10\x03\"\xc4\x03\n\x0c\x43hatResponse\x12%\n\x04type\x18\x01 \x01(\x0e\x32\x17.chat.ChatResponse.Type\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x16\n\x0estatus_message\x18\x03 \x01(\t\x12\x18\n\x10\x63ontext_messages\x18\x04 \x01(\x05\x12\x12\n\nchunk_text\x18\x05 \x01(\t\x12\x14\n\x0c\x63hunk_number\x18\x06 \x01(\x05\x12\x10\n\x08is_final\x18\x07 \x01(\x08\x12\x14\n\x0ctotal_chunks\x18\x08 \x01(\x05\x12\x17\n\x0fprocessing_time\x18\t \x01(\x01\x12\x15\n\rmessage_count\x18\n \x01(\x05\x12\x15\n\rerror_message\x18\x0b \x01(\t\x12\x13\n\x0bupdate_type\x18\x0c \x01(\t\x12\x13\n\x0bupdate_data\x18\r \x01(\t\x12\x11\n\ttimestamp\x18\x0e \x01(\t\"q\n\x04Type\x12\n\n\x06STATUS\x10\x00\x12\x12\n\x0eRESPONSE_START\x10\x01\x12\t\n\x05\x43HUNK\x10\x02\x12\x15\n\x11RESPONSE_COMPLETE\x10\x03\x12\t\n\x05\x45RROR\x10\x04\x12\x08\n\x04PONG\x10\x05\x12\x12\n\x0eSESSION_UPDATE\x10\x06\"\x9a\x02\n\tChatEvent\x12 \n\x05\x63hunk\x18\x01 \x01(\x0b\x32\x0f.chat.TextChunkH\x00\x12&\n\x07started\x18\x02 \x01(\x0b\x32\x13.chat.StreamStartedH\x00\x12\"\n\x06status\x18\x03 \x01(\x0b\x32\x10.chat.TurnStatusH\x00\x12/\n\x0eresponse_start\x18\x04 \x01(\x0b\x32\x15.chat.ResponseStartedH\x00\x12\'\n\x08\x63omplete\x18\x05 \x01(\x0b\x32\x13.chat.TurnCompletedH\x00\x12 \n\x05\x65rror\x18\x06 \x01(\x0b\x32\x0f.chat.ChatErrorH\x00\x12\x1a\n\x04pong\x18\x07 \x01(\x0b\x32\n.chat.PongH\x00\x42\x07\n\x05\x65vent\";\n\rStreamStarted\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x16\n\x0eserver_time_ms\x18\x02 \x01(\x03\"7\n\nTurnStatus\x12\x0f\n\x07message\x18\x01 \x01(\t\x12\x18\n\x10\x63ontext_messages\x18\x02 \x01(\x05\"(\n\x0fResponseStarted\x12\x15\n\rstarted_at_ms\x18\x01 \x01(\x03\")\n\tTextChunk\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x0e\n\x06number\x18\x02 \x01(\x05\"q\n\rTurnCompleted\x12\x14\n\x0ctotal_chunks\x18\x01 \x01(\x05\x12\x1a\n\x12processing_time_ms\x18\x02 \x01(\x05\x12\x15\n\rmessage_count\x18\x03 \x01(\x05\x12\x17\n\x0f\x63ompleted_at_ms\x18\x04 \x01(\x03\"\x1c\n\tChatError\x12\x0f\n\x07message\x18\x01 \x01(\t\"\x1e\n\x04Pong\x12\x16\n\x0eserver_time_ms\x18\x01 \x01(\x03\"4\n\rChatBatchItem\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\"6\n\x10\x43hatBatchRequest\x12\"\n\x05items\x18\x01 \x03(\x0b\x32\x13.chat.ChatBatchItem\"\xb1\x01\n\x0f\x43hatBatchResult\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12\x0f\n\x07success\x18\x03 \x01(\x08\x12\x10\n\x08response\x18\x04 \x01(\t\x12\x15\n\rerror_message\x18\x05 \x01(\t\x12\x15\n\rmessage_count\x18\x06 \x01(\x05\x12\x17\n\x0fprocessing_time\x18\x07 \x01(\x01\x12\x11\n\ttimestamp\x18\x08 \x01(\t\",\n\x0eHistoryMessage\x12\x0c\n\x04role\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\"R\n\nAskRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12\x0e\n\x06prompt\x18\x02 \x01(\t\x12%\n\x07history\x18\x03 \x03(\x0b\x32\x14.chat.HistoryMessage\"c\n\x0b\x41skResponse\x12\x10\n\x08response\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x03 \x01(\x05\x12\x17\n\x0f\x63ompleted_at_ms\x18\x04 \x01(\x03\"\x0f\n\rHealthRequest\"~\n\x0eHealthResponse\x12\x0f\n\x07healthy\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\r\n\x05model\x18\x03 \x01(\t\x12\x0f\n\x07ping_ms\x18\x04 \x01(\x01\x12\x17\n\x0f\x61\x63tive_sessions\x18\x05 \x01(\x05\x12\x11\n\tframework\x18\x06 \x01(\t2\xf5\x06\n\x0b\x43hatService\x12H\n\rCreateSession\x12\x1a.chat.CreateSessionRequest\x1a\x1b.chat.CreateSessionResponse\x12\x45\n\x0eGetSessionInfo\x12\x18.chat.SessionInfoRequest\x1a\x19.chat.SessionInfoResponse\x12\x45\n\x0cListSessions\x12\x19.chat.ListSessionsRequest\x1a\x1a.chat.ListSessionsResponse\x12H\n\rDeleteSession\x12\x1a.chat.DeleteSessionRequest\x1a\x1b.chat.DeleteSessionResponse\x12Z\n\x13\x42\x61tchCreateSessions\x12 .chat.BatchCreateSessionsRequest\x1a!.chat.BatchCreateSessionsResponse\x12Z\n\x13\x42\x61tchDeleteSessions\x12 .chat.BatchDeleteSessionsRequest\x1a!.chat.BatchDeleteSessionsResponse\x12\x45\n\x0eStreamSessions\x12\x1b.chat.StreamSessionsRequest\x1a\x14.chat.SessionSummary0\x01\x12\x45\n\x0eGetServerStats\x12\x18.chat.ServerStatsRequest\x1a\x19.chat.ServerStatsResponse\x12\x31\n\x04\x43hat\x12\x11.chat.ChatRequest\x1a\x12.chat.ChatResponse(\x01\x30\x01\x12\x30\n\x06\x43hatV2\x12\x11.chat.ChatRequest\x1a\x0f.chat.ChatEvent(\x01\x30\x01\x12<\n\tChatBatch\x12\x16.chat.ChatBatchRequest\x1a\x15.chat.ChatBatchResult0\x01\x12*\n\x03\x41sk\x12\x10.chat.AskRequest\x1a\x0f.chat.ChatEvent0\x01\x12/\n\x08\x41skUnary\x12\x10.chat.AskRequest\x1a\x11.chat.AskResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,39 +32,77 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'chat_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_CREATESESSIONREQUEST']._serialized_start=20
-  _globals['_CREATESESSIONREQUEST']._serialized_end=60
-  _globals['_CREATESESSIONRESPONSE']._serialized_start=62
-  _globals['_CREATESESSIONRESPONSE']._serialized_end=154
-  _globals['_SESSIONINFOREQUEST']._serialized_start=156
-  _globals['_SESSIONINFOREQUEST']._serialized_end=196
-  _globals['_SESSIONINFORESPONSE']._serialized_start=199
-  _globals['_SESSIONINFORESPONSE']._serialized_end=405
-  _globals['_LISTSESSIONSREQUEST']._serialized_start=407
-  _globals['_LISTSESSIONSREQUEST']._serialized_end=428
-  _globals['_SESSIONSUMMARY']._serialized_start=430
-  _globals['_SESSIONSUMMARY']._serialized_end=550
-  _globals['_LISTSESSIONSRESPONSE']._serialized_start=552
-  _globals['_LISTSESSIONSRESPONSE']._serialized_end=639
-  _globals['_DELETESESSIONREQUEST']._serialized_start=641
-  _globals['_DELETESESSIONREQUEST']._serialized_end=683
-  _globals['_DELETESESSIONRESPONSE']._serialized_start=685
-  _globals['_DELETESESSIONRESPONSE']._serialized_end=742
-  _globals['_SERVERSTATSREQUEST']._serialized_start=744
-  _globals['_SERVERSTATSREQUEST']._serialized_end=764
-  _globals['_SERVERSTATSRESPONSE']._serialized_start=767
-  _globals['_SERVERSTATSRESPONSE']._serialized_end=1012
-  _globals['_CHATREQUEST']._serialized_start=1015
-  _globals['_CHATREQUEST']._serialized_end=1188
-  _globals['_CHATREQUEST_TYPE']._serialized_start=1124
-  _globals['_CHATREQUEST_TYPE']._serialized_end=1188
-  _globals['_CHATRESPONSE']._serialized_start=1191
-  _globals['_CHATRESPONSE']._serialized_end=1643
-  _globals['_CHATRESPONSE_TYPE']._serialized_start=1530
-  _globals['_CHATRESPONSE_TYPE']._serialized_end=1643
-  _globals['_HEALTHREQUEST']._serialized_start=1645
-  _globals['_HEALTHREQUEST']._serialized_end=1660
-  _globals['_HEALTHRESPONSE']._serialized_start=1662
-  _globals['_HEALTHRESPONSE']._serialized_end=1788
-  _globals['_CHATSERVICE']._serialized_start=1791
-  _globals['_CHATSERVICE']._serialized_end=2216
+  _globals['_CREATESESSIONREQUEST']._serialized_end=80
+  _globals['_CREATESESSIONRESPONSE']._serialized_start=82
+  _globals['_CREATESESSIONRESPONSE']._serialized_end=174
+  _globals['_SESSIONINFOREQUEST']._serialized_start=176
+  _globals['_SESSIONINFOREQUEST']._serialized_end=216
+  _globals['_SESSIONINFORESPONSE']._serialized_start=219
+  _globals['_SESSIONINFORESPONSE']._serialized_end=425
+  _globals['_LISTSESSIONSREQUEST']._serialized_start=427
+  _globals['_LISTSESSIONSREQUEST']._serialized_end=523
+  _globals['_SESSIONSUMMARY']._serialized_start=526
+  _globals['_SESSIONSUMMARY']._serialized_end=669
+  _globals['_LISTSESSIONSRESPONSE']._serialized_start=671
+  _globals['_LISTSESSIONSRESPONSE']._serialized_end=779
+  _globals['_DELETESESSIONREQUEST']._serialized_start=781
+  _globals['_DELETESESSIONREQUEST']._serialized_end=823
+  _globals['_DELETESESSIONRESPONSE']._serialized_start=825
+  _globals['_DELETESESSIONRESPONSE']._serialized_end=882
+  _globals['_BATCHCREATESESSIONSREQUEST']._serialized_start=884
+  _globals['_BATCHCREATESESSIONSREQUEST']._serialized_end=945
+  _globals['_BATCHCREATESESSIONSRESPONSE']._serialized_start=947
+  _globals['_BATCHCREATESESSIONSRESPONSE']._serialized_end=1012
+  _globals['_BATCHDELETESESSIONSREQUEST']._serialized_start=1014
+  _globals['_BATCHDELETESESSIONSREQUEST']._serialized_end=1063
+  _globals['_BATCHDELETESESSIONSRESPONSE']._serialized_start=1065
+  _globals['_BATCHDELETESESSIONSRESPONSE']._serialized_end=1130
+  _globals['_STREAMSESSIONSREQUEST']._serialized_start=1133
+  _globals['_STREAMSESSIONSREQUEST']._serialized_end=1285
+  _globals['_SERVERSTATSREQUEST']._serialized_start=1287
+  _globals['_SERVERSTATSREQUEST']._serialized_end=1307
+  _globals['_SERVERSTATSRESPONSE']._serialized_start=1310
+  _globals['_SERVERSTATSRESPONSE']._serialized_end=1601
+  _globals['_CHATREQUEST']._serialized_start=1604
+  _globals['_CHATREQUEST']._serialized_end=1777
+  _globals['_CHATREQUEST_TYPE']._serialized_start=1713
+  _globals['_CHATREQUEST_TYPE']._serialized_end=1777
+  _globals['_CHATRESPONSE']._serialized_start=1780
+  _globals['_CHATRESPONSE']._serialized_end=2232
+  _globals['_CHATRESPONSE_TYPE']._serialized_start=2119
+  _globals['_CHATRESPONSE_TYPE']._serialized_end=2232
+  _globals['_CHATEVENT']._serialized_start=2235
+  _globals['_CHATEVENT']._serialized_end=2517
+  _globals['_STREAMSTARTED']._serialized_start=2519
+  _globals['_STREAMSTARTED']._serialized_end=2578
+  _globals['_TURNSTATUS']._serialized_start=2580
+  _globals['_TURNSTATUS']._serialized_end=2635
+  _globals['_RESPONSESTARTED']._serialized_start=2637
+  _globals['_RESPONSESTARTED']._serialized_end=2677
+  _globals['_TEXTCHUNK']._serialized_start=2679
+  _globals['_TEXTCHUNK']._serialized_end=2720
+  _globals['_TURNCOMPLETED']._serialized_start=2722
+  _globals['_TURNCOMPLETED']._serialized_end=2835
+  _globals['_CHATERROR']._serialized_start=2837
+  _globals['_CHATERROR']._serialized_end=2865
+  _globals['_PONG']._serialized_start=2867
+  _globals['_PONG']._serialized_end=2897
+  _globals['_CHATBATCHITEM']._serialized_start=2899
+  _globals['_CHATBATCHITEM']._serialized_end=2951
+  _globals['_CHATBATCHREQUEST']._serialized_start=2953
+  _globals['_CHATBATCHREQUEST']._serialized_end=3007
+  _globals['_CHATBATCHRESULT']._serialized_start=3010
+  _globals['_CHATBATCHRESULT']._serialized_end=3187
+  _globals['_HISTORYMESSAGE']._serialized_start=3189
+  _globals['_HISTORYMESSAGE']._serialized_end=3233
+  _globals['_ASKREQUEST']._serialized_start=3235
+  _globals['_ASKREQUEST']._serialized_end=3317
+  _globals['_ASKRESPONSE']._serialized_start=3319
+  _globals['_ASKRESPONSE']._serialized_end=3418
+  _globals['_HEALTHREQUEST']._serialized_start=3420
+  _globals['_HEALTHREQUEST']._serialized_end=3435
+  _globals['_HEALTHRESPONSE']._serialized_start=3437
+  _globals['_HEALTHRESPONSE']._serialized_end=3563
+  _globals['_CHATSERVICE']._serialized_start=3566
+  _globals['_CHATSERVICE']._serialized_end=4451
 # @@protoc_insertion_point(module_scope)
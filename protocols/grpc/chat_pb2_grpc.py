@@ -55,6 +55,21 @@ class ChatServiceStub(object):
                 request_serializer=chat__pb2.DeleteSessionRequest.SerializeToString,
                 response_deserializer=chat__pb2.DeleteSessionResponse.FromString,
                 _registered_method=True)
+        self.BatchCreateSessions = channel.unary_unary(
+                '/chat.ChatService/BatchCreateSessions',
+                request_serializer=chat__pb2.BatchCreateSessionsRequest.SerializeToString,
+                response_deserializer=chat__pb2.BatchCreateSessionsResponse.FromString,
+                _registered_method=True)
+        self.BatchDeleteSessions = channel.unary_unary(
+                '/chat.ChatService/BatchDeleteSessions',
+                request_serializer=chat__pb2.BatchDeleteSessionsRequest.SerializeToString,
+                response_deserializer=chat__pb2.BatchDeleteSessionsResponse.FromString,
+                _registered_method=True)
+        self.StreamSessions = channel.unary_stream(
+                '/chat.ChatService/StreamSessions',
+                request_serializer=chat__pb2.StreamSessionsRequest.SerializeToString,
+                response_deserializer=chat__pb2.SessionSummary.FromString,
+                _registered_method=True)
         self.GetServerStats = channel.unary_unary(
                 '/chat.ChatService/GetServerStats',
                 request_serializer=chat__pb2.ServerStatsRequest.SerializeToString,
@@ -65,6 +80,26 @@ class ChatServiceStub(object):
                 request_serializer=chat__pb2.ChatRequest.SerializeToString,
                 response_deserializer=chat__pb2.ChatResponse.FromString,
                 _registered_method=True)
+        self.ChatV2 = channel.stream_stream(
+                '/chat.ChatService/ChatV2',
+                request_serializer=chat__pb2.ChatRequest.SerializeToString,
+                response_deserializer=chat__pb2.ChatEvent.FromString,
+                _registered_method=True)
+        self.ChatBatch = channel.unary_stream(
+                '/chat.ChatService/ChatBatch',
+                request_serializer=chat__pb2.ChatBatchRequest.SerializeToString,
+                response_deserializer=chat__pb2.ChatBatchResult.FromString,
+                _registered_method=True)
+        self.Ask = channel.unary_stream(
+                '/chat.ChatService/Ask',
+                request_serializer=chat__pb2.AskRequest.SerializeToString,
+                response_deserializer=chat__pb2.ChatEvent.FromString,
+                _registered_method=True)
+        self.AskUnary = channel.unary_unary(
+                '/chat.ChatService/AskUnary',
+                request_serializer=chat__pb2.AskRequest.SerializeToString,
+                response_deserializer=chat__pb2.AskResponse.FromString,
+                _registered_method=True)
 
 
 class ChatServiceServicer(object):
@@ -99,6 +134,27 @@ class ChatServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchCreateSessions(self, request, context):
+        """Create many sessions in one call
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchDeleteSessions(self, request, context):
+        """Delete many sessions in one call
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamSessions(self, request, context):
+        """Stream every matching session, one message each (read from the index a page at a time)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetServerStats(self, request, context):
         """Get server statistics
         """
@@ -113,6 +169,35 @@ class ChatServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ChatV2(self, request_iterator, context):
+        """Chat v2: the same conversation, answered with small typed events. Send the session ID
+        in the first request only; it comes back once, in `started`.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ChatBatch(self, request, context):
+        """Run many independent turns at once; results stream back as each completes
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Ask(self, request, context):
+        """One-off prompt with no session: streams response_start, chunks and complete (ChatEvent)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AskUnary(self, request, context):
+        """One-off prompt with no session, answered in a single response
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ChatServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -136,6 +221,21 @@ def add_ChatServiceServicer_to_server(servicer, server):
                     request_deserializer=chat__pb2.DeleteSessionRequest.FromString,
                     response_serializer=chat__pb2.DeleteSessionResponse.SerializeToString,
             ),
+            'BatchCreateSessions': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchCreateSessions,
+                    request_deserializer=chat__pb2.BatchCreateSessionsRequest.FromString,
+                    response_serializer=chat__pb2.BatchCreateSessionsResponse.SerializeToString,
+            ),
+            'BatchDeleteSessions': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchDeleteSessions,
+                    request_deserializer=chat__pb2.BatchDeleteSessionsRequest.FromString,
+                    response_serializer=chat__pb2.BatchDeleteSessionsResponse.SerializeToString,
+            ),
+            'StreamSessions': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamSessions,
+                    request_deserializer=chat__pb2.StreamSessionsRequest.FromString,
+                    response_serializer=chat__pb2.SessionSummary.SerializeToString,
+            ),
             'GetServerStats': grpc.unary_unary_rpc_method_handler(
                     servicer.GetServerStats,
                     request_deserializer=chat__pb2.ServerStatsRequest.FromString,
@@ -146,6 +246,26 @@ def add_ChatServiceServicer_to_server(servicer, server):
                     request_deserializer=chat__pb2.ChatRequest.FromString,
                     response_serializer=chat__pb2.ChatResponse.SerializeToString,
             ),
+            'ChatV2': grpc.stream_stream_rpc_method_handler(
+                    servicer.ChatV2,
+                    request_deserializer=chat__pb2.ChatRequest.FromString,
+                    response_serializer=chat__pb2.ChatEvent.SerializeToString,
+            ),
+            'ChatBatch': grpc.unary_stream_rpc_method_handler(
+                    servicer.ChatBatch,
+                    request_deserializer=chat__pb2.ChatBatchRequest.FromString,
+                    response_serializer=chat__pb2.ChatBatchResult.SerializeToString,
+            ),
+            'Ask': grpc.unary_stream_rpc_method_handler(
+                    servicer.Ask,
+                    request_deserializer=chat__pb2.AskRequest.FromString,
+                    response_serializer=chat__pb2.ChatEvent.SerializeToString,
+            ),
+            'AskUnary': grpc.unary_unary_rpc_method_handler(
+                    servicer.AskUnary,
+                    request_deserializer=chat__pb2.AskRequest.FromString,
+                    response_serializer=chat__pb2.AskResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'chat.ChatService', rpc_method_handlers)
@@ -266,6 +386,87 @@ class ChatService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def BatchCreateSessions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/chat.ChatService/BatchCreateSessions',
+            chat__pb2.BatchCreateSessionsRequest.SerializeToString,
+            chat__pb2.BatchCreateSessionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchDeleteSessions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/chat.ChatService/BatchDeleteSessions',
+            chat__pb2.BatchDeleteSessionsRequest.SerializeToString,
+            chat__pb2.BatchDeleteSessionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamSessions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/chat.ChatService/StreamSessions',
+            chat__pb2.StreamSessionsRequest.SerializeToString,
+            chat__pb2.SessionSummary.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetServerStats(request,
             target,
@@ -319,3 +520,111 @@ class ChatService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ChatV2(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/chat.ChatService/ChatV2',
+            chat__pb2.ChatRequest.SerializeToString,
+            chat__pb2.ChatEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ChatBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/chat.ChatService/ChatBatch',
+            chat__pb2.ChatBatchRequest.SerializeToString,
+            chat__pb2.ChatBatchResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Ask(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/chat.ChatService/Ask',
+            chat__pb2.AskRequest.SerializeToString,
+            chat__pb2.ChatEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AskUnary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/chat.ChatService/AskUnary',
+            chat__pb2.AskRequest.SerializeToString,
+            chat__pb2.AskResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
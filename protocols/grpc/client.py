@@ -2,27 +2,80 @@ from typing import AsyncGenerator
 from datetime import timedelta 
 from datetime import datetime
 from typing import Optional
+from typing import Tuple
 from colorama import Style 
 from colorama import Fore
 from colorama import Back
 from colorama import init 
-import chat_pb2_grpc  # import generated gRPC code
+from interceptors import client_interceptors
+from balancing import ROUND_ROBIN_CONFIG
+from balancing import wait_until_connected
+from balancing import round_robin_target
+from balancing import parse_targets
+from balancing import ring_nodes
+from balancing import HashRing
+from shared.metrics import registry
+from codegen import load_stubs
 import threading
-import chat_pb2  # import generated gRPC code
 import asyncio
 import signal
+import random
 import json
 import grpc
 import time
-import sys
+import uuid
 import os
 
+try:
+    from grpc_health.v1 import health_pb2_grpc
+    from grpc_health.v1 import health_pb2
+except ImportError:  # Standard health checking is optional (pip install grpcio-health-checking)
+    health_pb2 = None
+
+# Generated gRPC code, checked against chat.proto (fails fast when setup.py needs re-running)
+chat_pb2, chat_pb2_grpc = load_stubs()
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
 # Configuration
-SERVER_URL = 'localhost:50051'
+SERVER_TARGETS = parse_targets(os.environ.get('GRPC_TARGETS', 'localhost:50051'))  # replicas (comma-separated), or one dns:/// name
+SERVER_URL = ', '.join(SERVER_TARGETS)
+COMPRESSION = os.environ.get('GRPC_COMPRESSION', 'gzip').lower()    # per-message compression for requests: gzip, deflate or none
+KEEPALIVE_TIME_MS = int(os.environ.get('GRPC_KEEPALIVE_TIME_MS', '30000'))  # ping the server this often while idle (server allows >= 10s)
+KEEPALIVE_TIMEOUT_MS = int(os.environ.get('GRPC_KEEPALIVE_TIMEOUT_MS', '10000'))  # treat the connection as dead if a ping goes unanswered this long
+WINDOW_BYTES = int(os.environ.get('GRPC_HTTP2_WINDOW_BYTES', str(1024 * 1024)))  # initial HTTP/2 stream window
+MAX_MESSAGE_BYTES = int(os.environ.get('GRPC_MAX_MESSAGE_BYTES', str(16 * 1024 * 1024)))  # largest message sent or received
+CONNECT_TIMEOUT = float(os.environ.get('GRPC_CONNECT_TIMEOUT', '5'))  # seconds to wait for the channel on each connection attempt
+RPC_TIMEOUT = float(os.environ.get('GRPC_RPC_TIMEOUT', '30'))       # deadline for unary calls
+RECONNECT_ATTEMPTS = int(os.environ.get('GRPC_RECONNECT_ATTEMPTS', '5'))  # tries to reopen a broken Chat stream before giving up
+RECONNECT_BASE_DELAY = float(os.environ.get('GRPC_RECONNECT_BASE_DELAY', '0.5'))  # first backoff delay; doubles per failed attempt
+RECONNECT_MAX_DELAY = float(os.environ.get('GRPC_RECONNECT_MAX_DELAY', '8'))  # backoff ceiling
+
+COMPRESSION_ALGORITHMS = {
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+    'none': grpc.Compression.NoCompression
+}
+
+CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', KEEPALIVE_TIME_MS),
+    ('grpc.keepalive_timeout_ms', KEEPALIVE_TIMEOUT_MS),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.http2.lookahead_bytes', WINDOW_BYTES),
+    ('grpc.http2.bdp_probe', 1),
+    ('grpc.max_send_message_length', MAX_MESSAGE_BYTES),
+    ('grpc.max_receive_message_length', MAX_MESSAGE_BYTES)
+]
+
+# Stateless RPCs spread over every replica; a replica that is down, draining or reports
+# chat.ChatService NOT_SERVING on its health service drops out of the rotation until it is back
+BALANCED_SERVICE_CONFIG = dict(ROUND_ROBIN_CONFIG, healthCheckConfig={'serviceName': 'chat.ChatService'})
+BALANCED_CHANNEL_OPTIONS = CHANNEL_OPTIONS + [('grpc.service_config', json.dumps(BALANCED_SERVICE_CONFIG))]
+
+# Unary calls wait out short outages (the channel reconnects underneath) instead of failing at once
+UNARY_CALL_OPTIONS = {'timeout': RPC_TIMEOUT, 'wait_for_ready': True}
 
 # Session statistics
 session_stats = {
@@ -49,8 +102,11 @@ current_session = {
 
 # gRPC state
 grpc_state = {
-    'channel': None,
+    'channel': None,  # round-robin over every replica, for stateless RPCs
     'stub': None,
+    'ring': None,  # consistent-hash ring placing sessions on replicas
+    'replicas': {},  # replica -> (channel, stub) for its sessions
+    'session_replicas': {},  # session ID -> replica it lives on
     'chat_stream': None,
     'is_streaming': False,
     'current_response': '',
@@ -62,6 +118,305 @@ grpc_state = {
 # Global lock for print operations
 print_lock = threading.Lock()
 
+def as_chat_event(response: chat_pb2.ChatResponse) -> chat_pb2.ChatEvent:
+    """
+    Convert a v1 ChatResponse (from a server without ChatV2) into the equivalent ChatEvent
+    """
+    if response.type == chat_pb2.ChatResponse.STATUS:
+        return chat_pb2.ChatEvent(status=chat_pb2.TurnStatus(message=response.status_message, context_messages=response.context_messages))
+    if response.type == chat_pb2.ChatResponse.RESPONSE_START:
+        return chat_pb2.ChatEvent(response_start=chat_pb2.ResponseStarted())
+    if response.type == chat_pb2.ChatResponse.CHUNK:
+        return chat_pb2.ChatEvent(chunk=chat_pb2.TextChunk(text=response.chunk_text, number=response.chunk_number))
+    if response.type == chat_pb2.ChatResponse.RESPONSE_COMPLETE:
+        return chat_pb2.ChatEvent(complete=chat_pb2.TurnCompleted(
+            total_chunks=response.total_chunks, processing_time_ms=int(response.processing_time * 1000),
+            message_count=response.message_count))
+    if response.type == chat_pb2.ChatResponse.PONG:
+        return chat_pb2.ChatEvent(pong=chat_pb2.Pong())
+    return chat_pb2.ChatEvent(error=chat_pb2.ChatError(message=response.error_message or "Unexpected response"))
+
+class ChatStream:
+    """
+    One long-lived bidirectional Chat stream for a session
+    
+    Requests are written to the open stream through a queue and a background task reads
+    the responses, so a turn or a ping costs one message instead of a new RPC. A stream
+    that breaks is reopened on the next send, backing off exponentially while the server
+    is unreachable.
+    
+    The stream speaks ChatV2 (typed events, session ID sent once per stream) and drops
+    to the v1 Chat RPC for servers that do not implement it.
+    
+    With a ``replica`` (load-balanced clients), a replica that cannot be reached moves the
+    session to the next replica on the hash ring instead of retrying.
+    """
+    
+    def __init__(self, channel: grpc.aio.Channel, stub: chat_pb2_grpc.ChatServiceStub, session_id: str, replica: Optional[str] = None):
+        self.channel = channel
+        self.stub = stub
+        self.session_id = session_id
+        self.replica = replica
+        self.version = 2
+        self.session_sent = False
+        self.requests: Optional[asyncio.Queue] = None
+        self.responses: Optional[asyncio.Queue] = None
+        self.call = None
+        self.reader: Optional[asyncio.Task] = None
+    
+    @property
+    def is_open(self) -> bool:
+        return self.reader is not None and not self.reader.done()
+    
+    async def read(self, call, responses: asyncio.Queue, version: int):
+        """
+        Move events from the stream to the queue; None or the error marks the end
+        """
+        try:
+            async for response in call:
+                responses.put_nowait(response if version == 2 else as_chat_event(response))
+            responses.put_nowait(None)
+        except grpc.aio.AioRpcError as e:
+            responses.put_nowait(e)
+    
+    async def open(self):
+        """
+        Open the stream, retrying with exponential backoff and jitter while the server is unreachable
+        """
+        reopening = self.call is not None
+        delay = RECONNECT_BASE_DELAY
+        for attempt in range(1, RECONNECT_ATTEMPTS + 1):
+            try:
+                if self.replica is None:
+                    await asyncio.wait_for(self.channel.channel_ready(), timeout=CONNECT_TIMEOUT)
+                elif not await wait_until_connected(self.channel, CONNECT_TIMEOUT) and not await self.fail_over():
+                    raise asyncio.TimeoutError()
+                break
+            except asyncio.TimeoutError:
+                if attempt == RECONNECT_ATTEMPTS:
+                    raise ConnectionError(f"server unreachable after {attempt} attempts")
+                wait = delay * random.uniform(0.5, 1.0)
+                safe_print(f"{Fore.YELLOW}🔄 Server unreachable, retrying in {wait:.1f}s (attempt {attempt}/{RECONNECT_ATTEMPTS})...{Style.RESET_ALL}")
+                await asyncio.sleep(wait)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        
+        requests: asyncio.Queue = asyncio.Queue()
+        
+        async def request_iterator():
+            while (request := await requests.get()) is not None:
+                yield request
+        
+        self.requests = requests
+        self.responses = asyncio.Queue()
+        self.session_sent = False
+        self.call = (self.stub.ChatV2 if self.version == 2 else self.stub.Chat)(request_iterator())
+        self.reader = asyncio.create_task(self.read(self.call, self.responses, self.version))
+        
+        if reopening:
+            session_stats['reconnections'] += 1
+            safe_print(f"{Fore.GREEN}🔄 Chat stream reopened for session {self.session_id[:8]}...{Style.RESET_ALL}")
+    
+    async def fail_over(self) -> bool:
+        """
+        Move the session to the next reachable replica on the ring; False when there is none
+        """
+        replica = await fail_over_session(self.session_id, self.replica)
+        if replica is None:
+            return False
+        safe_print(f"{Fore.YELLOW}🔀 Replica {self.replica} is unreachable; session {self.session_id[:8]}... moved to {replica} (earlier context stays behind){Style.RESET_ALL}")
+        self.replica = replica
+        self.channel, self.stub = replica_channel(replica)
+        return True
+    
+    def send(self, request: chat_pb2.ChatRequest):
+        # v1 wants the session on every request; v2 only on the first one of a stream
+        if self.version == 1 or not self.session_sent:
+            request.session_id = self.session_id
+            self.session_sent = True
+        self.requests.put_nowait(request)
+    
+    async def exchange(self, request: chat_pb2.ChatRequest, last_events: Tuple[str, ...]) -> AsyncGenerator[chat_pb2.ChatEvent, None]:
+        """
+        Send one request on the stream and yield its events, up to one of the ``last_events`` kinds
+        """
+        if not self.is_open:
+            await self.open()
+        
+        self.send(request)
+        finished = False
+        try:
+            while True:
+                event = await self.responses.get()
+                if event is None:
+                    raise ConnectionError("Chat stream closed by the server")
+                if isinstance(event, grpc.aio.AioRpcError):
+                    if event.code() == grpc.StatusCode.UNIMPLEMENTED and self.version == 2:
+                        # Older server: nothing was processed, so resend on a v1 stream
+                        safe_print(f"{Fore.YELLOW}⚠️  Server has no ChatV2; using the v1 Chat RPC{Style.RESET_ALL}")
+                        self.version = 1
+                        await self.open()
+                        self.send(request)
+                        continue
+                    raise event
+                
+                kind = event.WhichOneof('event')
+                if kind == 'started':
+                    continue  # confirms the session the stream is bound to
+                yield event
+                if kind in last_events or kind == 'error':
+                    finished = True
+                    return
+        finally:
+            if not finished:
+                # Responses to an abandoned request would be read as the next one's, so start over
+                self.abort()
+    
+    def abort(self):
+        """
+        Drop the stream at once; the next send opens a new one
+        """
+        if self.call is not None:
+            self.call.cancel()
+        if self.reader is not None:
+            self.reader.cancel()
+    
+    async def close(self):
+        """
+        Half-close the stream and let the server finish it
+        """
+        if not self.is_open:
+            return
+        self.requests.put_nowait(None)
+        try:
+            await asyncio.wait_for(asyncio.shield(self.reader), timeout=2)
+        except asyncio.TimeoutError:
+            self.abort()
+
+def open_channel(replica: Optional[str] = None) -> grpc.aio.Channel:
+    """
+    Open a channel with the tuned keepalive, window and compression settings: to one
+    replica, or by default round-robin over all of them
+    """
+    return grpc.aio.insecure_channel(
+        replica or round_robin_target(SERVER_TARGETS),
+        options=CHANNEL_OPTIONS if replica else BALANCED_CHANNEL_OPTIONS,
+        compression=COMPRESSION_ALGORITHMS.get(COMPRESSION, grpc.Compression.Gzip),
+        interceptors=client_interceptors()
+    )
+
+def ensure_channel() -> chat_pb2_grpc.ChatServiceStub:
+    """
+    Return the stub on the shared channel, opening the channel on first use
+    """
+    if grpc_state['channel'] is None:
+        grpc_state['ring'] = grpc_state['ring'] or HashRing(ring_nodes(SERVER_TARGETS))
+        grpc_state['channel'] = open_channel()
+        grpc_state['stub'] = chat_pb2_grpc.ChatServiceStub(grpc_state['channel'])
+    return grpc_state['stub']
+
+def is_load_balanced() -> bool:
+    return len(grpc_state['ring'].nodes) > 1
+
+def replica_channel(replica: str) -> Tuple[grpc.aio.Channel, chat_pb2_grpc.ChatServiceStub]:
+    """
+    The channel and stub for one replica's sessions (the shared channel when there is only one)
+    """
+    if not is_load_balanced():
+        return grpc_state['channel'], grpc_state['stub']
+    if replica not in grpc_state['replicas']:
+        channel = open_channel(replica)
+        grpc_state['replicas'][replica] = (channel, chat_pb2_grpc.ChatServiceStub(channel))
+    return grpc_state['replicas'][replica]
+
+def session_replica(session_id: str) -> str:
+    """
+    The replica a session lives on: where it was created (or moved), else its ring owner
+    """
+    return grpc_state['session_replicas'].get(session_id) or grpc_state['ring'].node_for(session_id)
+
+def session_stub(session_id: str) -> chat_pb2_grpc.ChatServiceStub:
+    return replica_channel(session_replica(session_id))[1]
+
+async def create_on_ring(request: chat_pb2.CreateSessionRequest, skip: Optional[str] = None) -> Tuple[Optional[str], Optional[chat_pb2.CreateSessionResponse]]:
+    """
+    Create a session on the first reachable replica in its ring order (other than ``skip``)
+    and pin it there
+    
+    Returns:
+        Tuple: The replica (None when no replica took the session) and the last response
+        (None when the replica already had the session, or when none answered).
+    """
+    response = None
+    for replica in grpc_state['ring'].nodes_for(request.session_id):
+        channel, stub = replica_channel(replica)
+        if replica == skip or not await wait_until_connected(channel, CONNECT_TIMEOUT):
+            continue
+        try:
+            response = await stub.CreateSession(request, timeout=RPC_TIMEOUT)
+            if not response.success:
+                continue
+        except grpc.aio.AioRpcError as e:
+            # ALREADY_EXISTS: the replica was only unreachable for a while and still has the session
+            if e.code() != grpc.StatusCode.ALREADY_EXISTS:
+                continue
+            response = None
+        grpc_state['session_replicas'][response.session_id if response else request.session_id] = replica
+        return replica, response
+    return None, response
+
+async def fail_over_session(session_id: str, failed: str) -> Optional[str]:
+    """
+    Recreate a session on the first reachable replica after ``failed`` on the ring and pin it there
+    
+    Sessions live in server memory, so the conversation starts over on the new replica.
+    """
+    model = current_session['model'] if current_session['session_id'] == session_id else None
+    replica, _ = await create_on_ring(chat_pb2.CreateSessionRequest(session_id=session_id, model_id=model or ""), skip=failed)
+    return replica
+
+def current_chat_stream() -> ChatStream:
+    """
+    The persistent Chat stream for the current session (switching sessions closes the old one)
+    """
+    stream = grpc_state['chat_stream']
+    if stream is None or stream.session_id != current_session['session_id']:
+        if stream is not None:
+            stream.abort()
+        session_id = current_session['session_id']
+        replica = session_replica(session_id)
+        channel, stub = replica_channel(replica)
+        stream = ChatStream(channel, stub, session_id, replica if is_load_balanced() else None)
+        grpc_state['chat_stream'] = stream
+    return stream
+
+async def read_input(prompt: str) -> str:
+    """
+    Read a line on a helper thread so the event loop (stream readers, keepalives) keeps running
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(result: Optional[str]):
+        if future.done():
+            return
+        if result is None:
+            future.set_exception(EOFError())
+        else:
+            future.set_result(result)
+    
+    def read():
+        try:
+            result = input(prompt)
+        except BaseException:  # EOF or Ctrl+C at the prompt
+            result = None
+        try:
+            loop.call_soon_threadsafe(settle, result)
+        except RuntimeError:  # the loop already closed
+            pass
+    
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
 def safe_print(*args, **kwargs):
     """
     Thread-safe print function
@@ -74,35 +429,47 @@ def print_banner():
     print(f"               🚀 GRPC MULTI-TURN CHAT CLIENT 🚀               ")
     print(f"{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}")
     print(f"  Server: {Fore.CYAN}{SERVER_URL:<47}{Style.RESET_ALL}  ")
-    print(f"  Framework: {Fore.MAGENTA}gRPC + Async Streaming{' ' * 28}{Style.RESET_ALL}  ")
+    print(f"  Framework: {Fore.MAGENTA}gRPC AsyncIO + Async Streaming{' ' * 20}{Style.RESET_ALL}  ")
     print(f"  Multi-turn: {Fore.GREEN}ENABLED{' ' * 37}{Style.RESET_ALL}  ")
     print(f"  Streaming: {Fore.GREEN}BIDIRECTIONAL{' ' * 33}{Style.RESET_ALL}  ")
     print(f"  Status: {Fore.YELLOW}CONNECTING...{' ' * 35}{Style.RESET_ALL}  ")
     print(f"{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}")
 
-def check_server_health():
+async def check_server_health():
     """
     Check if the gRPC server is running and healthy
     """
     print(f"{Fore.YELLOW}🔍 Checking gRPC server health...{Style.RESET_ALL}")
     
     try:
-        with grpc.insecure_channel(SERVER_URL) as channel:
-            grpc.channel_ready_future(channel).result(timeout=5)
-            
-            stub = chat_pb2_grpc.ChatServiceStub(channel)
-            
-            # Try to get server stats as a health check
-            response = stub.GetServerStats(chat_pb2.ServerStatsRequest())
-            
-            print(f"{Fore.GREEN}✅ gRPC server is healthy!{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}   Model: {response.model}{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}   Server Requests: {response.total_requests}{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}   Active Sessions: {response.active_sessions}{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}   Framework: {response.framework}{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}   Uptime: {str(timedelta(seconds=response.uptime_seconds))}{Style.RESET_ALL}")
-            
-            return True
+        # The check runs on the shared channel, which stays open for the rest of the session
+        stub = ensure_channel()
+        await asyncio.wait_for(grpc_state['channel'].channel_ready(), timeout=CONNECT_TIMEOUT)
+        
+        # Ask the standard health service whether the chat service is ready for new work
+        if health_pb2 is not None:
+            health_stub = health_pb2_grpc.HealthStub(grpc_state['channel'])
+            try:
+                health = await health_stub.Check(health_pb2.HealthCheckRequest(service='chat.ChatService'), timeout=RPC_TIMEOUT)
+                if health.status != health_pb2.HealthCheckResponse.SERVING:
+                    status = health_pb2.HealthCheckResponse.ServingStatus.Name(health.status)
+                    print(f"{Fore.YELLOW}⚠️  gRPC server is up but not serving ({status}): starting, overloaded or draining{Style.RESET_ALL}")
+                    return False
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:  # older server without the health service
+                    raise
+        
+        # Server stats for display
+        response = await stub.GetServerStats(chat_pb2.ServerStatsRequest(), timeout=RPC_TIMEOUT)
+        
+        print(f"{Fore.GREEN}✅ gRPC server is healthy!{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Model: {response.model}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Server Requests: {response.total_requests}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Active Sessions: {response.active_sessions}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Framework: {response.framework}{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}   Uptime: {str(timedelta(seconds=response.uptime_seconds))}{Style.RESET_ALL}")
+        
+        return True
             
     except grpc.RpcError as e:
         print(f"{Fore.RED}❌ gRPC server health check failed: {e.details()}{Style.RESET_ALL}")
@@ -174,6 +541,32 @@ def print_session_stats():
     
     print(f"{Fore.MAGENTA}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
+def print_rpc_metrics():
+    """
+    Print per-method call metrics recorded by the client interceptors
+    """
+    started = registry.metrics.get('grpc_client_started_total')
+    if started is None or not started.samples:
+        print(f"{Fore.YELLOW}📈 No RPCs recorded yet{Style.RESET_ALL}")
+        return
+    
+    def total(name: str, method: str, code: str = None) -> int:
+        return int(sum(value for labels, value in registry.metrics[name].samples.items()
+                       if labels[0] == method and (code is None or labels[1] != code)))
+    
+    latency = registry.metrics['grpc_client_handling_seconds']
+    print(f"\n{Fore.MAGENTA}┌─ 📈 CLIENT RPC METRICS ─────────────────────────────────────┐{Style.RESET_ALL}")
+    for (method, rpc_type), calls in sorted(started.samples.items()):
+        line = f"  {Fore.CYAN}{method.rsplit('/', 1)[-1]}{Style.RESET_ALL} ({rpc_type}): {int(calls)} calls"
+        line += f", {total('grpc_client_in_flight', method)} open, {total('grpc_client_handled_total', method, 'OK')} failed"
+        _, seconds, count = latency.samples.get((method, rpc_type), (None, 0.0, 0))
+        if count:
+            line += f", avg {seconds / count * 1000:.0f}ms, p95 <= {latency.quantile((method, rpc_type), 0.95) * 1000:.0f}ms"
+        print(line)
+        print(f"    sent {total('grpc_client_msg_sent_total', method)} msgs / {total('grpc_client_bytes_sent_total', method)} B, "
+              f"received {total('grpc_client_msg_received_total', method)} msgs / {total('grpc_client_bytes_received_total', method)} B")
+    print(f"{Fore.MAGENTA}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
+
 def print_help():
     """
     Print available commands
@@ -181,6 +574,7 @@ def print_help():
     print(f"\n{Fore.YELLOW}📋 Available Commands:{Style.RESET_ALL}")
     print(f"{Fore.CYAN}  /help{Style.RESET_ALL}     - Show this help message")
     print(f"{Fore.CYAN}  /stats{Style.RESET_ALL}    - Show client session statistics")
+    print(f"{Fore.CYAN}  /metrics{Style.RESET_ALL}  - Show per-RPC latency and message metrics")
     print(f"{Fore.CYAN}  /server{Style.RESET_ALL}   - Show server statistics")
     print(f"{Fore.CYAN}  /health{Style.RESET_ALL}   - Check server health")
     print(f"{Fore.CYAN}  /clear{Style.RESET_ALL}    - Clear the screen")
@@ -190,6 +584,8 @@ def print_help():
     print(f"{Fore.CYAN}  /connect{Style.RESET_ALL}  - Connect to gRPC server")
     print(f"{Fore.CYAN}  /disconnect{Style.RESET_ALL} - Disconnect from gRPC server")
     print(f"{Fore.CYAN}  /ping{Style.RESET_ALL}     - Send ping to server")
+    print(f"{Fore.CYAN}  /batch q1 | q2{Style.RESET_ALL} - Ask independent questions in one ChatBatch call")
+    print(f"{Fore.CYAN}  /ask prompt{Style.RESET_ALL} - One-off question with no session (Ask RPC)")
     print()
     print(f"{Fore.YELLOW}🔄 Session Management:{Style.RESET_ALL}")
     print(f"{Fore.CYAN}  /new{Style.RESET_ALL}      - Create a new chat session")
@@ -197,7 +593,7 @@ def print_help():
     print(f"{Fore.CYAN}  /sessions{Style.RESET_ALL} - List all active sessions")
     print(f"{Fore.CYAN}  /delete{Style.RESET_ALL}   - Delete current session")
 
-def get_server_stats():
+async def get_server_stats():
     """
     Get and display server statistics
     """
@@ -206,7 +602,7 @@ def get_server_stats():
             print(f"{Fore.RED}❌ Not connected to gRPC server{Style.RESET_ALL}")
             return
         
-        response = grpc_state['stub'].GetServerStats(chat_pb2.ServerStatsRequest())
+        response = await grpc_state['stub'].GetServerStats(chat_pb2.ServerStatsRequest(), **UNARY_CALL_OPTIONS)
         uptime_str = str(timedelta(seconds=response.uptime_seconds))
         
         print(f"\n{Fore.CYAN}┌─ 🖥️  GRPC SERVER STATISTICS ─────────────────────────────────┐{Style.RESET_ALL}")
@@ -226,7 +622,7 @@ def get_server_stats():
     except Exception as e:
         print(f"{Fore.RED}❌ Error getting server stats: {e}{Style.RESET_ALL}")
 
-def get_session_info():
+async def get_session_info():
     """
     Get information about current session
     """
@@ -240,7 +636,7 @@ def get_session_info():
             return False
             
         request = chat_pb2.SessionInfoRequest(session_id=current_session['session_id'])
-        response = grpc_state['stub'].GetSessionInfo(request)
+        response = await session_stub(current_session['session_id']).GetSessionInfo(request, **UNARY_CALL_OPTIONS)
         
         if not response.success:
             print(f"{Fore.RED}❌ Failed to get session info: {response.message}{Style.RESET_ALL}")
@@ -266,7 +662,7 @@ def get_session_info():
         print(f"{Fore.RED}❌ Error getting session info: {e}{Style.RESET_ALL}")
         return False
 
-def list_all_sessions():
+async def list_all_sessions():
     """
     List all active sessions on the server
     """
@@ -275,9 +671,11 @@ def list_all_sessions():
             print(f"{Fore.RED}❌ Not connected to gRPC server{Style.RESET_ALL}")
             return False
         
-        response = grpc_state['stub'].ListSessions(chat_pb2.ListSessionsRequest())
+        response = await grpc_state['stub'].ListSessions(chat_pb2.ListSessionsRequest(), **UNARY_CALL_OPTIONS)
         
         print(f"\n{Fore.CYAN}┌─ 📋 ALL ACTIVE SESSIONS ({response.active_sessions}) ────────────────────────┐{Style.RESET_ALL}")
+        if is_load_balanced():
+            print(f"  {Fore.YELLOW}(one replica's sessions; each replica keeps its own){Style.RESET_ALL}")
         
         if not response.sessions:
             print(f"  No active sessions")
@@ -290,6 +688,9 @@ def list_all_sessions():
                 
                 print(f"  {i}. {session.session_id[:8]}... ({session.message_count} msgs, {duration_str}, {created_time}){Fore.GREEN}{marker}{Style.RESET_ALL}")
         
+        if response.next_cursor:
+            print(f"  ... {response.active_sessions - len(response.sessions)} more (first page only)")
+        
         print(f"{Fore.CYAN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
         return True
         
@@ -300,7 +701,7 @@ def list_all_sessions():
         print(f"{Fore.RED}❌ Error listing sessions: {e}{Style.RESET_ALL}")
         return False
 
-def connect_grpc():
+async def connect_grpc():
     """
     Connect to gRPC server
     """
@@ -313,17 +714,18 @@ def connect_grpc():
     try:
         session_stats['connection_attempts'] += 1
         
-        # Create channel and stub
-        grpc_state['channel'] = grpc.insecure_channel(SERVER_URL)
-        grpc.channel_ready_future(grpc_state['channel']).result(timeout=5)
-        grpc_state['stub'] = chat_pb2_grpc.ChatServiceStub(grpc_state['channel'])
+        # Reuse the channel from the health check; one channel carries every call and stream
+        ensure_channel()
+        await asyncio.wait_for(grpc_state['channel'].channel_ready(), timeout=CONNECT_TIMEOUT)
         
         current_session['is_connected'] = True
         
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         print(f"\n{Fore.GREEN}┌─ 🚀 GRPC CONNECTED [{timestamp}] ─────────────────────────────┐{Style.RESET_ALL}")
         print(f"  Server: {Fore.CYAN}{SERVER_URL}{Style.RESET_ALL}")
-        print(f"  Framework: {Fore.MAGENTA}gRPC + Async Streaming{Style.RESET_ALL}")
+        if is_load_balanced():
+            print(f"  Replicas: {Fore.CYAN}{len(grpc_state['ring'].nodes)} (round_robin; sessions pinned by consistent hash){Style.RESET_ALL}")
+        print(f"  Framework: {Fore.MAGENTA}gRPC AsyncIO + Async Streaming{Style.RESET_ALL}")
         print(f"  Protocol: gRPC")
         print(f"  Streaming: {Fore.GREEN}BIDIRECTIONAL{Style.RESET_ALL}")
         print(f"{Fore.GREEN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
@@ -331,7 +733,7 @@ def connect_grpc():
         print(f"{Fore.GREEN}✅ gRPC connected successfully!{Style.RESET_ALL}")
         return True
         
-    except grpc.FutureTimeoutError:
+    except asyncio.TimeoutError:
         print(f"{Fore.RED}❌ Connection timeout - server may not be running{Style.RESET_ALL}")
         session_stats['failed_requests'] += 1
         return False
@@ -340,7 +742,7 @@ def connect_grpc():
         session_stats['failed_requests'] += 1
         return False
 
-def disconnect_grpc():
+async def disconnect_grpc():
     """
     Disconnect from gRPC server
     """
@@ -354,11 +756,15 @@ def disconnect_grpc():
         grpc_state['should_stop'] = True
         
         if grpc_state['chat_stream']:
+            await grpc_state['chat_stream'].close()
             grpc_state['chat_stream'] = None
         
         if grpc_state['channel']:
-            grpc_state['channel'].close()
+            await grpc_state['channel'].close()
+        for channel, _ in grpc_state['replicas'].values():
+            await channel.close()
         
+        grpc_state['replicas'] = {}
         grpc_state['channel'] = None
         grpc_state['stub'] = None
         current_session['is_connected'] = False
@@ -374,7 +780,7 @@ def disconnect_grpc():
     except Exception as e:
         print(f"{Fore.RED}❌ Error disconnecting: {e}{Style.RESET_ALL}")
 
-def create_new_session():
+async def create_new_session():
     """
     Create a new chat session
     """
@@ -385,10 +791,22 @@ def create_new_session():
     try:
         print_message_sent('CreateSession')
         
-        request = chat_pb2.CreateSessionRequest(model_id="gemini-2.0-flash")
-        response = grpc_state['stub'].CreateSession(request)
+        # Choose the ID here so the session is created on the replica the ring picks for it
+        session_id = str(uuid.uuid4())
+        request = chat_pb2.CreateSessionRequest(model_id="gemini-2.0-flash", session_id=session_id)
+        if is_load_balanced():
+            # Replicas that are down are skipped, so losing one doesn't fail its share of new sessions
+            replica, response = await create_on_ring(request)
+            if response is None:
+                print(f"{Fore.RED}❌ Failed to create session: no replica is reachable{Style.RESET_ALL}")
+                session_stats['failed_requests'] += 1
+                return
+        else:
+            replica = grpc_state['ring'].node_for(session_id)
+            response = await grpc_state['stub'].CreateSession(request, **UNARY_CALL_OPTIONS)
         
         if response.success:
+            grpc_state['session_replicas'][response.session_id] = replica
             current_session['session_id'] = response.session_id
             current_session['model'] = response.model
             current_session['message_count'] = 0
@@ -396,6 +814,8 @@ def create_new_session():
             session_stats['sessions_created'] += 1
             
             print(f"{Fore.GREEN}✨ New session created: {response.session_id[:8]}... ({response.model}){Style.RESET_ALL}")
+            if is_load_balanced():
+                print(f"{Fore.CYAN}📍 Pinned to replica {replica}{Style.RESET_ALL}")
         else:
             print(f"{Fore.RED}❌ Failed to create session: {response.message}{Style.RESET_ALL}")
             
@@ -406,7 +826,7 @@ def create_new_session():
         print(f"{Fore.RED}❌ Error creating session: {e}{Style.RESET_ALL}")
         session_stats['failed_requests'] += 1
 
-def delete_current_session():
+async def delete_current_session():
     """
     Delete the current session
     """
@@ -422,10 +842,14 @@ def delete_current_session():
         print_message_sent('DeleteSession')
         
         request = chat_pb2.DeleteSessionRequest(session_id=current_session['session_id'])
-        response = grpc_state['stub'].DeleteSession(request)
+        response = await session_stub(current_session['session_id']).DeleteSession(request, **UNARY_CALL_OPTIONS)
         
         if response.success:
+            grpc_state['session_replicas'].pop(current_session['session_id'], None)
             print(f"{Fore.GREEN}🗑️ Session {current_session['session_id'][:8]}... deleted successfully{Style.RESET_ALL}")
+            if grpc_state['chat_stream']:
+                grpc_state['chat_stream'].abort()
+                grpc_state['chat_stream'] = None
             current_session['session_id'] = None
             current_session['model'] = None
             current_session['message_count'] = 0
@@ -453,29 +877,23 @@ async def send_chat_message(user_message: str):
         session_stats['messages_sent'] += 1
         print_message_sent('Chat', user_message)
         
-        # Create the request
+        # Create the request (the stream adds the session ID when the protocol needs it)
         request = chat_pb2.ChatRequest(
             type=chat_pb2.ChatRequest.MESSAGE,
-            session_id=current_session['session_id'],
-            message=user_message,
-            timestamp=datetime.now().isoformat()
+            message=user_message
         )
         
-        # Use a simple generator function
-        def request_generator():
-            yield request
-        
-        # Start the chat stream - note: using the synchronous stub
+        # Send the turn on the session's persistent stream
         try:
-            response_stream = grpc_state['stub'].Chat(request_generator())
+            stream = current_chat_stream()
             
-            # Process responses synchronously
-            for response in response_stream:
-                if response.type == chat_pb2.ChatResponse.STATUS:
-                    session_context = f"(Context: {response.context_messages} messages)"
-                    safe_print(f"{Fore.YELLOW}💭 {response.status_message} {session_context}{Style.RESET_ALL}")
+            async for event in stream.exchange(request, ('complete',)):
+                kind = event.WhichOneof('event')
+                if kind == 'status':
+                    session_context = f"(Context: {event.status.context_messages} messages)"
+                    safe_print(f"{Fore.YELLOW}💭 {event.status.message} {session_context}{Style.RESET_ALL}")
                 
-                elif response.type == chat_pb2.ChatResponse.RESPONSE_START:
+                elif kind == 'response_start':
                     grpc_state['is_streaming'] = True
                     grpc_state['current_response'] = ''
                     grpc_state['chunk_count'] = 0
@@ -485,17 +903,18 @@ async def send_chat_message(user_message: str):
                     session_context = f"({Fore.CYAN}{current_session['session_id'][:8]}...{Style.RESET_ALL} - {current_session['model']})"
                     display_ai_response_header(session_context)
                 
-                elif response.type == chat_pb2.ChatResponse.CHUNK:
+                elif kind == 'chunk':
                     grpc_state['chunk_count'] += 1
                     session_stats['total_chunks_received'] += 1
-                    chunk_text = response.chunk_text
-                    grpc_state['current_response'] += chunk_text + " "
+                    chunk_text = event.chunk.text
+                    grpc_state['current_response'] += chunk_text
                     
-                    # Print chunk in real-time
+                    # Print chunk in real-time (chunks carry their own spacing)
                     with print_lock:
-                        print(f"{Fore.WHITE}{chunk_text} {Style.RESET_ALL}", end='', flush=True)
+                        print(f"{Fore.WHITE}{chunk_text}{Style.RESET_ALL}", end='', flush=True)
                 
-                elif response.type == chat_pb2.ChatResponse.RESPONSE_COMPLETE:
+                elif kind == 'complete':
+                    response = event.complete
                     if grpc_state['is_streaming']:
                         safe_print()  # New line after response
                         display_ai_response_footer()
@@ -512,21 +931,26 @@ async def send_chat_message(user_message: str):
                     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
                     safe_print(f"\n{Fore.GREEN}┌─ 🚀 GRPC RESPONSE COMPLETED [{timestamp}] ────────────────────┐{Style.RESET_ALL}")
                     safe_print(f"  Total Chunks: {response.total_chunks}")
-                    safe_print(f"  Total Time: {Fore.YELLOW}{response.processing_time:.3f}s{Style.RESET_ALL}")
+                    safe_print(f"  Total Time: {Fore.YELLOW}{response.processing_time_ms / 1000:.3f}s{Style.RESET_ALL}")
                     safe_print(f"  Context Messages: {response.message_count}")
-                    safe_print(f"  Protocol: gRPC Stream")
+                    safe_print(f"  Protocol: gRPC Stream (Chat v{stream.version})")
                     safe_print(f"  Status: {Fore.GREEN}SUCCESS{Style.RESET_ALL}")
                     safe_print(f"{Fore.GREEN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
                     
                     grpc_state['is_streaming'] = False
-                    break
                 
-                elif response.type == chat_pb2.ChatResponse.ERROR:
+                elif kind == 'error':
                     session_stats['failed_requests'] += 1
-                    safe_print(f"\n{Fore.RED}❌ Server Error: {response.error_message}{Style.RESET_ALL}")
-                    break
+                    safe_print(f"\n{Fore.RED}❌ Server Error: {event.error.message}{Style.RESET_ALL}")
+        
+        except grpc.aio.AioRpcError as stream_error:
+            grpc_state['is_streaming'] = False
+            session_stats['failed_requests'] += 1
+            print(f"\n{Fore.RED}❌ gRPC stream broke ({stream_error.code().name}): {stream_error.details()}{Style.RESET_ALL}")
+            print(f"{Fore.YELLOW}💡 The stream reopens with your next message; this one was not resent{Style.RESET_ALL}")
         
         except Exception as stream_error:
+            grpc_state['is_streaming'] = False
             session_stats['failed_requests'] += 1
             print(f"\n{Fore.RED}❌ gRPC streaming error: {stream_error}{Style.RESET_ALL}")
             
@@ -537,6 +961,77 @@ async def send_chat_message(user_message: str):
         session_stats['failed_requests'] += 1
         print(f"\n{Fore.RED}❌ Error sending message: {e}{Style.RESET_ALL}")
 
+async def send_batch(batch_input: str):
+    """
+    Send independent questions in one ChatBatch call and show each answer as it completes
+    """
+    messages = [message.strip() for message in batch_input.split('|') if message.strip()]
+    if not messages:
+        print(f"{Fore.YELLOW}💡 Usage: /batch first question | second question | ...{Style.RESET_ALL}")
+        return
+    
+    if not grpc_state['stub']:
+        print(f"{Fore.RED}❌ Not connected to gRPC server{Style.RESET_ALL}")
+        return
+    
+    request = chat_pb2.ChatBatchRequest(items=[chat_pb2.ChatBatchItem(message=message) for message in messages])
+    print(f"{Fore.BLUE}📦 Sending batch of {len(messages)} questions...{Style.RESET_ALL}")
+    
+    try:
+        start_time = time.time()
+        succeeded = 0
+        async for result in grpc_state['stub'].ChatBatch(request, timeout=RPC_TIMEOUT * len(messages), wait_for_ready=True):
+            if result.success:
+                succeeded += 1
+                display_ai_response_header(f"(#{result.index + 1}: \"{messages[result.index][:30]}\", session {result.session_id[:8]}...)")
+                safe_print(f"{Fore.WHITE}{result.response}{Style.RESET_ALL}")
+                display_ai_response_footer()
+            else:
+                safe_print(f"\n{Fore.RED}❌ #{result.index + 1} failed: {result.error_message}{Style.RESET_ALL}")
+        
+        print(f"\n{Fore.GREEN}✅ Batch done: {succeeded} succeeded, {len(messages) - succeeded} failed in {time.time() - start_time:.3f}s{Style.RESET_ALL}")
+        
+    except grpc.RpcError as e:
+        print(f"{Fore.RED}❌ gRPC error in batch: {e.details()}{Style.RESET_ALL}")
+
+async def send_ask(prompt: str):
+    """
+    Stream the answer to a one-off prompt through the stateless Ask RPC (no session needed)
+    """
+    prompt = prompt.strip()
+    if not prompt:
+        print(f"{Fore.YELLOW}💡 Usage: /ask your question{Style.RESET_ALL}")
+        return
+    
+    if not grpc_state['stub']:
+        print(f"{Fore.RED}❌ Not connected to gRPC server{Style.RESET_ALL}")
+        return
+    
+    session_stats['messages_sent'] += 1
+    print_message_sent('Ask', prompt)
+    
+    try:
+        start_time = time.time()
+        async for event in grpc_state['stub'].Ask(chat_pb2.AskRequest(prompt=prompt), **UNARY_CALL_OPTIONS):
+            kind = event.WhichOneof('event')
+            if kind == 'response_start':
+                session_stats['total_streams'] += 1
+                display_ai_response_header("(stateless Ask)")
+            elif kind == 'chunk':
+                session_stats['total_chunks_received'] += 1
+                with print_lock:
+                    print(f"{Fore.WHITE}{event.chunk.text}{Style.RESET_ALL}", end='', flush=True)
+            elif kind == 'complete':
+                safe_print()
+                display_ai_response_footer()
+                session_stats['total_response_time'] += time.time() - start_time
+                session_stats['successful_requests'] += 1
+                safe_print(f"{Fore.GREEN}✅ {event.complete.total_chunks} chunks in {event.complete.processing_time_ms / 1000:.3f}s{Style.RESET_ALL}")
+    
+    except grpc.RpcError as e:
+        session_stats['failed_requests'] += 1
+        print(f"\n{Fore.RED}❌ gRPC error in Ask ({e.code().name}): {e.details()}{Style.RESET_ALL}")
+
 async def send_ping():
     """
     Send ping to server
@@ -552,21 +1047,15 @@ async def send_ping():
     try:
         print(f"{Fore.YELLOW}🏓 Sending ping to server...{Style.RESET_ALL}")
         
-        request = chat_pb2.ChatRequest(
-            type=chat_pb2.ChatRequest.PING,
-            session_id=current_session['session_id'],
-            timestamp=datetime.now().isoformat()
-        )
-        
-        def ping_request_generator():
-            yield request
+        request = chat_pb2.ChatRequest(type=chat_pb2.ChatRequest.PING)
         
-        response_stream = grpc_state['stub'].Chat(ping_request_generator())
-        
-        for response in response_stream:
-            if response.type == chat_pb2.ChatResponse.PONG:
-                print(f"{Fore.GREEN}🏓 Pong received from server{Style.RESET_ALL}")
-                break
+        # Pings ride the session's open stream, so the round trip excludes any RPC setup
+        start_time = time.time()
+        async for event in current_chat_stream().exchange(request, ('pong',)):
+            if event.HasField('pong'):
+                print(f"{Fore.GREEN}🏓 Pong received from server in {(time.time() - start_time) * 1000:.1f}ms{Style.RESET_ALL}")
+            elif event.HasField('error'):
+                print(f"{Fore.RED}❌ Ping failed: {event.error.message}{Style.RESET_ALL}")
         
     except grpc.RpcError as e:
         print(f"{Fore.RED}❌ gRPC error sending ping: {e.details()}{Style.RESET_ALL}")
@@ -580,7 +1069,7 @@ async def main():
     print_banner()
     
     # Check server health before starting
-    if not check_server_health():
+    if not await check_server_health():
         print(f"\n{Fore.RED}Cannot connect to gRPC server. Exiting...{Style.RESET_ALL}")
         return
     
@@ -593,17 +1082,16 @@ async def main():
     
     # Auto-connect on startup
     print(f"\n{Fore.CYAN}🚀 Auto-connecting to gRPC server...{Style.RESET_ALL}")
-    connect_grpc()
-    
-    # Setup signal handlers for graceful shutdown
-    def signal_handler(sig, frame):
-        print(f"\n{Fore.YELLOW}👋 Shutting down gracefully...{Style.RESET_ALL}")
-        disconnect_grpc()
-        print_session_stats()
-        sys.exit(0)
+    await connect_grpc()
     
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Setup signal handlers for graceful shutdown: cancelling the main task runs the cleanup below
+    main_task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, main_task.cancel)
+        except NotImplementedError:  # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+            pass
     
     try:
         while True:
@@ -615,7 +1103,7 @@ async def main():
             connection_indicator = f" {Fore.GREEN}●{Style.RESET_ALL}" if current_session['is_connected'] else f" {Fore.RED}●{Style.RESET_ALL}"
             
             try:
-                user_message = input(f'\n{Fore.CYAN}You{session_indicator}{connection_indicator}{Style.RESET_ALL} {Fore.WHITE}›{Style.RESET_ALL} ').strip()
+                user_message = (await read_input(f'\n{Fore.CYAN}You{session_indicator}{connection_indicator}{Style.RESET_ALL} {Fore.WHITE}›{Style.RESET_ALL} ')).strip()
             except (EOFError, KeyboardInterrupt):
                 break
             
@@ -625,8 +1113,6 @@ async def main():
             # Handle special commands
             if user_message.lower() == '/quit':
                 print(f"\n{Fore.YELLOW}👋 Thanks for chatting with gRPC! Goodbye!{Style.RESET_ALL}")
-                disconnect_grpc()
-                print_session_stats()
                 break
             
             elif user_message.lower() == '/help':
@@ -637,12 +1123,16 @@ async def main():
                 print_session_stats()
                 continue
             
+            elif user_message.lower() == '/metrics':
+                print_rpc_metrics()
+                continue
+            
             elif user_message.lower() == '/server':
-                get_server_stats()
+                await get_server_stats()
                 continue
             
             elif user_message.lower() == '/health':
-                check_server_health()
+                await check_server_health()
                 continue
             
             elif user_message.lower() == '/clear':
@@ -651,37 +1141,45 @@ async def main():
                 continue
             
             elif user_message.lower() == '/connect':
-                connect_grpc()
+                await connect_grpc()
                 continue
             
             elif user_message.lower() == '/disconnect':
-                disconnect_grpc()
+                await disconnect_grpc()
                 continue
             
             elif user_message.lower() == '/ping':
                 await send_ping()
                 continue
             
+            elif user_message.lower().startswith('/batch'):
+                await send_batch(user_message[len('/batch'):])
+                continue
+            
+            elif user_message.lower().startswith('/ask'):
+                await send_ask(user_message[len('/ask'):])
+                continue
+            
             elif user_message.lower() == '/new':
-                create_new_session()
+                await create_new_session()
                 continue
             
             elif user_message.lower() == '/info':
-                get_session_info()
+                await get_session_info()
                 continue
             
             elif user_message.lower() == '/sessions':
-                list_all_sessions()
+                await list_all_sessions()
                 continue
             
             elif user_message.lower() == '/delete':
-                delete_current_session()
+                await delete_current_session()
                 continue
             
             # Send regular message via gRPC
             await send_chat_message(user_message)
     
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         pass
     except EOFError:
         pass
@@ -689,7 +1187,7 @@ async def main():
         print(f"\n{Fore.RED}❌ Unexpected error: {e}{Style.RESET_ALL}")
     finally:
         print(f"\n{Fore.YELLOW}👋 Cleaning up...{Style.RESET_ALL}")
-        disconnect_grpc()
+        await disconnect_grpc()
         print_session_stats()
 
 
@@ -0,0 +1,104 @@
+"""
+Stamp-based freshness checks for the generated gRPC stubs
+
+setup.py records a fingerprint of chat.proto and the code generator in chat_pb2.stamp
+whenever it runs protoc, and skips protoc while the fingerprint still matches. The server,
+client and benchmarks load the stubs through load_stubs(), which only hashes chat.proto,
+so a stale checkout fails at startup with a clear message instead of with a confusing
+AttributeError deep inside an RPC.
+"""
+
+from importlib import metadata
+from types import ModuleType
+from pathlib import Path
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+import importlib
+import hashlib
+import json
+import sys
+
+
+GRPC_DIR = Path(__file__).resolve().parent
+PROTO_FILE = GRPC_DIR / 'chat.proto'
+STAMP_FILE = GRPC_DIR / 'chat_pb2.stamp'
+GENERATED_FILES = (GRPC_DIR / 'chat_pb2.py', GRPC_DIR / 'chat_pb2_grpc.py')
+TOOLCHAIN = ('grpcio-tools', 'protobuf')  # distributions whose version changes the generated code
+
+
+class StaleStubsError(ImportError):
+    """
+    The generated stubs are missing or were generated from a different chat.proto
+    """
+
+
+def proto_digest() -> str:
+    return hashlib.sha256(PROTO_FILE.read_bytes()).hexdigest()
+
+
+def toolchain_versions() -> Dict[str, Optional[str]]:
+    versions = {}
+    for name in TOOLCHAIN:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def fingerprint() -> Dict:
+    """
+    Everything the generated code depends on: the proto source and the generator versions
+    """
+    return {'proto_sha256': proto_digest(), 'toolchain': toolchain_versions()}
+
+
+def read_stamp() -> Optional[Dict]:
+    try:
+        return json.loads(STAMP_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_stamp(stamp: Dict):
+    STAMP_FILE.write_text(json.dumps(stamp, indent=2, sort_keys=True) + '\n')
+
+
+def is_current(current: Optional[Dict] = None) -> bool:
+    """
+    True when the stubs exist and were generated from this chat.proto with this toolchain
+    """
+    current = fingerprint() if current is None else current
+    return read_stamp() == current and all(path.exists() for path in GENERATED_FILES)
+
+
+def check_stubs():
+    """
+    Raise StaleStubsError unless the stubs match chat.proto (the toolchain is not checked
+    here: runtime images usually ship without grpcio-tools)
+    """
+    hint = f"run: python {GRPC_DIR / 'setup.py'}"
+    missing = [path.name for path in GENERATED_FILES if not path.exists()]
+    if missing:
+        raise StaleStubsError(f"Generated gRPC code not found ({', '.join(missing)}); {hint}")
+    if not PROTO_FILE.exists():
+        return  # stubs shipped without their source: nothing to compare against
+    stamp = read_stamp()
+    if stamp is None:
+        raise StaleStubsError(f"{STAMP_FILE.name} is missing, so the gRPC stubs cannot be checked against {PROTO_FILE.name}; {hint}")
+    if stamp.get('proto_sha256') != proto_digest():
+        raise StaleStubsError(f"Generated gRPC code is stale: {PROTO_FILE.name} changed since it was generated; {hint}")
+
+
+def load_stubs() -> Tuple[ModuleType, ModuleType]:
+    """
+    Check the stubs and import them
+
+    Returns:
+        Tuple[ModuleType, ModuleType]: The chat_pb2 and chat_pb2_grpc modules.
+    """
+    check_stubs()
+    if str(GRPC_DIR) not in sys.path:
+        sys.path.insert(0, str(GRPC_DIR))
+    return importlib.import_module('chat_pb2'), importlib.import_module('chat_pb2_grpc')
@@ -0,0 +1,276 @@
+"""
+Metrics interceptors for the gRPC server and client
+
+They record per-method latency histograms, messages and payload bytes in each direction,
+status codes and RPCs in flight into shared.metrics.registry, the same registry the HTTP
+servers expose at /metrics, so no handler has to time itself. Payload bytes are serialized
+protobuf sizes, before any gRPC compression.
+"""
+
+from shared.metrics import MetricsRegistry
+from shared.metrics import registry
+from typing import AsyncIterator
+from typing import Tuple
+import inspect
+import asyncio
+import time
+import grpc
+
+
+# Pending status recorders: the event loop only keeps weak references to tasks
+recorder_tasks = set()
+
+
+RPC_TYPES = {
+    (False, False): 'unary',
+    (False, True): 'server_stream',
+    (True, False): 'client_stream',
+    (True, True): 'bidi_stream'
+}
+
+
+class RpcMetrics:
+    """
+    The metric families for one side of the connection ('server' or 'client')
+    """
+
+    def __init__(self, side: str, registry: MetricsRegistry = registry):
+        prefix = f'grpc_{side}'
+        self.started = registry.counter(f'{prefix}_started_total', 'RPCs started.', ('method', 'type'))
+        self.handled = registry.counter(f'{prefix}_handled_total', 'RPCs completed, by status code.', ('method', 'code'))
+        self.latency = registry.histogram(f'{prefix}_handling_seconds', 'RPC latency from start to status (whole stream for streaming RPCs).', ('method', 'type'))
+        self.messages_received = registry.counter(f'{prefix}_msg_received_total', 'Messages received.', ('method',))
+        self.messages_sent = registry.counter(f'{prefix}_msg_sent_total', 'Messages sent.', ('method',))
+        self.bytes_received = registry.counter(f'{prefix}_bytes_received_total', 'Serialized message bytes received.', ('method',))
+        self.bytes_sent = registry.counter(f'{prefix}_bytes_sent_total', 'Serialized message bytes sent.', ('method',))
+        self.in_flight = registry.gauge(f'{prefix}_in_flight', 'RPCs in progress.', ('method',))
+
+    def start(self, method: str, rpc_type: str) -> float:
+        self.started.inc(method, rpc_type)
+        self.in_flight.inc(method)
+        return time.perf_counter()
+
+    def finish(self, method: str, rpc_type: str, code: grpc.StatusCode, started: float):
+        self.in_flight.dec(method)
+        self.handled.inc(method, code.name)
+        self.latency.observe(method, rpc_type, value=time.perf_counter() - started)
+
+    def received(self, method: str, message):
+        self.messages_received.inc(method)
+        self.bytes_received.inc(method, amount=message.ByteSize())
+
+    def sent(self, method: str, message):
+        self.messages_sent.inc(method)
+        self.bytes_sent.inc(method, amount=message.ByteSize())
+
+
+class CountingContext:
+    """
+    Servicer context that counts the messages a coroutine stream handler writes
+    """
+
+    def __init__(self, context, metrics: RpcMetrics, method: str):
+        self._context = context
+        self._metrics = metrics
+        self._method = method
+
+    async def write(self, message):
+        await self._context.write(message)
+        self._metrics.sent(self._method, message)
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class MetricsServerInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Wraps every async method handler to time it and count its messages
+    """
+
+    def __init__(self, metrics: RpcMetrics = None):
+        self.metrics = metrics or RpcMetrics('server')
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None  # unknown method: gRPC answers UNIMPLEMENTED
+
+        method = handler_call_details.method
+        rpc_type = RPC_TYPES[(handler.request_streaming, handler.response_streaming)]
+        behavior = (handler.unary_unary or handler.unary_stream or handler.stream_unary or handler.stream_stream)
+        if not (inspect.iscoroutinefunction(behavior) or inspect.isasyncgenfunction(behavior)):
+            return handler  # only async handlers are wrapped
+        metrics = self.metrics
+
+        def status_of(context, error: BaseException = None) -> grpc.StatusCode:
+            code = context.code()
+            if code is not None and code != grpc.StatusCode.OK:
+                return code
+            if isinstance(error, asyncio.CancelledError):
+                return grpc.StatusCode.CANCELLED
+            if error is not None:
+                return grpc.StatusCode.UNKNOWN
+            return grpc.StatusCode.OK
+
+        async def counted_requests(request_iterator) -> AsyncIterator:
+            async for request in request_iterator:
+                metrics.received(method, request)
+                yield request
+
+        def request_of(request_or_iterator):
+            if handler.request_streaming:
+                return counted_requests(request_or_iterator)
+            metrics.received(method, request_or_iterator)
+            return request_or_iterator
+
+        if handler.response_streaming and not inspect.isasyncgenfunction(behavior):
+            # Coroutine stream handlers (such as grpc.health.v1 Watch) send with context.write()
+            async def wrapped(request_or_iterator, context):
+                started = metrics.start(method, rpc_type)
+                error = None
+                try:
+                    return await behavior(request_of(request_or_iterator), CountingContext(context, metrics, method))
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    metrics.finish(method, rpc_type, status_of(context, error), started)
+        elif handler.response_streaming:
+            async def wrapped(request_or_iterator, context):
+                started = metrics.start(method, rpc_type)
+                error = None
+                try:
+                    async for response in behavior(request_of(request_or_iterator), context):
+                        metrics.sent(method, response)
+                        yield response
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    metrics.finish(method, rpc_type, status_of(context, error), started)
+        else:
+            async def wrapped(request_or_iterator, context):
+                started = metrics.start(method, rpc_type)
+                error = None
+                try:
+                    response = await behavior(request_of(request_or_iterator), context)
+                    if response is not None:
+                        metrics.sent(method, response)
+                    return response
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    metrics.finish(method, rpc_type, status_of(context, error), started)
+
+        handler_factory = {
+            'unary': grpc.unary_unary_rpc_method_handler,
+            'server_stream': grpc.unary_stream_rpc_method_handler,
+            'client_stream': grpc.stream_unary_rpc_method_handler,
+            'bidi_stream': grpc.stream_stream_rpc_method_handler
+        }[rpc_type]
+        return handler_factory(wrapped, request_deserializer=handler.request_deserializer,
+                               response_serializer=handler.response_serializer)
+
+
+class MetricsClientInterceptor:
+    """
+    Client-side counterpart: times each call to its status and counts its messages
+    
+    A grpc.aio channel files each interceptor under only the first interceptor type it
+    matches, so each call type has its own subclass below; client_interceptors() returns
+    one of each sharing the same metrics.
+    """
+
+    def __init__(self, metrics: RpcMetrics):
+        self.metrics = metrics
+
+    def method_of(self, client_call_details) -> str:
+        method = client_call_details.method
+        return method.decode() if isinstance(method, bytes) else method
+
+    def track(self, call, method: str, rpc_type: str, started: float, count_unary_response: bool = False):
+        """
+        Record the status and latency once the call is done
+        """
+        async def record(call):
+            try:
+                code = await call.code()
+            except asyncio.CancelledError:
+                code = grpc.StatusCode.CANCELLED
+            if count_unary_response and code == grpc.StatusCode.OK:
+                self.metrics.received(method, await call)
+            self.metrics.finish(method, rpc_type, code, started)
+
+        def on_done(call):
+            task = asyncio.ensure_future(record(call))
+            recorder_tasks.add(task)
+            task.add_done_callback(recorder_tasks.discard)
+
+        call.add_done_callback(on_done)
+
+    async def counted_responses(self, call, method: str) -> AsyncIterator:
+        async for response in call:
+            self.metrics.received(method, response)
+            yield response
+
+    async def counted_requests(self, request_iterator, method: str) -> AsyncIterator:
+        if hasattr(request_iterator, '__aiter__'):
+            async for request in request_iterator:
+                self.metrics.sent(method, request)
+                yield request
+        else:
+            for request in request_iterator:
+                self.metrics.sent(method, request)
+                yield request
+
+
+class UnaryUnaryMetricsInterceptor(MetricsClientInterceptor, grpc.aio.UnaryUnaryClientInterceptor):
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = self.method_of(client_call_details)
+        started = self.metrics.start(method, 'unary')
+        self.metrics.sent(method, request)
+        call = await continuation(client_call_details, request)
+        self.track(call, method, 'unary', started, count_unary_response=True)
+        return call
+
+
+class UnaryStreamMetricsInterceptor(MetricsClientInterceptor, grpc.aio.UnaryStreamClientInterceptor):
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        method = self.method_of(client_call_details)
+        started = self.metrics.start(method, 'server_stream')
+        self.metrics.sent(method, request)
+        call = await continuation(client_call_details, request)
+        self.track(call, method, 'server_stream', started)
+        return self.counted_responses(call, method)
+
+
+class StreamUnaryMetricsInterceptor(MetricsClientInterceptor, grpc.aio.StreamUnaryClientInterceptor):
+
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        method = self.method_of(client_call_details)
+        started = self.metrics.start(method, 'client_stream')
+        call = await continuation(client_call_details, self.counted_requests(request_iterator, method))
+        self.track(call, method, 'client_stream', started, count_unary_response=True)
+        return call
+
+
+class StreamStreamMetricsInterceptor(MetricsClientInterceptor, grpc.aio.StreamStreamClientInterceptor):
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        method = self.method_of(client_call_details)
+        started = self.metrics.start(method, 'bidi_stream')
+        call = await continuation(client_call_details, self.counted_requests(request_iterator, method))
+        self.track(call, method, 'bidi_stream', started)
+        return self.counted_responses(call, method)
+
+
+def client_interceptors() -> Tuple[MetricsClientInterceptor, ...]:
+    """
+    Interceptors to pass to grpc.aio.insecure_channel(..., interceptors=...)
+    """
+    metrics = RpcMetrics('client')
+    return (UnaryUnaryMetricsInterceptor(metrics), UnaryStreamMetricsInterceptor(metrics),
+            StreamUnaryMetricsInterceptor(metrics), StreamStreamMetricsInterceptor(metrics))
@@ -0,0 +1,137 @@
+"""
+Live view of the gRPC server's open chat streams
+
+The servicer registers every Chat / ChatV2 stream here and updates it as messages go in and
+out, so the admin page on the metrics port can list the streams per session with their age,
+message counts, last activity and what each one is doing. A stream that sits in 'streaming'
+while its idle time keeps growing is blocked on HTTP/2 flow control: its client stopped reading.
+"""
+
+from datetime import datetime
+from typing import Optional
+from typing import List
+from typing import Dict
+import itertools
+import threading
+import asyncio
+import time
+import json
+
+
+# What a stream is doing; a stream is 'idle' while it waits for the client's next request
+STREAM_STATES = ('idle', 'waiting', 'generating', 'streaming')
+
+
+class LiveStream:
+    """
+    One open chat stream
+    """
+
+    def __init__(self, stream_id: int, rpc: str, peer: str):
+        self.stream_id = stream_id
+        self.rpc = rpc
+        self.peer = peer
+        self.session_id: Optional[str] = None
+        self.state = 'idle'
+        self.opened_at = time.time()
+        self.last_activity = self.opened_at
+        self.messages_received = 0
+        self.messages_sent = 0
+
+    def received(self):
+        self.messages_received += 1
+        self.last_activity = time.time()
+
+    def sent(self):
+        self.messages_sent += 1
+        self.last_activity = time.time()
+
+    def summary(self, now: float) -> Dict:
+        return {
+            'stream_id': self.stream_id,
+            'rpc': self.rpc,
+            'peer': self.peer,
+            'session_id': self.session_id,
+            'state': self.state,
+            'opened_at': datetime.fromtimestamp(self.opened_at).isoformat(),
+            'age_seconds': round(now - self.opened_at, 3),
+            'idle_seconds': round(now - self.last_activity, 3),
+            'messages_received': self.messages_received,
+            'messages_sent': self.messages_sent
+        }
+
+
+class StreamRegistry:
+    """
+    The open streams, keyed by a process-unique stream number
+
+    Streams are opened and updated from the event loop thread, like the rest of the servicer
+    state; the pages read it from the same loop, so nothing here needs a lock.
+    """
+
+    def __init__(self):
+        self.streams: Dict[int, LiveStream] = {}
+        self.ids = itertools.count(1)
+
+    def open(self, rpc: str, peer: str) -> LiveStream:
+        stream = LiveStream(next(self.ids), rpc, peer)
+        self.streams[stream.stream_id] = stream
+        return stream
+
+    def close(self, stream: LiveStream):
+        self.streams.pop(stream.stream_id, None)
+
+    def __len__(self) -> int:
+        return len(self.streams)
+
+    def by_session(self) -> Dict[str, List[LiveStream]]:
+        """
+        Open streams grouped by session ('-' for streams that have not named one yet),
+        oldest stream first
+        """
+        groups: Dict[str, List[LiveStream]] = {}
+        for stream in sorted(self.streams.values(), key=lambda stream: stream.opened_at):
+            groups.setdefault(stream.session_id or '-', []).append(stream)
+        return groups
+
+    def snapshot(self, runtime: Dict) -> Dict:
+        """
+        Everything the admin pages show: runtime counters plus the streams per session
+        """
+        now = time.time()
+        states = {state: 0 for state in STREAM_STATES}
+        for stream in self.streams.values():
+            states[stream.state] += 1
+        return {
+            'runtime': dict(runtime, open_streams=len(self.streams), streams_by_state=states,
+                            asyncio_tasks=len(asyncio.all_tasks()), threads=threading.active_count()),
+            'sessions': {session_id: [stream.summary(now) for stream in streams]
+                         for session_id, streams in self.by_session().items()}
+        }
+
+    def render_json(self, runtime: Dict) -> str:
+        return json.dumps(self.snapshot(runtime), indent=2) + '\n'
+
+    def render_text(self, runtime: Dict) -> str:
+        """
+        The snapshot as a plain-text table, one block per session
+        """
+        snapshot = self.snapshot(runtime)
+        lines = ['Runtime']
+        for name, value in snapshot['runtime'].items():
+            if isinstance(value, dict):
+                value = ', '.join(f'{key}={count}' for key, count in value.items())
+            lines.append(f'  {name}: {value}')
+
+        header = f"  {'stream':>7}  {'rpc':<7}  {'state':<10}  {'age_s':>9}  {'idle_s':>9}  {'recv':>6}  {'sent':>6}  peer"
+        for session_id, streams in snapshot['sessions'].items():
+            lines.append('')
+            lines.append(f'Session {session_id} ({len(streams)} stream{"s" if len(streams) != 1 else ""})')
+            lines.append(header)
+            for stream in streams:
+                lines.append(f"  {stream['stream_id']:>7}  {stream['rpc']:<7}  {stream['state']:<10}  "
+                             f"{stream['age_seconds']:>9.1f}  {stream['idle_seconds']:>9.1f}  "
+                             f"{stream['messages_received']:>6}  {stream['messages_sent']:>6}  {stream['peer']}")
+        if not snapshot['sessions']:
+            lines.extend(['', 'No open chat streams'])
+        return '\n'.join(lines) + '\n'
@@ -1,7 +1,14 @@
 from shared.setup import initialize_genai_client
+from shared.session_index import SESSIONS_MAX_PAGE_SIZE
+from shared.session_index import SessionIndex
+from shared.llm import generate_single_response_async
+from shared.metrics import PROMETHEUS_CONTENT_TYPE
+from shared.metrics import start_exporter
+from shared.metrics import registry
 from shared.llm import ChatSession
 from typing import AsyncGenerator 
-from concurrent import futures
+from typing import Awaitable
+from typing import Callable
 from datetime import timedelta 
 from datetime import datetime
 from colorama import Style
@@ -11,10 +18,12 @@ from colorama import init
 from typing import Optional
 from typing import List 
 from typing import Dict
-import chat_pb2_grpc  # import generated gRPC code
-import threading
-import chat_pb2  # import generated gRPC code
+from interceptors import MetricsServerInterceptor
+from introspection import StreamRegistry
+from introspection import LiveStream
+from codegen import load_stubs
 import asyncio
+import signal
 import time
 import uuid
 import grpc
@@ -22,15 +31,138 @@ import json
 import sys
 import os
 
+try:
+    from grpc_health.v1 import health_pb2_grpc
+    from grpc_health.v1 import health_pb2
+    from grpc_health.v1 import health
+except ImportError:  # Standard health checking is optional (pip install grpcio-health-checking)
+    health = None
+
+try:
+    from grpc_channelz.v1 import channelz
+except ImportError:  # Channelz is optional (pip install grpcio-channelz)
+    channelz = None
+
+# Generated gRPC code, checked against chat.proto (fails fast when setup.py needs re-running)
+chat_pb2, chat_pb2_grpc = load_stubs()
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+# Configuration
+BATCH_WORKERS = int(os.environ.get('GRPC_BATCH_WORKERS', '4'))     # upstream calls running at once for ChatBatch
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', '100'))     # turns accepted per ChatBatch call
+MAX_CONCURRENT_RPCS = int(os.environ.get('GRPC_MAX_CONCURRENT_RPCS', '10000'))  # open RPCs (idle Chat streams included) before RESOURCE_EXHAUSTED
+MAX_ACTIVE_TURNS = int(os.environ.get('GRPC_MAX_ACTIVE_TURNS', '256'))  # turns generating at once; the rest wait their turn
+SHUTDOWN_GRACE = float(os.environ.get('GRPC_SHUTDOWN_GRACE', '10'))  # seconds in-flight RPCs get to finish on shutdown
+CHUNK_TOKENS = int(os.environ.get('GRPC_CHUNK_TOKENS', '8'))        # words per CHUNK message (1 sends every word on its own)
+CHUNK_INTERVAL_MS = float(os.environ.get('GRPC_CHUNK_INTERVAL_MS', '200'))  # longest a word waits for its CHUNK to fill up
+COMPRESSION = os.environ.get('GRPC_COMPRESSION', 'gzip').lower()    # per-message compression for responses: gzip, deflate or none
+KEEPALIVE_TIME_MS = int(os.environ.get('GRPC_KEEPALIVE_TIME_MS', '30000'))  # ping idle connections this often
+KEEPALIVE_TIMEOUT_MS = int(os.environ.get('GRPC_KEEPALIVE_TIMEOUT_MS', '10000'))  # drop a connection whose ping goes unanswered this long
+WINDOW_BYTES = int(os.environ.get('GRPC_HTTP2_WINDOW_BYTES', str(1024 * 1024)))  # initial HTTP/2 stream window (BDP probing grows it further)
+MAX_MESSAGE_BYTES = int(os.environ.get('GRPC_MAX_MESSAGE_BYTES', str(16 * 1024 * 1024)))  # largest message sent or received
+SATURATION_QUEUE = int(os.environ.get('GRPC_SATURATION_QUEUE', '64'))  # turns waiting for a slot before health reports NOT_SERVING
+DRAIN_DELAY = float(os.environ.get('GRPC_DRAIN_DELAY', '0'))          # seconds to report NOT_SERVING before refusing new RPCs on shutdown
+METRICS_PORT = int(os.environ.get('GRPC_METRICS_PORT', '50052'))    # plain-HTTP /metrics and /streams for the gRPC server; 0 disables it
+CHANNELZ = os.environ.get('GRPC_CHANNELZ', 'false').lower() in ('1', 'true', 'yes')  # serve grpc.channelz.v1 for grpcdebug and friends
+DEFAULT_MODEL = 'gemini-2.0-flash'
+PORT = int(os.environ.get('GRPC_PORT', '50051'))                     # port to listen on (give each replica on a host its own)
+SESSION_ID_MAX_LENGTH = 128  # longest client-chosen session ID
+SESSION_BATCH_MAX = int(os.environ.get('GRPC_SESSION_BATCH_MAX', '10000'))  # sessions per BatchCreateSessions / BatchDeleteSessions call
+SESSION_BATCH_YIELD = 500  # bulk session calls let other RPCs run after this many sessions
+ASK_MAX_HISTORY = int(os.environ.get('GRPC_ASK_MAX_HISTORY', '100'))  # inline history messages accepted per Ask call
+
+SERVICE_NAME = chat_pb2.DESCRIPTOR.services_by_name['ChatService'].full_name
+
+COMPRESSION_ALGORITHMS = {
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+    'none': grpc.Compression.NoCompression
+}
+
+SERVER_OPTIONS = [
+    ('grpc.keepalive_time_ms', KEEPALIVE_TIME_MS),
+    ('grpc.keepalive_timeout_ms', KEEPALIVE_TIMEOUT_MS),
+    ('grpc.keepalive_permit_without_calls', 1),
+    # Accept client keepalive pings on idle connections, but no more often than every 10s
+    ('grpc.http2.min_ping_interval_without_data_ms', 10000),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.http2.lookahead_bytes', WINDOW_BYTES),
+    ('grpc.http2.bdp_probe', 1),
+    ('grpc.max_send_message_length', MAX_MESSAGE_BYTES),
+    ('grpc.max_receive_message_length', MAX_MESSAGE_BYTES)
+]
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+class ChatResponseEvents:
+    """
+    Chat (v1) wire format: one flat ChatResponse per event, each tagged with the session ID
+    """
+    
+    def started(self, session_id: str):
+        return None  # v1 has no stream-level event; every response names the session
+    
+    def status(self, session_id: str, message: str, context_messages: int):
+        return chat_pb2.ChatResponse(type=chat_pb2.ChatResponse.STATUS, session_id=session_id,
+                                     status_message=message, context_messages=context_messages)
+    
+    def response_start(self, session_id: str):
+        return chat_pb2.ChatResponse(type=chat_pb2.ChatResponse.RESPONSE_START, session_id=session_id)
+    
+    def chunk(self, session_id: str, text: str, number: int):
+        return chat_pb2.ChatResponse(type=chat_pb2.ChatResponse.CHUNK, session_id=session_id,
+                                     chunk_text=text, chunk_number=number)
+    
+    def complete(self, session_id: str, total_chunks: int, processing_time: float, message_count: int):
+        return chat_pb2.ChatResponse(type=chat_pb2.ChatResponse.RESPONSE_COMPLETE, session_id=session_id,
+                                     total_chunks=total_chunks, processing_time=processing_time,
+                                     message_count=message_count)
+    
+    def error(self, session_id: Optional[str], message: str):
+        return chat_pb2.ChatResponse(type=chat_pb2.ChatResponse.ERROR, session_id=session_id or "",
+                                     error_message=message)
+    
+    def pong(self, session_id: Optional[str]):
+        return chat_pb2.ChatResponse(type=chat_pb2.ChatResponse.PONG, session_id=session_id or "")
+
+class ChatEventEvents:
+    """
+    ChatV2 wire format: one small typed ChatEvent per event; the session ID only in `started`
+    """
+    
+    def started(self, session_id: str):
+        return chat_pb2.ChatEvent(started=chat_pb2.StreamStarted(session_id=session_id, server_time_ms=now_ms()))
+    
+    def status(self, session_id: str, message: str, context_messages: int):
+        return chat_pb2.ChatEvent(status=chat_pb2.TurnStatus(message=message, context_messages=context_messages))
+    
+    def response_start(self, session_id: str):
+        return chat_pb2.ChatEvent(response_start=chat_pb2.ResponseStarted(started_at_ms=now_ms()))
+    
+    def chunk(self, session_id: str, text: str, number: int):
+        return chat_pb2.ChatEvent(chunk=chat_pb2.TextChunk(text=text, number=number))
+    
+    def complete(self, session_id: str, total_chunks: int, processing_time: float, message_count: int):
+        return chat_pb2.ChatEvent(complete=chat_pb2.TurnCompleted(
+            total_chunks=total_chunks, processing_time_ms=int(processing_time * 1000),
+            message_count=message_count, completed_at_ms=now_ms()))
+    
+    def error(self, session_id: Optional[str], message: str):
+        return chat_pb2.ChatEvent(error=chat_pb2.ChatError(message=message))
+    
+    def pong(self, session_id: Optional[str]):
+        return chat_pb2.ChatEvent(pong=chat_pb2.Pong(server_time_ms=now_ms()))
+
 class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
     def __init__(self):
         self.sessions: Dict[str, ChatSession] = {}
         self.session_metadata: Dict[str, dict] = {}
+        self.session_index = SessionIndex()  # ordered by created_at / last_activity for ListSessions
         self.server_start_time = datetime.now()
+        # All servicer state lives on the event loop thread, so the maps and counters need no locks
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
@@ -38,29 +170,89 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
             'total_sessions_created': 0,
             'active_sessions': 0
         }
-        self.lock = threading.RLock()
+        self.session_locks: Dict[str, asyncio.Lock] = {}  # one per session: turns in a session run one at a time
+        self.turn_slots = asyncio.Semaphore(MAX_ACTIVE_TURNS)  # caps concurrent upstream calls across all RPCs
+        self.batch_slots = asyncio.Semaphore(BATCH_WORKERS)
+        self.active_streams = 0
+        self.live_streams = StreamRegistry()  # open Chat / ChatV2 streams, for the /streams page
+        self.active_turns = 0
+        self.waiting_turns = 0
         
-        # Setup GenAI client
-        try:
-            self.genai_client = initialize_genai_client()
-            print(f"{Fore.GREEN}✅ GenAI client initialized successfully for gRPC server{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.RED}❌ Failed to initialize GenAI client: {e}{Style.RESET_ALL}")
-            raise
+        # Readiness, published through the standard grpc.health.v1 service
+        self.health = health.aio.HealthServicer() if health else None
+        self.genai_client = None  # set by initialize_upstream()
+        self.saturated = False
+        self.draining = False
+        self.serving = None  # last status published
+
+    async def initialize_upstream(self):
+        """
+        Initialize the GenAI client, retrying with backoff; health reports NOT_SERVING until it works
+        """
+        delay = 1
+        while self.genai_client is None:
+            try:
+                self.genai_client = await asyncio.to_thread(initialize_genai_client)
+                print(f"{Fore.GREEN}✅ GenAI client initialized successfully for gRPC server{Style.RESET_ALL}")
+            except Exception as e:
+                print(f"{Fore.RED}❌ Failed to initialize GenAI client: {e} (retrying in {delay}s){Style.RESET_ALL}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+        await self.update_readiness()
+
+    async def update_readiness(self):
+        """
+        Publish SERVING or NOT_SERVING to the health service when readiness changes
+        
+        The instance is ready once the GenAI client is up, unless it is draining or too
+        many turns are queued for a generation slot. Saturation clears only once the
+        queue is down to half the threshold, so the status does not flap at the edge.
+        """
+        if self.waiting_turns >= SATURATION_QUEUE:
+            self.saturated = True
+        elif self.waiting_turns <= SATURATION_QUEUE // 2:
+            self.saturated = False
+        
+        serving = self.genai_client is not None and not self.saturated and not self.draining
+        if serving == self.serving:
+            return
+        self.serving = serving
+        
+        if serving:
+            print(f"{Fore.GREEN}💚 Health: SERVING{Style.RESET_ALL}")
+        else:
+            reason = 'draining' if self.draining else 'saturated' if self.saturated else 'upstream not initialized'
+            print(f"{Fore.YELLOW}💛 Health: NOT_SERVING ({reason}){Style.RESET_ALL}")
+        
+        if self.health is not None:
+            status = health_pb2.HealthCheckResponse.SERVING if serving else health_pb2.HealthCheckResponse.NOT_SERVING
+            for service in ('', SERVICE_NAME):
+                await self.health.set(service, status)
+
+    async def drain(self):
+        """
+        Report NOT_SERVING for good, so load balancers stop sending new work
+        """
+        self.draining = True
+        await self.update_readiness()
+        if self.health is not None:
+            await self.health.enter_graceful_shutdown()
 
     def print_banner(self):
         print(f"\n{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}")
         print(f"               🚀 GRPC MULTI-TURN CHAT SERVER 🚀               ")
         print(f"{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}")
         print(f"  Model: {Fore.CYAN}gemini-2.0-flash{' ' * 37}{Style.RESET_ALL}  ")
-        print(f"  Framework: {Fore.MAGENTA}gRPC + Async Streaming{' ' * 28}{Style.RESET_ALL}  ")
+        print(f"  Framework: {Fore.MAGENTA}gRPC AsyncIO + Async Streaming{' ' * 20}{Style.RESET_ALL}  ")
         print(f"  Multi-turn: {Fore.GREEN}ENABLED{' ' * 37}{Style.RESET_ALL}  ")
         print(f"  Streaming: {Fore.GREEN}BIDIRECTIONAL{' ' * 33}{Style.RESET_ALL}  ")
+        print(f"  Limits: {Fore.CYAN}{MAX_CONCURRENT_RPCS} RPCs, {MAX_ACTIVE_TURNS} active turns{Style.RESET_ALL}")
+        print(f"  Chunks: {Fore.CYAN}{CHUNK_TOKENS} words / {CHUNK_INTERVAL_MS:g}ms, {COMPRESSION} compression{Style.RESET_ALL}")
         print(f"  Status: {Fore.GREEN}READY{' ' * 41}{Style.RESET_ALL}  ")
         print(f"{Fore.GREEN}══════════════════════════════════════════════════════════════{Style.RESET_ALL}")
         print()
         print(f"{Fore.YELLOW}🚀 gRPC Multi-turn Chat Server starting up...{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}🌐 Server endpoint: localhost:50051{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}🌐 Server endpoint: localhost:{PORT}{Style.RESET_ALL}")
         print(f"{Fore.CYAN}📡 Protocol: gRPC with bidirectional streaming{Style.RESET_ALL}")
         print(f"{Fore.CYAN}🔧 Use Ctrl+C to stop the server{Style.RESET_ALL}")
         print()
@@ -100,236 +292,501 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
         
         print(f"{Fore.YELLOW}🚀 [{timestamp}] Chunk #{chunk_num} → {session_id[:8]}...: \"{preview}\"{Style.RESET_ALL}")
 
-    def CreateSession(self, request, context):
+    def touch_session(self, session_id: str):
         """
-        Create a new chat session
+        Record activity on a session
+        """
+        metadata = self.session_metadata[session_id]
+        metadata['last_activity'] = datetime.now()
+        self.session_index.touch(session_id, metadata['last_activity'])
+
+    async def upstream(self, generate: Callable[[], Awaitable]):
+        """
+        Run one upstream model call in a turn slot, so at most MAX_ACTIVE_TURNS run at once
         """
-        with self.lock:
-            self.stats['total_requests'] += 1
+        # Turns queued for a slot count towards saturation, which health reports
+        self.waiting_turns += 1
+        try:
+            if self.turn_slots.locked():
+                await self.update_readiness()
+            await self.turn_slots.acquire()
+        finally:
+            self.waiting_turns -= 1
+        
+        self.active_turns += 1
+        try:
+            return await generate()
+        finally:
+            self.active_turns -= 1
+            self.turn_slots.release()
+            if self.saturated:
+                await self.update_readiness()
+
+    async def chunk_words(self, text: str) -> AsyncGenerator[str, None]:
+        """
+        Split a response into CHUNK texts: the first word goes out at once, then a chunk goes
+        out when it holds CHUNK_TOKENS words or its first word has waited CHUNK_INTERVAL_MS
+        """
+        words = text.split()
+        pending = []
+        pending_since = None
+        sent = 0
+        for i, word in enumerate(words):
+            if not pending:
+                pending_since = time.monotonic()
             
-            session_id = str(uuid.uuid4())
-            model_id = request.model_id or "gemini-2.0-flash"
+            # Add space after word (except for last word)
+            pending.append(word + (" " if i < len(words) - 1 else ""))
             
-            self.print_request("CreateSession", message=f"Model: {model_id}")
+            is_last = i == len(words) - 1
+            if (is_last or sent == 0 or len(pending) >= CHUNK_TOKENS
+                    or (time.monotonic() - pending_since) * 1000 >= CHUNK_INTERVAL_MS):
+                sent += 1
+                yield "".join(pending)
+                pending.clear()
             
-            try:
-                # Create new chat session
-                chat_session = ChatSession(
-                    client=self.genai_client,
-                    model_id=model_id
-                )
-                
-                self.sessions[session_id] = chat_session
-                self.session_metadata[session_id] = {
-                    'session_id': session_id,
-                    'model': model_id,
-                    'created_at': datetime.now(),
-                    'message_count': 0,
-                    'user_messages': 0,
-                    'model_messages': 0
-                }
-                
-                self.stats['total_sessions_created'] += 1
-                self.stats['active_sessions'] += 1
-                self.stats['successful_requests'] += 1
-                
-                print(f"{Fore.GREEN}✨ Created new session {session_id[:8]}... with model {model_id}{Style.RESET_ALL}")
-                
-                return chat_pb2.CreateSessionResponse(
-                    session_id=session_id,
-                    model=model_id,
-                    success=True,
-                    message="Session created successfully"
-                )
-                
-            except Exception as e:
-                self.stats['failed_requests'] += 1
-                print(f"{Fore.RED}❌ Error creating session: {e}{Style.RESET_ALL}")
-                return chat_pb2.CreateSessionResponse(
-                    session_id="",
-                    model="",
-                    success=False,
-                    message=f"Failed to create session: {str(e)}"
-                )
+            if not is_last:
+                # Add a small delay to simulate real-time streaming
+                await asyncio.sleep(0.05)  # 50ms delay between words
 
-    def GetSessionInfo(self, request, context):
+    async def generate_reply(self, session_id: str, chat_session: ChatSession, user_message: str, stream: Optional[LiveStream] = None) -> str:
         """
-        Get information about a session
+        Run one turn against the model without blocking the event loop
+        
+        Turns on the same session wait for each other, so each one sees the complete
+        exchange before it; turns on different sessions never wait on each other.
         """
-        with self.lock:
-            self.stats['total_requests'] += 1
+        # A session deleted mid-stream has no lock left; its remaining turns need no ordering
+        session_lock = self.session_locks.get(session_id) or asyncio.Lock()
+        
+        async def generate():
+            if stream is not None:
+                stream.state = 'generating'  # got its turn slot
+            return await chat_session.client.aio.models.generate_content(
+                model=chat_session.model_id,
+                contents=chat_session.chat_history
+            )
+        
+        async with session_lock:
+            history_length = chat_session.get_message_count()
+            chat_session.add_message("user", user_message)
+            try:
+                response = await self.upstream(generate)
+                response_text = response.text.strip()
+            except BaseException:
+                # A failed or cancelled turn leaves no half-finished exchange in the history
+                del chat_session.chat_history[history_length:]
+                chat_session.mark_changed()
+                raise
             
-            session_id = request.session_id
-            self.print_request("GetSessionInfo", session_id)
+            chat_session.add_message("model", response_text)
+            return response_text
+
+    def add_session(self, session_id: str, model_id: str):
+        """
+        Register a new, empty chat session in every map and index
+        """
+        # Create new chat session
+        chat_session = ChatSession(
+            client=self.genai_client,
+            model_id=model_id
+        )
+        
+        self.sessions[session_id] = chat_session
+        created_at = datetime.now()
+        self.session_metadata[session_id] = {
+            'session_id': session_id,
+            'model': model_id,
+            'created_at': created_at,
+            'last_activity': created_at,
+            'message_count': 0,
+            'user_messages': 0,
+            'model_messages': 0
+        }
+        self.session_locks[session_id] = asyncio.Lock()
+        self.session_index.add(session_id, model_id, created_at)
+        
+        self.stats['total_sessions_created'] += 1
+        self.stats['active_sessions'] += 1
+
+    def remove_session(self, session_id: str):
+        """
+        Drop a live session from every map and index
+        """
+        del self.sessions[session_id]
+        del self.session_metadata[session_id]
+        del self.session_locks[session_id]
+        self.session_index.remove(session_id)
+        self.stats['active_sessions'] -= 1
+
+    def session_summary(self, session_id: str):
+        metadata = self.session_metadata[session_id]
+        duration = datetime.now() - metadata['created_at']
+        return chat_pb2.SessionSummary(
+            session_id=session_id,
+            model=metadata['model'],
+            message_count=metadata['message_count'],
+            duration_minutes=int(duration.total_seconds() / 60),
+            created_at=metadata['created_at'].isoformat(),
+            last_activity=metadata['last_activity'].isoformat()
+        )
+
+    async def CreateSession(self, request, context):
+        """
+        Create a new chat session
+        """
+        self.stats['total_requests'] += 1
+        
+        # Load-balanced clients choose the ID so the session lands on the replica their hash ring picks
+        if len(request.session_id) > SESSION_ID_MAX_LENGTH:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"session_id is longer than {SESSION_ID_MAX_LENGTH} characters")
+        if request.session_id in self.sessions:
+            await context.abort(grpc.StatusCode.ALREADY_EXISTS, f"Session {request.session_id} already exists")
+        
+        session_id = request.session_id or str(uuid.uuid4())
+        model_id = request.model_id or DEFAULT_MODEL
+        
+        self.print_request("CreateSession", message=f"Model: {model_id}")
+        
+        try:
+            if self.genai_client is None:
+                raise RuntimeError("GenAI client is not initialized yet")
             
-            if session_id not in self.session_metadata:
-                self.stats['failed_requests'] += 1
-                return chat_pb2.SessionInfoResponse(
-                    success=False,
-                    message="Session not found"
-                )
+            self.add_session(session_id, model_id)
+            self.stats['successful_requests'] += 1
             
-            metadata = self.session_metadata[session_id]
-            duration = datetime.now() - metadata['created_at']
+            print(f"{Fore.GREEN}✨ Created new session {session_id[:8]}... with model {model_id}{Style.RESET_ALL}")
             
-            self.stats['successful_requests'] += 1
+            return chat_pb2.CreateSessionResponse(
+                session_id=session_id,
+                model=model_id,
+                success=True,
+                message="Session created successfully"
+            )
             
+        except Exception as e:
+            self.stats['failed_requests'] += 1
+            print(f"{Fore.RED}❌ Error creating session: {e}{Style.RESET_ALL}")
+            return chat_pb2.CreateSessionResponse(
+                session_id="",
+                model="",
+                success=False,
+                message=f"Failed to create session: {str(e)}"
+            )
+
+    async def GetSessionInfo(self, request, context):
+        """
+        Get information about a session
+        """
+        self.stats['total_requests'] += 1
+        
+        session_id = request.session_id
+        self.print_request("GetSessionInfo", session_id)
+        
+        if session_id not in self.session_metadata:
+            self.stats['failed_requests'] += 1
             return chat_pb2.SessionInfoResponse(
-                success=True,
-                session_id=session_id,
-                model=metadata['model'],
-                message_count=metadata['message_count'],
-                user_messages=metadata['user_messages'],
-                model_messages=metadata['model_messages'],
-                duration_seconds=int(duration.total_seconds()),
-                created_at=metadata['created_at'].isoformat()
+                success=False,
+                message="Session not found"
             )
+        
+        metadata = self.session_metadata[session_id]
+        duration = datetime.now() - metadata['created_at']
+        
+        self.stats['successful_requests'] += 1
+        
+        return chat_pb2.SessionInfoResponse(
+            success=True,
+            session_id=session_id,
+            model=metadata['model'],
+            message_count=metadata['message_count'],
+            user_messages=metadata['user_messages'],
+            model_messages=metadata['model_messages'],
+            duration_seconds=int(duration.total_seconds()),
+            created_at=metadata['created_at'].isoformat()
+        )
 
-    def ListSessions(self, request, context):
+    async def ListSessions(self, request, context):
         """
-        List all active sessions
+        List active sessions one page at a time, optionally filtered by model
         """
-        with self.lock:
-            self.stats['total_requests'] += 1
-            self.print_request("ListSessions")
-            
-            sessions = []
-            for session_id, metadata in self.session_metadata.items():
-                duration = datetime.now() - metadata['created_at']
-                sessions.append(chat_pb2.SessionSummary(
-                    session_id=session_id,
-                    model=metadata['model'],
-                    message_count=metadata['message_count'],
-                    duration_minutes=int(duration.total_seconds() / 60),
-                    created_at=metadata['created_at'].isoformat()
-                ))
-            
-            self.stats['successful_requests'] += 1
-            
-            return chat_pb2.ListSessionsResponse(
-                sessions=sessions,
-                active_sessions=len(sessions)
+        self.stats['total_requests'] += 1
+        self.print_request("ListSessions")
+        
+        try:
+            session_ids, next_cursor, total = self.session_index.page(
+                request.sort or 'created_at', request.order or 'asc', request.model or None,
+                request.limit or None, request.cursor or None
             )
+        except ValueError as e:
+            self.stats['failed_requests'] += 1
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        
+        sessions = [self.session_summary(session_id) for session_id in session_ids]
+        
+        self.stats['successful_requests'] += 1
+        
+        return chat_pb2.ListSessionsResponse(
+            sessions=sessions,
+            active_sessions=total,
+            next_cursor=next_cursor or ''
+        )
 
-    def DeleteSession(self, request, context):
+    async def DeleteSession(self, request, context):
         """
         Delete a session
         """
-        with self.lock:
-            self.stats['total_requests'] += 1
-            
-            session_id = request.session_id
-            self.print_request("DeleteSession", session_id)
-            
-            if session_id not in self.sessions:
-                self.stats['failed_requests'] += 1
-                return chat_pb2.DeleteSessionResponse(
-                    success=False,
-                    message="Session not found"
-                )
-            
-            del self.sessions[session_id]
-            del self.session_metadata[session_id]
-            self.stats['active_sessions'] -= 1
-            self.stats['successful_requests'] += 1
-            
-            print(f"{Fore.GREEN}🗑️ Deleted session {session_id[:8]}...{Style.RESET_ALL}")
-            
+        self.stats['total_requests'] += 1
+        
+        session_id = request.session_id
+        self.print_request("DeleteSession", session_id)
+        
+        if session_id not in self.sessions:
+            self.stats['failed_requests'] += 1
             return chat_pb2.DeleteSessionResponse(
-                success=True,
-                message="Session deleted successfully"
+                success=False,
+                message="Session not found"
             )
+        
+        self.remove_session(session_id)
+        self.stats['successful_requests'] += 1
+        
+        print(f"{Fore.GREEN}🗑️ Deleted session {session_id[:8]}...{Style.RESET_ALL}")
+        
+        return chat_pb2.DeleteSessionResponse(
+            success=True,
+            message="Session deleted successfully"
+        )
 
-    def GetServerStats(self, request, context):
+    async def BatchCreateSessions(self, request, context):
         """
-        Get server statistics
+        Create many sessions in one call
         """
-        with self.lock:
-            self.stats['total_requests'] += 1
-            self.print_request("GetServerStats")
+        self.stats['total_requests'] += 1
+        model_id = request.model_id or DEFAULT_MODEL
+        self.print_request("BatchCreateSessions", message=f"{request.count} x {model_id}")
+        
+        if request.count < 1 or request.count > SESSION_BATCH_MAX:
+            self.stats['failed_requests'] += 1
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"count must be between 1 and {SESSION_BATCH_MAX}")
+        if self.genai_client is None:
+            self.stats['failed_requests'] += 1
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "GenAI client is not initialized yet")
+        
+        session_ids = []
+        for i in range(request.count):
+            session_id = str(uuid.uuid4())
+            self.add_session(session_id, model_id)
+            session_ids.append(session_id)
+            if (i + 1) % SESSION_BATCH_YIELD == 0:
+                await asyncio.sleep(0)  # let other RPCs run during large batches
+        
+        self.stats['successful_requests'] += 1
+        print(f"{Fore.GREEN}✨ Created {len(session_ids)} sessions with model {model_id}{Style.RESET_ALL}")
+        return chat_pb2.BatchCreateSessionsResponse(session_ids=session_ids, model=model_id)
+
+    async def BatchDeleteSessions(self, request, context):
+        """
+        Delete many sessions in one call; unknown IDs are reported, not treated as errors
+        """
+        self.stats['total_requests'] += 1
+        self.print_request("BatchDeleteSessions", message=f"{len(request.session_ids)} sessions")
+        
+        if len(request.session_ids) > SESSION_BATCH_MAX:
+            self.stats['failed_requests'] += 1
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"At most {SESSION_BATCH_MAX} session IDs per call")
+        
+        deleted = 0
+        not_found = []
+        for i, session_id in enumerate(request.session_ids):
+            if session_id in self.sessions:
+                self.remove_session(session_id)
+                deleted += 1
+            else:
+                not_found.append(session_id)
+            if (i + 1) % SESSION_BATCH_YIELD == 0:
+                await asyncio.sleep(0)
+        
+        self.stats['successful_requests'] += 1
+        print(f"{Fore.GREEN}🗑️ Deleted {deleted} sessions ({len(not_found)} not found){Style.RESET_ALL}")
+        return chat_pb2.BatchDeleteSessionsResponse(deleted=deleted, not_found=not_found)
+
+    async def StreamSessions(self, request, context):
+        """
+        Stream every session matching the filter, reading the index one page at a time
+        
+        Memory stays bounded by the page size however many sessions match, and the cursor
+        between pages keeps the walk valid while sessions are created or deleted.
+        """
+        self.stats['total_requests'] += 1
+        self.print_request("StreamSessions", message=f"model={request.model or 'any'}")
+        
+        sort, order = request.sort or 'created_at', request.order or 'asc'
+        idle_cutoff = (time.time() - request.min_idle_seconds) if request.min_idle_seconds > 0 else None
+        # Ascending by last_activity, the idle sessions come first: stop at the first active one
+        stop_at_active = idle_cutoff is not None and sort == 'last_activity' and order == 'asc'
+        
+        sent = 0
+        cursor = None
+        while True:
+            try:
+                session_ids, cursor, _ = self.session_index.page(sort, order, request.model or None, SESSIONS_MAX_PAGE_SIZE, cursor)
+            except ValueError as e:
+                self.stats['failed_requests'] += 1
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
             
-            uptime = datetime.now() - self.server_start_time
-            avg_response_time = 0  # TODO: Implement response time tracking
+            for session_id in session_ids:
+                metadata = self.session_metadata.get(session_id)
+                if metadata is None:
+                    continue  # deleted while this page was being sent
+                if idle_cutoff is not None and metadata['last_activity'].timestamp() > idle_cutoff:
+                    if stop_at_active:
+                        cursor = None
+                        break
+                    continue
+                if metadata['message_count'] < request.min_messages:
+                    continue
+                if request.max_messages and metadata['message_count'] > request.max_messages:
+                    continue
+                
+                yield self.session_summary(session_id)
+                sent += 1
+                if request.limit and sent >= request.limit:
+                    cursor = None
+                    break
             
-            self.stats['successful_requests'] += 1
+            if cursor is None:
+                break
             
-            return chat_pb2.ServerStatsResponse(
-                uptime_seconds=int(uptime.total_seconds()),
-                total_requests=self.stats['total_requests'],
-                successful_requests=self.stats['successful_requests'],
-                failed_requests=self.stats['failed_requests'],
-                active_sessions=self.stats['active_sessions'],
-                total_sessions_created=self.stats['total_sessions_created'],
-                average_response_time=avg_response_time,
-                model="gemini-2.0-flash",
-                framework="gRPC + Async Streaming"
-            )
+            # A filter that matches nothing never yields; let other RPCs run between pages
+            await asyncio.sleep(0)
+        
+        self.stats['successful_requests'] += 1
 
-    def Chat(self, request_iterator, context):
+    def runtime_stats(self) -> Dict:
+        """
+        Load counters shown above the streams on the /streams page
+        """
+        return {
+            'uptime_seconds': int((datetime.now() - self.server_start_time).total_seconds()),
+            'active_sessions': self.stats['active_sessions'],
+            'active_turns': self.active_turns,
+            'waiting_turns': self.waiting_turns,
+            'turn_slots_free': MAX_ACTIVE_TURNS - self.active_turns,
+            'serving': self.serving
+        }
+
+    async def GetServerStats(self, request, context):
+        """
+        Get server statistics
+        """
+        self.stats['total_requests'] += 1
+        self.print_request("GetServerStats")
+        
+        uptime = datetime.now() - self.server_start_time
+        avg_response_time = 0  # TODO: Implement response time tracking
+        
+        self.stats['successful_requests'] += 1
+        
+        return chat_pb2.ServerStatsResponse(
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=self.stats['total_requests'],
+            successful_requests=self.stats['successful_requests'],
+            failed_requests=self.stats['failed_requests'],
+            active_sessions=self.stats['active_sessions'],
+            total_sessions_created=self.stats['total_sessions_created'],
+            average_response_time=avg_response_time,
+            model="gemini-2.0-flash",
+            framework="gRPC AsyncIO + Async Streaming",
+            active_streams=self.active_streams,
+            active_turns=self.active_turns
+        )
+
+    async def Chat(self, request_iterator, context):
         """
         Bidirectional streaming chat
         """
+        async for response in self.tracked(request_iterator, context, 'Chat', ChatResponseEvents()):
+            yield response
+
+    async def ChatV2(self, request_iterator, context):
+        """
+        Bidirectional streaming chat with typed events and the session ID sent once
+        """
+        async for event in self.tracked(request_iterator, context, 'ChatV2', ChatEventEvents()):
+            yield event
+
+    async def tracked(self, request_iterator, context, rpc: str, events):
+        """
+        Run a chat stream registered in live_streams, counting what it sends
+        """
+        stream = self.live_streams.open(rpc, context.peer())
+        try:
+            async for message in self.converse(request_iterator, events, stream):
+                stream.sent()
+                yield message
+        finally:
+            self.live_streams.close(stream)
+
+    async def converse(self, request_iterator, events, stream: LiveStream):
+        """
+        Run a chat stream, building each outgoing message with ``events`` (the RPC's wire format)
+        """
         session_id = None
         chat_session = None
+        self.active_streams += 1
         
         try:
-            for request in request_iterator:
-                with self.lock:
-                    self.stats['total_requests'] += 1
-                
-                # Handle session setup
+            async for request in request_iterator:
+                stream.received()
+                self.stats['total_requests'] += 1
+            
+                # Handle session setup (later requests may omit the session ID)
                 if request.session_id:
-                    session_id = request.session_id
-                    if session_id not in self.sessions:
-                        yield chat_pb2.ChatResponse(
-                            type=chat_pb2.ChatResponse.ERROR,
-                            error_message="Session not found"
-                        )
+                    if request.session_id not in self.sessions:
+                        yield events.error(None, "Session not found")
                         return
                     
-                    chat_session = self.sessions[session_id]
-                    metadata = self.session_metadata[session_id]
+                    if request.session_id != session_id:
+                        session_id = stream.session_id = request.session_id
+                        chat_session = self.sessions[session_id]
+                        metadata = self.session_metadata[session_id]
+                        
+                        started = events.started(session_id)
+                        if started is not None:
+                            yield started
+                
+                # ChatV2 names the session only once, so a session deleted mid-stream shows up here
+                elif session_id is not None and session_id not in self.sessions:
+                    yield events.error(None, "Session not found")
+                    return
                 
                 # Handle different request types
                 if request.type == chat_pb2.ChatRequest.PING:
-                    yield chat_pb2.ChatResponse(
-                        type=chat_pb2.ChatResponse.PONG,
-                        session_id=session_id
-                    )
+                    yield events.pong(session_id)
                     continue
                 
                 elif request.type == chat_pb2.ChatRequest.MESSAGE:
                     if not chat_session:
-                        yield chat_pb2.ChatResponse(
-                            type=chat_pb2.ChatResponse.ERROR,
-                            error_message="No session established"
-                        )
+                        yield events.error(None, "No session established")
                         continue
                     
                     user_message = request.message
                     self.print_request("Chat", session_id, user_message)
                     
                     # Update session metadata
-                    with self.lock:
-                        metadata['message_count'] += 1
-                        metadata['user_messages'] += 1
-                    
+                    metadata['message_count'] += 1
+                    metadata['user_messages'] += 1
+                    self.touch_session(session_id)
+                
                     # Send status update
-                    yield chat_pb2.ChatResponse(
-                        type=chat_pb2.ChatResponse.STATUS,
-                        session_id=session_id,
-                        status_message="Generating response...",
-                        context_messages=metadata['message_count']
-                    )
+                    yield events.status(session_id, "Generating response...", metadata['message_count'])
                     
                     # Print response generation start
                     self.print_response_start(session_id, metadata['message_count'])
                     
                     # Send response start
-                    yield chat_pb2.ChatResponse(
-                        type=chat_pb2.ChatResponse.RESPONSE_START,
-                        session_id=session_id
-                    )
+                    yield events.response_start(session_id)
                     
                     # Generate and stream response
                     try:
@@ -337,47 +794,28 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
                         start_time = time.time()
                         
                         # Generate the complete response using the chat session
-                        full_response = chat_session.generate_response(user_message)
-                        
-                        # Split the response into words for streaming simulation
-                        words = full_response.split()
+                        stream.state = 'waiting'
+                        full_response = await self.generate_reply(session_id, chat_session, user_message, stream)
                         
-                        # Stream the response word by word
-                        for i, word in enumerate(words):
+                        # Stream the response a few words per message
+                        stream.state = 'streaming'
+                        async for chunk_text in self.chunk_words(full_response):
                             chunk_count += 1
                             
-                            # Add space after word (except for last word)
-                            chunk_text = word + (" " if i < len(words) - 1 else "")
-                            
                             # Print chunk info
                             self.print_chunk_sent(chunk_count, chunk_text, session_id)
                             
                             # Send chunk
-                            yield chat_pb2.ChatResponse(
-                                type=chat_pb2.ChatResponse.CHUNK,
-                                session_id=session_id,
-                                chunk_text=chunk_text,
-                                chunk_number=chunk_count
-                            )
-                            
-                            # Add a small delay to simulate real-time streaming
-                            time.sleep(0.05)  # 50ms delay between words
+                            yield events.chunk(session_id, chunk_text, chunk_count)
                         
                         # Update session metadata
-                        with self.lock:
-                            metadata['message_count'] += 1
-                            metadata['model_messages'] += 1
-                            self.stats['successful_requests'] += 1
-                        
+                        metadata['message_count'] += 1
+                        metadata['model_messages'] += 1
+                        self.stats['successful_requests'] += 1
+                    
                         # Send completion
                         processing_time = time.time() - start_time
-                        yield chat_pb2.ChatResponse(
-                            type=chat_pb2.ChatResponse.RESPONSE_COMPLETE,
-                            session_id=session_id,
-                            total_chunks=chunk_count,
-                            processing_time=processing_time,
-                            message_count=metadata['message_count']
-                        )
+                        yield events.complete(session_id, chunk_count, processing_time, metadata['message_count'])
                         
                         # Print completion info
                         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
@@ -391,15 +829,13 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
                         print(f"{Fore.GREEN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
                         
                     except Exception as e:
-                        with self.lock:
-                            self.stats['failed_requests'] += 1
-                        
+                        self.stats['failed_requests'] += 1
+                    
                         print(f"{Fore.RED}❌ Error generating response: {e}{Style.RESET_ALL}")
-                        yield chat_pb2.ChatResponse(
-                            type=chat_pb2.ChatResponse.ERROR,
-                            session_id=session_id,
-                            error_message=f"Error generating response: {str(e)}"
-                        )
+                        yield events.error(session_id, f"Error generating response: {str(e)}")
+                    
+                    finally:
+                        stream.state = 'idle'
             
             # Normal completion - iterator finished without errors
             if session_id:
@@ -411,62 +847,257 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
                 print(f"{Fore.YELLOW}📡 Client cancelled connection for session {session_id[:8] if session_id else 'unknown'}...{Style.RESET_ALL}")
             else:
                 print(f"{Fore.RED}❌ gRPC error in chat stream: {e.details()}{Style.RESET_ALL}")
-                yield chat_pb2.ChatResponse(
-                    type=chat_pb2.ChatResponse.ERROR,
-                    error_message=f"gRPC error: {e.details()}"
-                )
+                yield events.error(session_id, f"gRPC error: {e.details()}")
         
-        except StopIteration:
-            # This is normal - iterator finished
-            if session_id:
-                print(f"{Fore.CYAN}📡 Request iterator completed for session {session_id[:8]}...{Style.RESET_ALL}")
+        except asyncio.CancelledError:
+            # Client went away or the server is shutting down
+            print(f"{Fore.YELLOW}📡 Chat stream cancelled for session {session_id[:8] if session_id else 'unknown'}...{Style.RESET_ALL}")
+            raise
         
         except Exception as e:
             # Handle unexpected errors
             print(f"{Fore.RED}❌ Unexpected error in chat stream: {e}{Style.RESET_ALL}")
-            yield chat_pb2.ChatResponse(
-                type=chat_pb2.ChatResponse.ERROR,
-                error_message=f"Unexpected error: {str(e)}"
-            )
+            yield events.error(session_id, f"Unexpected error: {str(e)}")
+        
+        finally:
+            self.active_streams -= 1
+
+    async def run_batch_group(self, items: List[tuple], results: asyncio.Queue):
+        """
+        Run one session's batch turns in order, reporting each result as it completes
+        """
+        session_id = items[0][1].session_id
+        for index, item in items:
+            start_time = time.time()
+            try:
+                user_message = item.message.strip()
+                if not user_message:
+                    raise ValueError("Message is required")
+                
+                if not session_id:
+                    # Not through the CreateSession handler, which would count a second request
+                    if self.genai_client is None:
+                        raise RuntimeError("GenAI client is not initialized yet")
+                    session_id = str(uuid.uuid4())
+                    self.add_session(session_id, DEFAULT_MODEL)
+                
+                self.stats['total_requests'] += 1
+                chat_session = self.sessions.get(session_id)
+                metadata = self.session_metadata.get(session_id)
+                if chat_session is None:
+                    raise ValueError("Session not found")
+                metadata['message_count'] += 1
+                metadata['user_messages'] += 1
+                self.touch_session(session_id)
+            
+                async with self.batch_slots:
+                    response_text = await self.generate_reply(session_id, chat_session, user_message)
+                
+                metadata['message_count'] += 1
+                metadata['model_messages'] += 1
+                self.stats['successful_requests'] += 1
+            
+                results.put_nowait(chat_pb2.ChatBatchResult(
+                    index=index,
+                    session_id=session_id,
+                    success=True,
+                    response=response_text,
+                    message_count=metadata['message_count'],
+                    processing_time=time.time() - start_time,
+                    timestamp=datetime.now().isoformat()
+                ))
+                
+            except Exception as e:
+                self.stats['failed_requests'] += 1
+            
+                print(f"{Fore.RED}❌ Batch item #{index} failed: {e}{Style.RESET_ALL}")
+                results.put_nowait(chat_pb2.ChatBatchResult(
+                    index=index,
+                    session_id=session_id or "",
+                    success=False,
+                    error_message=str(e),
+                    processing_time=time.time() - start_time,
+                    timestamp=datetime.now().isoformat()
+                ))
+
+    async def ChatBatch(self, request, context):
+        """
+        Run many turns concurrently across sessions, streaming results as they complete
+        """
+        items = list(request.items)
+        self.print_request("ChatBatch", message=f"{len(items)} turns")
+        
+        if not items:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "At least one item is required")
+        if len(items) > BATCH_MAX_ITEMS:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Batch too large (max {BATCH_MAX_ITEMS} items)")
+        
+        # Turns for the same session run one after another; items without a session each start a new one
+        groups: Dict[str, List[tuple]] = {}
+        for index, item in enumerate(items):
+            groups.setdefault(item.session_id or f"new:{index}", []).append((index, item))
+        
+        results: asyncio.Queue = asyncio.Queue()
+        pending = [asyncio.create_task(self.run_batch_group(group, results)) for group in groups.values()]
+        
+        try:
+            for _ in range(len(items)):
+                yield await results.get()
+        finally:
+            # Drop unfinished groups if the caller goes away
+            for task in pending:
+                task.cancel()
+
+    async def answer(self, request, context, method: str) -> str:
+        """
+        Validate a stateless Ask request and generate its answer with the shared client
+        """
+        prompt = request.prompt.strip()
+        self.print_request(method, message=prompt)
+        
+        if not prompt:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Prompt is required")
+        if len(request.history) > ASK_MAX_HISTORY:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"History too long (max {ASK_MAX_HISTORY} messages)")
+        if any(message.role not in ('user', 'model') for message in request.history):
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "History roles must be 'user' or 'model'")
+        if self.genai_client is None:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, "GenAI client not initialized")
+        
+        self.stats['total_requests'] += 1
+        history = [{"role": message.role, "parts": [{"text": message.text}]} for message in request.history]
+        try:
+            response_text = await self.upstream(lambda: generate_single_response_async(
+                prompt, request.model or DEFAULT_MODEL, client=self.genai_client, history=history))
+        except Exception as e:
+            self.stats['failed_requests'] += 1
+            print(f"{Fore.RED}❌ Error generating response: {e}{Style.RESET_ALL}")
+            await context.abort(grpc.StatusCode.INTERNAL, f"Error generating response: {str(e)}")
+        
+        self.stats['successful_requests'] += 1
+        return response_text
+
+    async def Ask(self, request, context):
+        """
+        Stream the answer to a one-off prompt; no session is created
+        """
+        start_time = time.time()
+        response_text = await self.answer(request, context, "Ask")
+        
+        yield chat_pb2.ChatEvent(response_start=chat_pb2.ResponseStarted(started_at_ms=now_ms()))
+        chunk_count = 0
+        async for chunk_text in self.chunk_words(response_text):
+            chunk_count += 1
+            yield chat_pb2.ChatEvent(chunk=chat_pb2.TextChunk(text=chunk_text, number=chunk_count))
+        yield chat_pb2.ChatEvent(complete=chat_pb2.TurnCompleted(
+            total_chunks=chunk_count, processing_time_ms=int((time.time() - start_time) * 1000),
+            completed_at_ms=now_ms()))
+
+    async def AskUnary(self, request, context):
+        """
+        Answer a one-off prompt in a single response; no session is created
+        """
+        start_time = time.time()
+        response_text = await self.answer(request, context, "AskUnary")
+        return chat_pb2.AskResponse(
+            response=response_text,
+            model=request.model or DEFAULT_MODEL,
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            completed_at_ms=now_ms()
+        )
 
 def serve():
     """
-    Start the gRPC server
+    Create the gRPC server
     """
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    if COMPRESSION not in COMPRESSION_ALGORITHMS:
+        raise ValueError(f"GRPC_COMPRESSION must be one of {', '.join(COMPRESSION_ALGORITHMS)}")
+    
+    server = grpc.aio.server(
+        maximum_concurrent_rpcs=MAX_CONCURRENT_RPCS or None,
+        options=SERVER_OPTIONS,
+        compression=COMPRESSION_ALGORITHMS[COMPRESSION],
+        interceptors=[MetricsServerInterceptor()]
+    )
     servicer = ChatServiceServicer()
     chat_pb2_grpc.add_ChatServiceServicer_to_server(servicer, server)
+    if servicer.health is not None:
+        health_pb2_grpc.add_HealthServicer_to_server(servicer.health, server)
+    else:
+        print(f"{Fore.YELLOW}⚠️  grpc.health.v1 disabled (pip install grpcio-health-checking){Style.RESET_ALL}")
+    if CHANNELZ:
+        if channelz is not None:
+            channelz.add_channelz_servicer(server)
+        else:
+            print(f"{Fore.YELLOW}⚠️  GRPC_CHANNELZ is set but grpc.channelz.v1 is unavailable (pip install grpcio-channelz){Style.RESET_ALL}")
     
-    listen_addr = '[::]:50051'
+    listen_addr = f'[::]:{PORT}'
     server.add_insecure_port(listen_addr)
     
     servicer.print_banner()
     
-    return server
+    return server, servicer
+
+async def run():
+    """
+    Run the server until SIGINT/SIGTERM, then drain in-flight RPCs
+    """
+    server, servicer = serve()
+    # Health starts NOT_SERVING and flips once the GenAI client is up
+    await servicer.update_readiness()
+    await server.start()
+    upstream = asyncio.create_task(servicer.initialize_upstream())
+    exporter = None
+    if METRICS_PORT:
+        exporter = await start_exporter('0.0.0.0', METRICS_PORT, {
+            '/metrics': lambda: (PROMETHEUS_CONTENT_TYPE, registry.render()),
+            '/streams': lambda: ('text/plain; charset=utf-8', servicer.live_streams.render_text(servicer.runtime_stats())),
+            '/streams.json': lambda: ('application/json', servicer.live_streams.render_json(servicer.runtime_stats()))
+        })
+    
+    print(f"{Fore.GREEN}✅ gRPC server started successfully!{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}🌐 Listening on: localhost:{PORT}{Style.RESET_ALL}")
+    if exporter is not None:
+        print(f"{Fore.CYAN}📈 Metrics: http://localhost:{METRICS_PORT}/metrics{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}🔎 Live streams: http://localhost:{METRICS_PORT}/streams{Style.RESET_ALL}")
+    if CHANNELZ and channelz is not None:
+        print(f"{Fore.CYAN}🔬 Channelz: grpc.channelz.v1 on localhost:{PORT}{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}📡 Protocol: gRPC with bidirectional streaming{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}🔧 Press Ctrl+C to stop{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}{'═' * 60}{Style.RESET_ALL}")
+    
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:  # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+            pass
+    
+    try:
+        await stopping.wait()
+    finally:
+        upstream.cancel()
+        if exporter is not None:
+            exporter.close()
+        await servicer.drain()
+        if DRAIN_DELAY > 0:
+            # Keep serving while health checkers notice NOT_SERVING and move traffic away
+            print(f"\n{Fore.YELLOW}💛 Draining for {DRAIN_DELAY:g}s before refusing new RPCs...{Style.RESET_ALL}")
+            await asyncio.sleep(DRAIN_DELAY)
+        
+        # New RPCs are refused at once; running ones get SHUTDOWN_GRACE seconds before they are cancelled
+        print(f"\n{Fore.YELLOW}👋 gRPC server shutting down gracefully (up to {SHUTDOWN_GRACE:g}s)...{Style.RESET_ALL}")
+        await server.stop(grace=SHUTDOWN_GRACE)
 
 def main():
     """
     Main server function
     """
     try:
-        server = serve()
-        server.start()
-        
-        print(f"{Fore.GREEN}✅ gRPC server started successfully!{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}🌐 Listening on: localhost:50051{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}📡 Protocol: gRPC with bidirectional streaming{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}🔧 Press Ctrl+C to stop{Style.RESET_ALL}")
-        print(f"{Fore.WHITE}{'═' * 60}{Style.RESET_ALL}")
-        
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print(f"\n{Fore.YELLOW}👋 gRPC server shutting down gracefully...{Style.RESET_ALL}")
-            server.stop(grace=5)
-            
+        asyncio.run(run())
     except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}👋 gRPC server shutting down gracefully...{Style.RESET_ALL}")
+        print(f"\n{Fore.YELLOW}👋 gRPC server stopped{Style.RESET_ALL}")
     except Exception as e:
         print(f"{Fore.RED}❌ Error starting gRPC server: {e}{Style.RESET_ALL}")
 
@@ -2,8 +2,10 @@ from colorama import Style
 from colorama import Fore
 from colorama import Back
 from colorama import init 
+from importlib import metadata
 from pathlib import Path
 import subprocess
+import codegen
 import sys
 import os
 
@@ -15,9 +17,9 @@ init(autoreset=True)
 gRPC Multi-turn Chat Setup Script
 
 This script handles the complete setup for the gRPC implementation:
-1. Check and install dependencies
-2. Create proto file if needed
-3. Generate gRPC code
+1. Check and install missing dependencies
+2. Check the proto file
+3. Generate gRPC code (skipped when chat.proto and the toolchain are unchanged; --force regenerates)
 4. Verify setup
 """
 
@@ -40,12 +42,20 @@ def install_dependencies():
     dependencies = [
         "grpcio>=1.60.0",
         "grpcio-tools>=1.60.0", 
+        "grpcio-health-checking>=1.60.0",
+        "grpcio-channelz>=1.60.0",
         "protobuf>=4.25.0",
         "colorama>=0.4.6"
     ]
     
     try:
         for dep in dependencies:
+            name = dep.split('>=')[0]
+            try:
+                print(f"{Fore.GREEN}  ✅ {name} {metadata.version(name)} already installed{Style.RESET_ALL}")
+                continue
+            except metadata.PackageNotFoundError:
+                pass
             print(f"{Fore.CYAN}  Installing {dep}...{Style.RESET_ALL}")
             subprocess.check_call([
                 sys.executable, "-m", "pip", "install", dep
@@ -57,203 +67,35 @@ def install_dependencies():
         print(f"{Fore.RED}❌ Failed to install dependencies: {e}{Style.RESET_ALL}")
         return False
 
-def create_proto_file():
+def check_proto_file():
     """
-    Create the proto file if it doesn't exist
+    Check that the proto file exists (it is the source of truth and lives in the repository)
     """
-    current_dir = Path(__file__).parent
-    proto_file = current_dir / "chat.proto"
-    
-    if proto_file.exists():
-        print(f"{Fore.GREEN}✅ Proto file already exists: {proto_file.name}{Style.RESET_ALL}")
-        return True
-    
-    print(f"{Fore.YELLOW}📝 Creating proto file: {proto_file.name}{Style.RESET_ALL}")
-    
-    proto_content = '''syntax = "proto3";
-
-package chat;
-
-// The Chat service definition
-service ChatService {
-  // Create a new chat session
-  rpc CreateSession(CreateSessionRequest) returns (CreateSessionResponse);
-  
-  // Get session information
-  rpc GetSessionInfo(SessionInfoRequest) returns (SessionInfoResponse);
-  
-  // List all active sessions
-  rpc ListSessions(ListSessionsRequest) returns (ListSessionsResponse);
-  
-  // Delete a session
-  rpc DeleteSession(DeleteSessionRequest) returns (DeleteSessionResponse);
-  
-  // Get server statistics
-  rpc GetServerStats(ServerStatsRequest) returns (ServerStatsResponse);
-  
-  // Bidirectional streaming chat
-  rpc Chat(stream ChatRequest) returns (stream ChatResponse);
-}
-
-// Session Management Messages
-message CreateSessionRequest {
-  string model_id = 1;  // Optional, defaults to gemini-2.0-flash
-}
-
-message CreateSessionResponse {
-  string session_id = 1;
-  string model = 2;
-  bool success = 3;
-  string message = 4;
-}
-
-message SessionInfoRequest {
-  string session_id = 1;
-}
-
-message SessionInfoResponse {
-  bool success = 1;
-  string message = 2;
-  string session_id = 3;
-  string model = 4;
-  int32 message_count = 5;
-  int32 user_messages = 6;
-  int32 model_messages = 7;
-  int32 duration_seconds = 8;
-  string created_at = 9;
-}
-
-message ListSessionsRequest {
-  // Empty for now, could add pagination in the future
-}
-
-message SessionSummary {
-  string session_id = 1;
-  string model = 2;
-  int32 message_count = 3;
-  int32 duration_minutes = 4;
-  string created_at = 5;
-}
-
-message ListSessionsResponse {
-  repeated SessionSummary sessions = 1;
-  int32 active_sessions = 2;
-}
-
-message DeleteSessionRequest {
-  string session_id = 1;
-}
-
-message DeleteSessionResponse {
-  bool success = 1;
-  string message = 2;
-}
-
-message ServerStatsRequest {
-  // Empty for now
-}
-
-message ServerStatsResponse {
-  int32 uptime_seconds = 1;
-  int32 total_requests = 2;
-  int32 successful_requests = 3;
-  int32 failed_requests = 4;
-  int32 active_sessions = 5;
-  int32 total_sessions_created = 6;
-  double average_response_time = 7;
-  string model = 8;
-  string framework = 9;
-}
-
-// Chat Streaming Messages
-message ChatRequest {
-  enum Type {
-    MESSAGE = 0;
-    PING = 1;
-    TYPING_START = 2;
-    TYPING_STOP = 3;
-  }
-  
-  Type type = 1;
-  string session_id = 2;
-  string message = 3;  // For MESSAGE type
-  string timestamp = 4;
-}
-
-message ChatResponse {
-  enum Type {
-    STATUS = 0;
-    RESPONSE_START = 1;
-    CHUNK = 2;
-    RESPONSE_COMPLETE = 3;
-    ERROR = 4;
-    PONG = 5;
-    SESSION_UPDATE = 6;
-  }
-  
-  Type type = 1;
-  string session_id = 2;
-  
-  // Status message
-  string status_message = 3;
-  int32 context_messages = 4;
-  
-  // Chunk data
-  string chunk_text = 5;
-  int32 chunk_number = 6;
-  bool is_final = 7;
-  
-  // Response completion
-  int32 total_chunks = 8;
-  double processing_time = 9;
-  int32 message_count = 10;
-  
-  // Error handling
-  string error_message = 11;
-  
-  // Session updates
-  string update_type = 12;
-  string update_data = 13;
-  
-  // Timestamp
-  string timestamp = 14;
-}
-
-// Health Check Messages
-message HealthRequest {
-  // Empty for now
-}
-
-message HealthResponse {
-  bool healthy = 1;
-  string message = 2;
-  string model = 3;
-  double ping_ms = 4;
-  int32 active_sessions = 5;
-  string framework = 6;
-}
-'''
+    proto_file = codegen.PROTO_FILE
     
-    try:
-        with open(proto_file, 'w') as f:
-            f.write(proto_content)
-        print(f"{Fore.GREEN}✅ Proto file created: {proto_file.name}{Style.RESET_ALL}")
-        return True
-    except Exception as e:
-        print(f"{Fore.RED}❌ Failed to create proto file: {e}{Style.RESET_ALL}")
+    if not proto_file.exists():
+        print(f"{Fore.RED}❌ Proto file not found: {proto_file}{Style.RESET_ALL}")
         return False
+    
+    print(f"{Fore.GREEN}✅ Proto file found: {proto_file.name} (sha256 {codegen.proto_digest()[:12]}){Style.RESET_ALL}")
+    return True
 
-def generate_grpc_code():
+def generate_grpc_code(force: bool = False):
     """
-    Generate gRPC Python code from proto file
+    Generate gRPC Python code from proto file, unless the stubs are already current
     """
-    current_dir = Path(__file__).parent
-    proto_file = current_dir / "chat.proto"
+    current_dir = codegen.GRPC_DIR
+    proto_file = codegen.PROTO_FILE
     
     if not proto_file.exists():
         print(f"{Fore.RED}❌ Proto file not found: {proto_file}{Style.RESET_ALL}")
         return False
     
+    stamp = codegen.fingerprint()
+    if not force and codegen.is_current(stamp):
+        print(f"{Fore.GREEN}✅ Generated code is up to date ({codegen.STAMP_FILE.name} matches), skipping protoc{Style.RESET_ALL}")
+        return True
+    
     print(f"{Fore.YELLOW}🔧 Generating gRPC code from {proto_file.name}...{Style.RESET_ALL}")
     
     try:
@@ -273,8 +115,10 @@ def generate_grpc_code():
             grpc_file = current_dir / "chat_pb2_grpc.py"
             
             if pb2_file.exists() and grpc_file.exists():
+                codegen.write_stamp(stamp)
                 print(f"{Fore.GREEN}✅ Generated: {pb2_file.name}{Style.RESET_ALL}")
                 print(f"{Fore.GREEN}✅ Generated: {grpc_file.name}{Style.RESET_ALL}")
+                print(f"{Fore.GREEN}✅ Recorded: {codegen.STAMP_FILE.name}{Style.RESET_ALL}")
                 return True
             else:
                 print(f"{Fore.RED}❌ Generated files not found{Style.RESET_ALL}")
@@ -302,6 +146,7 @@ def verify_setup():
         "chat.proto",
         "chat_pb2.py", 
         "chat_pb2_grpc.py",
+        "chat_pb2.stamp",
         "server.py",
         "client.py"
     ]
@@ -319,11 +164,10 @@ def verify_setup():
         print(f"{Fore.RED}❌ Missing files: {', '.join(missing_files)}{Style.RESET_ALL}")
         return False
     
-    # Test imports
+    # Test imports the way the server and client load the stubs
     try:
         import grpc
-        import chat_pb2
-        import chat_pb2_grpc
+        codegen.load_stubs()
         print(f"{Fore.GREEN}✅ All imports working{Style.RESET_ALL}")
     except ImportError as e:
         print(f"{Fore.RED}❌ Import error: {e}{Style.RESET_ALL}")
@@ -382,8 +226,8 @@ def print_setup_progress():
     print(f"\n{Fore.CYAN}┌─ 🔧 GRPC SETUP PROGRESS ─────────────────────────────────────┐{Style.RESET_ALL}")
     print(f"  Phase 1: Checking Python version compatibility")
     print(f"  Phase 2: Installing required dependencies")
-    print(f"  Phase 3: Creating Protocol Buffer definitions")
-    print(f"  Phase 4: Generating gRPC Python code")
+    print(f"  Phase 3: Checking Protocol Buffer definitions")
+    print(f"  Phase 4: Generating gRPC Python code (if changed)")
     print(f"  Phase 5: Verifying complete setup")
     print(f"{Fore.CYAN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
@@ -393,10 +237,10 @@ def print_completion_summary():
     """
     print(f"\n{Fore.GREEN}┌─ ✅ SETUP COMPLETED SUCCESSFULLY ───────────────────────────────┐{Style.RESET_ALL}")
     print(f"  Protocol Buffers: chat.proto")
-    print(f"  Generated Code: chat_pb2.py, chat_pb2_grpc.py")
+    print(f"  Generated Code: chat_pb2.py, chat_pb2_grpc.py ({codegen.STAMP_FILE.name})")
     print(f"  Server: server.py")
     print(f"  Client: client.py")
-    print(f"  Dependencies: grpcio, grpcio-tools, protobuf, colorama")
+    print(f"  Dependencies: grpcio, grpcio-tools, grpcio-health-checking, grpcio-channelz, protobuf, colorama")
     print(f"{Fore.GREEN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
 def main():
@@ -416,14 +260,14 @@ def main():
     if not install_dependencies():
         return 1
     
-    # Create proto file
+    # Check proto file
     print(f"\n{Fore.YELLOW}Phase 3: Setting up Protocol Buffers...{Style.RESET_ALL}")
-    if not create_proto_file():
+    if not check_proto_file():
         return 1
     
     # Generate gRPC code
     print(f"\n{Fore.YELLOW}Phase 4: Generating gRPC code...{Style.RESET_ALL}")
-    if not generate_grpc_code():
+    if not generate_grpc_code(force='--force' in sys.argv[1:]):
         return 1
     
     # Verify setup
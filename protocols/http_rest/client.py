@@ -1,3 +1,4 @@
+from shared.http_client import create_http_client
 from datetime import timedelta
 from datetime import datetime
 from colorama import Style
@@ -21,6 +22,12 @@ SESSION_INFO_ENDPOINT = f'{SERVER_URL}/sessions'
 HEALTH_ENDPOINT = f'{SERVER_URL}/health'
 STATS_ENDPOINT = f'{SERVER_URL}/stats'
 DOCS_ENDPOINT = f'{SERVER_URL}/docs'
+JOBS_ENDPOINT = f'{SERVER_URL}/jobs'
+BATCH_ENDPOINT = f'{SERVER_URL}/chat/batch'
+JOB_POLL_WAIT = 25  # seconds each GET /jobs/{id} long-poll waits server-side
+
+# Shared connection-reusing client; HTTP_VERSION=2 multiplexes requests over one HTTP/2 connection
+http_client = create_http_client()
 
 # Session statistics
 session_stats = {
@@ -40,6 +47,11 @@ current_session = {
     'session_created_at': None
 }
 
+# Chat mode: async jobs (POST /chat?async=1 + long-poll) avoid holding one request open for the whole answer
+client_settings = {
+    'async_chat': os.environ.get('REST_ASYNC_CHAT', '1') != '0'
+}
+
 def print_banner():
     banner = f"""
 {Fore.MAGENTA}══════════════════════════════════════════════════════════════
@@ -47,6 +59,7 @@ def print_banner():
 ══════════════════════════════════════════════════════════════
   Server: {SERVER_URL:<47} 
   Framework: FastAPI{' ' * 41} 
+  HTTP: {http_client.http_version:<49} 
   Multi-turn: {Fore.GREEN}ENABLED{Fore.MAGENTA}{' ' * 39} 
   Status: {Fore.GREEN}CONNECTING...{Fore.MAGENTA}{' ' * 39} 
 ══════════════════════════════════════════════════════════════{Style.RESET_ALL}
@@ -61,7 +74,7 @@ def check_server_health():
         print(f"{Fore.YELLOW}🔍 Checking HTTP REST multi-turn server health...{Style.RESET_ALL}")
         
         start_time = time.time()
-        response = requests.get(HEALTH_ENDPOINT, timeout=5)
+        response = http_client.get(HEALTH_ENDPOINT, timeout=5)
         ping_time = time.time() - start_time
         
         if response.status_code == 200:
@@ -95,7 +108,7 @@ def create_new_session(model_id=None):
         if model_id:
             payload['model_id'] = model_id
             
-        response = requests.post(NEW_SESSION_ENDPOINT, json=payload, timeout=10)
+        response = http_client.post(NEW_SESSION_ENDPOINT, json=payload, timeout=10)
         
         if response.status_code == 200:
             session_data = response.json()
@@ -130,7 +143,7 @@ def get_session_info(session_id=None):
             print(f"{Fore.RED}❌ No active session{Style.RESET_ALL}")
             return False
             
-        response = requests.get(f"{SESSION_INFO_ENDPOINT}/{session_id}", timeout=5)
+        response = http_client.get(f"{SESSION_INFO_ENDPOINT}/{session_id}", timeout=5)
         
         if response.status_code == 200:
             info = response.json()
@@ -159,7 +172,7 @@ def list_all_sessions():
     List all active sessions on the server
     """
     try:
-        response = requests.get(SESSION_INFO_ENDPOINT, timeout=5)
+        response = http_client.get(SESSION_INFO_ENDPOINT, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -178,6 +191,9 @@ def list_all_sessions():
                     
                     print(f"{Fore.CYAN}│{Style.RESET_ALL} {i}. {session['session_id'][:8]}... ({session['message_count']} msgs, {str(duration).split('.')[0]}, {created_time}){Fore.GREEN}{marker}{Style.RESET_ALL}")
             
+            if data.get('next_cursor'):
+                print(f"{Fore.CYAN}│{Style.RESET_ALL} ... {data['active_sessions'] - len(sessions)} more (first page only)")
+            
             print(f"{Fore.CYAN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
             return True
         else:
@@ -197,7 +213,7 @@ def clear_session_history():
             print(f"{Fore.RED}❌ No active session to clear{Style.RESET_ALL}")
             return False
             
-        response = requests.post(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/clear", timeout=5)
+        response = http_client.post(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/clear", timeout=5)
         
         if response.status_code == 200:
             current_session['message_count'] = 0
@@ -220,7 +236,7 @@ def delete_current_session():
             print(f"{Fore.RED}❌ No active session to delete{Style.RESET_ALL}")
             return False
             
-        response = requests.delete(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}", timeout=5)
+        response = http_client.delete(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}", timeout=5)
         
         if response.status_code == 200:
             print(f"{Fore.GREEN}✅ Session deleted successfully{Style.RESET_ALL}")
@@ -356,6 +372,8 @@ def print_help():
     print(f"{Fore.CYAN}  /health{Style.RESET_ALL}   - Check server health")
     print(f"{Fore.CYAN}  /docs{Style.RESET_ALL}     - Open API documentation in browser")
     print(f"{Fore.CYAN}  /clear{Style.RESET_ALL}    - Clear the screen")
+    print(f"{Fore.CYAN}  /batch q1 | q2{Style.RESET_ALL} - Ask independent questions in one batch (new session each)")
+    print(f"{Fore.CYAN}  /async{Style.RESET_ALL}    - Toggle async job mode (now {'ON' if client_settings['async_chat'] else 'OFF'})")
     print(f"{Fore.CYAN}  /quit{Style.RESET_ALL}     - Exit the chat client")
     print()
     print(f"{Fore.YELLOW}🔄 Session Management:{Style.RESET_ALL}")
@@ -370,7 +388,7 @@ def get_server_stats():
     Get and display server statistics
     """
     try:
-        response = requests.get(STATS_ENDPOINT, timeout=5)
+        response = http_client.get(STATS_ENDPOINT, timeout=5)
         if response.status_code == 200:
             stats = response.json()
             uptime_str = str(timedelta(seconds=stats['uptime_seconds']))
@@ -404,6 +422,75 @@ def open_docs():
         print(f"{Fore.RED}❌ Could not open browser: {e}{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}💡 Manually visit: {DOCS_ENDPOINT}{Style.RESET_ALL}")
 
+def run_chat_job(payload: dict) -> tuple:
+    """
+    Submit a chat turn as an async job and long-poll until it finishes
+    """
+    response = http_client.post(CHAT_ENDPOINT, params={'async': 1}, json=payload, timeout=10)
+    response_size = len(response.content)
+    if response.status_code != 202:
+        try:
+            return response.status_code, response.json(), response_size
+        except json.JSONDecodeError:
+            return response.status_code, {'error': 'Invalid JSON response'}, response_size
+    
+    job = response.json()
+    print(f"{Fore.BLUE}⏳ Job {job['job_id'][:8]}... queued, waiting for the response{Style.RESET_ALL}")
+    
+    while job['status'] in ('queued', 'running'):
+        response = http_client.get(f"{JOBS_ENDPOINT}/{job['job_id']}", params={'wait': JOB_POLL_WAIT}, timeout=JOB_POLL_WAIT + 10)
+        response_size += len(response.content)
+        if response.status_code != 200:
+            return response.status_code, response.json(), response_size
+        job = response.json()
+    
+    if job['status'] == 'failed':
+        return 500, {'detail': {'error': job['error']}}, response_size
+    return 200, job['result'], response_size
+
+def send_batch(batch_input: str):
+    """
+    Send independent questions as one batch and show each answer as it completes
+    """
+    messages = [message.strip() for message in batch_input.split('|') if message.strip()]
+    if not messages:
+        print(f"{Fore.YELLOW}💡 Usage: /batch first question | second question | ...{Style.RESET_ALL}")
+        return
+    
+    payload = {'requests': [{'message': message} for message in messages]}
+    print(f"{Fore.BLUE}📦 Sending batch of {len(messages)} questions...{Style.RESET_ALL}")
+    
+    try:
+        response = http_client.post(
+            BATCH_ENDPOINT,
+            json=payload,
+            stream=True,
+            timeout=120,
+            headers={'Accept': 'application/x-ndjson'}
+        )
+        if response.status_code != 200:
+            print(f"{Fore.RED}❌ Batch failed: {response.json().get('detail', 'Unknown error')}{Style.RESET_ALL}")
+            return
+        
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            result = json.loads(line)
+            if result['type'] == 'complete':
+                print(f"\n{Fore.GREEN}✅ Batch done: {result['succeeded']} succeeded, {result['failed']} failed in {result['processing_time']:.3f}s{Style.RESET_ALL}")
+            elif result['success']:
+                context = f"(#{result['index'] + 1}: \"{messages[result['index']][:30]}\", session {result['session_id'][:8]}...)"
+                display_ai_response(result['response']['response'], context)
+            else:
+                print(f"\n{Fore.RED}❌ #{result['index'] + 1} failed: {result['error']}{Style.RESET_ALL}")
+                
+    except requests.exceptions.Timeout:
+        print(f"\n{Fore.RED}⏰ Batch request timed out.{Style.RESET_ALL}")
+    except requests.exceptions.ConnectionError:
+        print(f"\n{Fore.RED}🔌 Connection failed. Is the HTTP REST server running?{Style.RESET_ALL}")
+    except Exception as e:
+        print(f"\n{Fore.RED}❌ Error: {e}{Style.RESET_ALL}")
+
 def send_message(user_message: str):
     """
     Send message to server and handle response
@@ -431,20 +518,23 @@ def send_message(user_message: str):
     
     try:
         start_time = time.time()
-        response = requests.post(CHAT_ENDPOINT, json=payload, timeout=30)
+        if client_settings['async_chat']:
+            status_code, response_data, response_size = run_chat_job(payload)
+        else:
+            response = http_client.post(CHAT_ENDPOINT, json=payload, timeout=30)
+            status_code = response.status_code
+            response_size = len(response.content)
+            
+            try:
+                response_data = response.json()
+            except json.JSONDecodeError:
+                response_data = {'error': 'Invalid JSON response'}
         response_time = time.time() - start_time
         
-        response_size = len(response.content)
-        
-        try:
-            response_data = response.json()
-        except json.JSONDecodeError:
-            response_data = {'error': 'Invalid JSON response'}
-        
         # Log response details
-        log_response_details(response_data, response.status_code, response_time, response_size)
+        log_response_details(response_data, status_code, response_time, response_size)
         
-        if response.status_code == 200:
+        if status_code == 200:
             session_stats['successful_requests'] += 1
             session_stats['total_response_time'] += response_time
             
@@ -555,6 +645,15 @@ def main():
                 print_banner()
                 continue
                 
+            elif user_message.lower().startswith('/batch'):
+                send_batch(user_message[len('/batch'):])
+                continue
+                
+            elif user_message.lower() == '/async':
+                client_settings['async_chat'] = not client_settings['async_chat']
+                print(f"{Fore.GREEN}✅ Async job mode {'enabled' if client_settings['async_chat'] else 'disabled'}{Style.RESET_ALL}")
+                continue
+                
             elif user_message.lower() == '/new':
                 create_new_session()
                 continue
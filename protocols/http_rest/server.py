@@ -1,12 +1,32 @@
 from fastapi.middleware.cors import CORSMiddleware
+from concurrent.futures import ThreadPoolExecutor
 from shared.setup import initialize_genai_client
+from shared.metrics import PROMETHEUS_CONTENT_TYPE
+from shared.metrics import MetricsMiddleware
+from shared.metrics import registry
+from shared.compression import CompressionMiddleware
+from shared.compression import compression_stats
+from shared.serving import describe_http_mode
+from shared.serving import run_server
 from shared.llm import create_chat_session
+from shared.serialization import FastJSONResponse
+from shared.serialization import dumps
+from shared.conditional import ConditionalCache
+from shared.conditional import ResourceVersions
+from shared.conditional import VersionedStats
+from shared.session_index import SESSIONS_MAX_PAGE_SIZE
+from shared.session_index import SESSIONS_PAGE_SIZE
+from shared.session_index import SessionIndex
 from contextlib import asynccontextmanager
+from fastapi.responses import StreamingResponse
 from shared.llm import ChatSession
+from typing import AsyncGenerator
 from fastapi import HTTPException 
 from pydantic import BaseModel
 from datetime import datetime
+from fastapi.responses import Response
 from fastapi import FastAPI
+from fastapi import Query
 from typing import Optional 
 from fastapi import Request
 from colorama import Style
@@ -15,7 +35,7 @@ from colorama import Back
 from colorama import init
 from typing import Dict
 from typing import List 
-import uvicorn
+import asyncio
 import time
 import uuid
 import os
@@ -79,22 +99,86 @@ class StatsResponse(BaseModel):
     start_time: str
     active_sessions: int
     total_sessions_created: int
+    compression: Dict[str, dict]
+    active_jobs: int
+    jobs_submitted: int
+    jobs_completed: int
+    jobs_failed: int
+    jobs_rejected: int
+    jobs_expired: int
+    batch_requests: int
+    batch_items: int
+
+
+class BatchChatItem(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+
+
+class BatchChatRequest(BaseModel):
+    requests: List[BatchChatItem]
+
+
+class BatchChatResult(BaseModel):
+    index: int
+    session_id: Optional[str] = None
+    success: bool
+    response: Optional[ChatResponse] = None
+    error: Optional[str] = None
+
+
+class BatchChatResponse(BaseModel):
+    results: List[BatchChatResult]
+    succeeded: int
+    failed: int
+    processing_time: float
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    session_id: str
+    created_at: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    result: Optional[ChatResponse] = None
+    error: Optional[str] = None
 
 
 # Configuration
 MODEL_ID = os.environ.get('GENAI_MODEL_ID', 'gemini-2.0-flash')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))              # upstream calls running at once for async jobs
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '64'))     # queued + running jobs before POST /chat?async=1 is refused
+JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', '300'))      # seconds a finished job's result stays retrievable
+JOB_MAX_WAIT = int(os.environ.get('JOB_MAX_WAIT', '30'))           # longest long-poll on GET /jobs/{job_id}
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', '100'))     # turns accepted per POST /chat/batch
+JOB_EXPIRY_INTERVAL = 10                                           # seconds between sweeps for expired jobs
 
 # Global variables
 chat_sessions: Dict[str, ChatSession] = {}
 session_metadata: Dict[str, dict] = {}
-chat_stats = {
+session_locks: Dict[str, asyncio.Lock] = {}  # one turn at a time per session, across sync requests and jobs
+jobs: Dict[str, dict] = {}
+job_tasks: set = set()  # running jobs; the event loop only keeps weak references to tasks
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='chat-job')
+resource_versions = ResourceVersions()  # bumped on every session/stats mutation, backs the ETags
+conditional_cache = ConditionalCache()
+session_index = SessionIndex()  # ordered by created_at / last_activity, overall and per model
+chat_stats = VersionedStats(resource_versions, {
     'total_requests': 0,
     'successful_requests': 0,
     'failed_requests': 0,
     'total_response_time': 0,
     'total_sessions_created': 0,
+    'jobs_submitted': 0,
+    'jobs_completed': 0,
+    'jobs_failed': 0,
+    'jobs_rejected': 0,
+    'jobs_expired': 0,
+    'batch_requests': 0,
+    'batch_items': 0,
     'start_time': datetime.now()
-}
+})
 
 # Lifespan event handler
 @asynccontextmanager
@@ -106,10 +190,13 @@ async def lifespan(app: FastAPI):
     print(f"{Fore.YELLOW}📊 Statistics endpoint: http://localhost:8000/stats{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}❤️  Health check: http://localhost:8000/health{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}🔧 Use Ctrl+C to stop the server{Style.RESET_ALL}\n")
+    expiry_task = asyncio.create_task(expire_jobs())
     
     yield
     
     # Shutdown
+    expiry_task.cancel()
+    job_executor.shutdown(wait=False, cancel_futures=True)
     print(f"\n\n{Fore.YELLOW}👋 HTTP REST server shutting down gracefully...{Style.RESET_ALL}")
     print(f"{Fore.CYAN}💭 Active sessions: {len(chat_sessions)}{Style.RESET_ALL}")
     print_stats()
@@ -120,6 +207,7 @@ app = FastAPI(
     title="GenAI Multi-turn Chat API",
     description="HTTP REST-based multi-turn chat server with GenAI integration",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -132,12 +220,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/br/zstd; streamed responses are flushed per chunk (or per COMPRESSION_FLUSH_MS window)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency, status codes and bytes (outermost, so it sees compressed sizes); served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 def print_banner():
     banner = f"""{Fore.CYAN}══════════════════════════════════════════════════════════════
                🚀 HTTP REST MULTI-TURN CHAT SERVER 🚀            
 ══════════════════════════════════════════════════════════════
   Model: {MODEL_ID:<48} 
   Framework: FastAPI{' ' * 41} 
+  HTTP: {describe_http_mode():<49} 
   Multi-turn: {Fore.GREEN}ENABLED{Fore.CYAN}{' ' * 41} 
   Status: {Fore.GREEN}READY{Fore.CYAN}{' ' * 45} 
 ══════════════════════════════════════════════════════════════{Style.RESET_ALL}
@@ -170,6 +265,8 @@ def create_new_session(model_id: str = None) -> tuple[str, ChatSession]:
             'last_activity': datetime.now()
         }
         chat_stats['total_sessions_created'] += 1
+        resource_versions.watch(session_id, chat_session)
+        session_index.add(session_id, model_id, session_metadata[session_id]['created_at'])
         
         print(f"{Fore.CYAN}INFO: Created new session {session_id} with model {model_id}{Style.RESET_ALL}")
         return session_id, chat_session
@@ -189,6 +286,8 @@ def get_or_create_session(session_id: str = None, model_id: str = None) -> tuple
     else:
         chat_session = chat_sessions[session_id]
         session_metadata[session_id]['last_activity'] = datetime.now()
+        resource_versions.bump_session(session_id)
+        session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return session_id, chat_session, is_new_session
 
@@ -263,6 +362,150 @@ def log_error_details(error: Exception, processing_time: float):
     print(f"{Fore.RED}│{Style.RESET_ALL} Status: {Fore.RED}FAILED{Style.RESET_ALL}")
     print(f"{Fore.RED}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
+def get_session_lock(session_id: str) -> asyncio.Lock:
+    """
+    Get the lock that serializes turns within a session
+    """
+    lock = session_locks.get(session_id)
+    if lock is None:
+        lock = session_locks[session_id] = asyncio.Lock()
+    return lock
+
+async def generate_chat_response(session_id: str, chat_session: ChatSession, is_new_session: bool, user_message: str,
+                                 client_ip: str, start_time: float, job: Optional[dict] = None, offload: bool = False) -> ChatResponse:
+    """
+    Run one chat turn; async jobs and batch turns (offload) run the upstream call on the worker pool
+    """
+    async with get_session_lock(session_id):
+        # Log processing start
+        message_count = chat_session.get_message_count()
+        log_processing(user_message, session_id, message_count)
+        print(f"{Fore.CYAN}INFO: Processing message from {client_ip} in session {session_id}{Style.RESET_ALL}")
+        
+        # Generate response using chat session
+        if job is None and not offload:
+            response_text = chat_session.generate_response(user_message)
+        else:
+            def generate() -> str:
+                if job is not None:
+                    job['status'] = 'running'
+                    job['started_at'] = datetime.now()
+                return chat_session.generate_response(user_message)
+            response_text = await asyncio.get_running_loop().run_in_executor(job_executor, generate)
+        processing_time = time.time() - start_time
+    
+    # Update statistics
+    chat_stats['successful_requests'] += 1
+    chat_stats['total_response_time'] += processing_time
+    
+    # Get updated message count
+    updated_message_count = chat_session.get_message_count()
+    
+    # Log response details
+    log_response_details(response_text, processing_time, session_id, updated_message_count)
+    print(f"{Fore.GREEN}SUCCESS: Generated response for {client_ip} in session {session_id} in {processing_time:.3f}s{Style.RESET_ALL}")
+    
+    # Print updated statistics
+    print_stats()
+    
+    return ChatResponse(
+        response=response_text,
+        session_id=session_id,
+        processing_time=round(processing_time, 3),
+        model=chat_session.model_id,
+        timestamp=datetime.now().isoformat(),
+        message_count=updated_message_count,
+        is_new_session=is_new_session
+    )
+
+async def run_chat_job(job: dict, chat_session: ChatSession, is_new_session: bool, user_message: str, client_ip: str, start_time: float):
+    """
+    Background task for an async chat job
+    """
+    try:
+        job['result'] = await generate_chat_response(job['session_id'], chat_session, is_new_session, user_message, client_ip, start_time, job)
+        job['status'] = 'succeeded'
+        chat_stats['jobs_completed'] += 1
+    except Exception as e:
+        processing_time = time.time() - start_time
+        chat_stats['failed_requests'] += 1
+        chat_stats['jobs_failed'] += 1
+        job['status'] = 'failed'
+        job['error'] = str(e)
+        
+        log_error_details(e, processing_time)
+        print(f"{Fore.RED}ERROR: Job {job['job_id']} from {client_ip} failed: {e}{Style.RESET_ALL}")
+    finally:
+        job['completed_at'] = datetime.now()
+        job['done'].set()
+
+async def run_batch_group(items: List[tuple], client_ip: str, results: asyncio.Queue):
+    """
+    Run one session's batch turns in order, reporting each result as it completes
+    """
+    session_id = items[0][1].session_id
+    for index, item in items:
+        start_time = time.time()
+        chat_stats['total_requests'] += 1
+        try:
+            user_message = item.message.strip()
+            if not user_message:
+                raise ValueError("Message is required")
+            
+            session_id, chat_session, is_new_session = get_or_create_session(session_id)
+            response = await generate_chat_response(session_id, chat_session, is_new_session, user_message, client_ip, start_time, offload=True)
+            await results.put(BatchChatResult(index=index, session_id=session_id, success=True, response=response))
+        except Exception as e:
+            chat_stats['failed_requests'] += 1
+            log_error_details(e, time.time() - start_time)
+            await results.put(BatchChatResult(index=index, session_id=session_id, success=False, error=str(e)))
+
+async def run_batch(batch: List[BatchChatItem], client_ip: str) -> AsyncGenerator[BatchChatResult, None]:
+    """
+    Run a batch concurrently across sessions and yield results in completion order
+    """
+    # Turns for the same session run one after another; items without a session each start a new one
+    groups: Dict[str, List[tuple]] = {}
+    for index, item in enumerate(batch):
+        groups.setdefault(item.session_id or f"new:{index}", []).append((index, item))
+    
+    results: asyncio.Queue = asyncio.Queue()
+    tasks = [asyncio.create_task(run_batch_group(items, client_ip, results)) for items in groups.values()]
+    try:
+        for _ in range(len(batch)):
+            yield await results.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def job_to_response(job: dict) -> JobResponse:
+    """
+    Build the API view of a job
+    """
+    return JobResponse(
+        job_id=job['job_id'],
+        status=job['status'],
+        session_id=job['session_id'],
+        created_at=job['created_at'].isoformat(),
+        started_at=job['started_at'].isoformat() if job['started_at'] else None,
+        completed_at=job['completed_at'].isoformat() if job['completed_at'] else None,
+        result=job['result'],
+        error=job['error']
+    )
+
+async def expire_jobs():
+    """
+    Drop finished jobs whose results have outlived JOB_RESULT_TTL
+    """
+    while True:
+        await asyncio.sleep(JOB_EXPIRY_INTERVAL)
+        now = datetime.now()
+        expired = [job_id for job_id, job in jobs.items()
+                   if job['completed_at'] and (now - job['completed_at']).total_seconds() > JOB_RESULT_TTL]
+        for job_id in expired:
+            del jobs[job_id]
+        chat_stats['jobs_expired'] += len(expired)
+
 def print_stats():
     """
     Print current server statistics
@@ -281,10 +524,10 @@ def print_stats():
     print(f"{Fore.CYAN}│{Style.RESET_ALL} Avg Response Time: {Fore.YELLOW}{avg_response_time:.3f}s{Style.RESET_ALL}")
     print(f"{Fore.CYAN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest, http_request: Request):
+@app.post("/chat", response_model=ChatResponse, responses={202: {"model": JobResponse}})
+async def chat(request: ChatRequest, http_request: Request, async_mode: bool = Query(False, alias="async")):
     """
-    Main chat endpoint with multi-turn support
+    Main chat endpoint with multi-turn support; ?async=1 queues the turn as a job and returns 202
     """
     start_time = time.time()
     client_ip = get_client_ip(http_request)
@@ -293,6 +536,10 @@ async def chat(request: ChatRequest, http_request: Request):
     chat_stats['total_requests'] += 1
     
     try:
+        if async_mode and sum(1 for job in jobs.values() if not job['completed_at']) >= JOB_MAX_PENDING:
+            chat_stats['jobs_rejected'] += 1
+            raise HTTPException(status_code=503, detail="Too many pending jobs", headers={"Retry-After": "5"})
+        
         # Get or create session
         session_id, chat_session, is_new_session = get_or_create_session(request.session_id)
         
@@ -313,38 +560,32 @@ async def chat(request: ChatRequest, http_request: Request):
             log_error_details(ValueError("Empty message received"), processing_time)
             raise HTTPException(status_code=400, detail="Message is required")
         
-        # Log processing start
-        message_count = chat_session.get_message_count()
-        log_processing(user_message, session_id, message_count)
-        print(f"{Fore.CYAN}INFO: Processing message from {client_ip} in session {session_id}{Style.RESET_ALL}")
-        
-        # Generate response using chat session
-        response_text = chat_session.generate_response(user_message)
-        processing_time = time.time() - start_time
-        
-        # Update statistics
-        chat_stats['successful_requests'] += 1
-        chat_stats['total_response_time'] += processing_time
-        
-        # Get updated message count
-        updated_message_count = chat_session.get_message_count()
+        if async_mode:
+            job_id = str(uuid.uuid4())
+            job = jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'session_id': session_id,
+                'created_at': datetime.now(),
+                'started_at': None,
+                'completed_at': None,
+                'result': None,
+                'error': None,
+                'done': asyncio.Event()
+            }
+            chat_stats['jobs_submitted'] += 1
+            task = asyncio.create_task(run_chat_job(job, chat_session, is_new_session, user_message, client_ip, start_time))
+            job_tasks.add(task)
+            task.add_done_callback(job_tasks.discard)
+            print(f"{Fore.CYAN}INFO: Queued job {job_id} for {client_ip} in session {session_id}{Style.RESET_ALL}")
+            
+            return FastJSONResponse(
+                status_code=202,
+                content=job_to_response(job).model_dump(),
+                headers={"Location": f"/jobs/{job_id}"}
+            )
         
-        # Log response details
-        log_response_details(response_text, processing_time, session_id, updated_message_count)
-        print(f"{Fore.GREEN}SUCCESS: Generated response for {client_ip} in session {session_id} in {processing_time:.3f}s{Style.RESET_ALL}")
-        
-        # Print updated statistics
-        print_stats()
-        
-        return ChatResponse(
-            response=response_text,
-            session_id=session_id,
-            processing_time=round(processing_time, 3),
-            model=chat_session.model_id,
-            timestamp=datetime.now().isoformat(),
-            message_count=updated_message_count,
-            is_new_session=is_new_session
-        )
+        return await generate_chat_response(session_id, chat_session, is_new_session, user_message, client_ip, start_time)
         
     except HTTPException:
         raise
@@ -366,6 +607,66 @@ async def chat(request: ChatRequest, http_request: Request):
             }
         )
 
+@app.post("/chat/batch", response_model=BatchChatResponse)
+async def chat_batch(request: BatchChatRequest, http_request: Request):
+    """
+    Run many chat turns at once; Accept: application/x-ndjson streams each result as it completes
+    """
+    start_time = time.time()
+    client_ip = get_client_ip(http_request)
+    
+    if not request.requests:
+        raise HTTPException(status_code=400, detail="At least one request is required")
+    if len(request.requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} requests)")
+    
+    chat_stats['batch_requests'] += 1
+    chat_stats['batch_items'] += len(request.requests)
+    print(f"{Fore.CYAN}INFO: Batch of {len(request.requests)} turns from {client_ip}{Style.RESET_ALL}")
+    
+    if 'application/x-ndjson' in http_request.headers.get('accept', ''):
+        async def stream_results() -> AsyncGenerator[str, None]:
+            succeeded = 0
+            async for result in run_batch(request.requests, client_ip):
+                succeeded += result.success
+                yield dumps({'type': 'result', **result.model_dump()}) + '\n'
+            yield dumps({
+                'type': 'complete',
+                'succeeded': succeeded,
+                'failed': len(request.requests) - succeeded,
+                'processing_time': round(time.time() - start_time, 3)
+            }) + '\n'
+        
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+    
+    results = [result async for result in run_batch(request.requests, client_ip)]
+    results.sort(key=lambda result: result.index)
+    succeeded = sum(1 for result in results if result.success)
+    
+    return BatchChatResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        processing_time=round(time.time() - start_time, 3)
+    )
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, wait: float = Query(0, ge=0)):
+    """
+    Get an async chat job; ?wait=N long-polls up to N seconds for it to finish
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    if wait and not job['done'].is_set():
+        try:
+            await asyncio.wait_for(job['done'].wait(), timeout=min(wait, JOB_MAX_WAIT))
+        except asyncio.TimeoutError:
+            pass
+    
+    return job_to_response(job)
+
 @app.post("/sessions/new", response_model=NewSessionResponse)
 async def create_session(request: NewSessionRequest):
     """
@@ -385,26 +686,29 @@ async def create_session(request: NewSessionRequest):
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 @app.get("/sessions/{session_id}", response_model=SessionInfoResponse)
-async def get_session_info(session_id: str):
+async def get_session_info(session_id: str, request: Request):
     """
     Get information about a specific session
     """
     if session_id not in chat_sessions:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    chat_session = chat_sessions[session_id]
-    metadata = session_metadata[session_id]
-    summary = chat_session.get_conversation_summary()
+    def build():
+        chat_session = chat_sessions[session_id]
+        metadata = session_metadata[session_id]
+        summary = chat_session.get_conversation_summary()
+        
+        return SessionInfoResponse(
+            session_id=session_id,
+            model=summary['model_id'],
+            message_count=summary['total_messages'],
+            session_duration_seconds=summary['session_duration_seconds'],
+            user_messages=summary['user_messages'],
+            model_messages=summary['model_messages'],
+            created_at=metadata['created_at'].isoformat()
+        )
     
-    return SessionInfoResponse(
-        session_id=session_id,
-        model=summary['model_id'],
-        message_count=summary['total_messages'],
-        session_duration_seconds=summary['session_duration_seconds'],
-        user_messages=summary['user_messages'],
-        model_messages=summary['model_messages'],
-        created_at=metadata['created_at'].isoformat()
-    )
+    return conditional_cache.respond(request, f'session:{session_id}', resource_versions.session_version(session_id), build)
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
@@ -416,6 +720,10 @@ async def delete_session(session_id: str):
     
     del chat_sessions[session_id]
     del session_metadata[session_id]
+    resource_versions.remove_session(session_id)
+    session_index.remove(session_id)
+    conditional_cache.forget(f'session:{session_id}')
+    session_locks.pop(session_id, None)
     
     return {"message": f"Session {session_id} deleted successfully"}
 
@@ -429,29 +737,45 @@ async def clear_session(session_id: str):
     
     chat_sessions[session_id].clear_history()
     session_metadata[session_id]['last_activity'] = datetime.now()
+    resource_versions.bump_session(session_id)
+    session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return {"message": f"Session {session_id} history cleared successfully"}
 
 @app.get("/sessions")
-async def list_sessions():
-    """
-    List all active sessions
-    """
-    sessions = []
-    for session_id, metadata in session_metadata.items():
-        chat_session = chat_sessions[session_id]
-        summary = chat_session.get_conversation_summary()
+async def list_sessions(request: Request,
+                        limit: int = Query(SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE),
+                        cursor: Optional[str] = None,
+                        model: Optional[str] = None,
+                        sort: str = Query('created_at', pattern='^(created_at|last_activity)$'),
+                        order: str = Query('asc', pattern='^(asc|desc)$')):
+    """
+    List active sessions one page at a time, optionally filtered by model
+    """
+    def build():
+        try:
+            session_ids, next_cursor, total = session_index.page(sort, order, model, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        sessions = []
+        for session_id in session_ids:
+            chat_session = chat_sessions[session_id]
+            metadata = session_metadata[session_id]
+            summary = chat_session.get_conversation_summary()
+            
+            sessions.append({
+                "session_id": session_id,
+                "model": summary['model_id'],
+                "message_count": summary['total_messages'],
+                "duration_minutes": summary['session_duration_minutes'],
+                "created_at": metadata['created_at'].isoformat(),
+                "last_activity": metadata['last_activity'].isoformat()
+            })
         
-        sessions.append({
-            "session_id": session_id,
-            "model": summary['model_id'],
-            "message_count": summary['total_messages'],
-            "duration_minutes": summary['session_duration_minutes'],
-            "created_at": metadata['created_at'].isoformat(),
-            "last_activity": metadata['last_activity'].isoformat()
-        })
+        return {"active_sessions": total, "sessions": sessions, "next_cursor": next_cursor}
     
-    return {"active_sessions": len(sessions), "sessions": sessions}
+    return conditional_cache.respond(request, f'sessions?{request.url.query}', resource_versions.sessions_version, build)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check(request: Request):
@@ -470,36 +794,58 @@ async def health_check(request: Request):
     print(f"{Fore.BLUE}│{Style.RESET_ALL} Active Sessions: {Fore.MAGENTA}{len(chat_sessions)}{Style.RESET_ALL}")
     print(f"{Fore.BLUE}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
     
-    return HealthResponse(
-        status='healthy',
-        model=MODEL_ID,
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        active_sessions=len(chat_sessions)
-    )
+    def build():
+        return HealthResponse(
+            status='healthy',
+            model=MODEL_ID,
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            active_sessions=len(chat_sessions)
+        )
+    
+    return conditional_cache.respond(request, 'health', resource_versions.stats_version, build)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Request metrics in the Prometheus text format
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.get("/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request):
     """
     Detailed statistics endpoint
     """
-    uptime = datetime.now() - chat_stats['start_time']
-    avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
-                        if chat_stats['successful_requests'] > 0 else 0)
+    def build():
+        uptime = datetime.now() - chat_stats['start_time']
+        avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
+                            if chat_stats['successful_requests'] > 0 else 0)
+        
+        return StatsResponse(
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            average_response_time=round(avg_response_time, 3),
+            model=MODEL_ID,
+            start_time=chat_stats['start_time'].isoformat(),
+            active_sessions=len(chat_sessions),
+            total_sessions_created=chat_stats['total_sessions_created'],
+            compression=compression_stats.summary(),
+            active_jobs=sum(1 for job in jobs.values() if not job['completed_at']),
+            jobs_submitted=chat_stats['jobs_submitted'],
+            jobs_completed=chat_stats['jobs_completed'],
+            jobs_failed=chat_stats['jobs_failed'],
+            jobs_rejected=chat_stats['jobs_rejected'],
+            jobs_expired=chat_stats['jobs_expired'],
+            batch_requests=chat_stats['batch_requests'],
+            batch_items=chat_stats['batch_items']
+        )
     
-    return StatsResponse(
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        average_response_time=round(avg_response_time, 3),
-        model=MODEL_ID,
-        start_time=chat_stats['start_time'].isoformat(),
-        active_sessions=len(chat_sessions),
-        total_sessions_created=chat_stats['total_sessions_created']
-    )
+    return conditional_cache.respond(request, 'stats', resource_versions.stats_version, build)
 
 @app.get("/")
 async def root():
@@ -511,9 +857,12 @@ async def root():
         "version": "2.0.0",
         "framework": "FastAPI",
         "model": MODEL_ID,
-        "features": ["multi-turn conversations", "session management"],
+        "features": ["multi-turn conversations", "session management", "async jobs", "batch chat"],
         "endpoints": {
             "chat": "POST /chat",
+            "chat_async": "POST /chat?async=1",
+            "job": "GET /jobs/{job_id}?wait=30",
+            "chat_batch": "POST /chat/batch",
             "new_session": "POST /sessions/new",
             "session_info": "GET /sessions/{session_id}",
             "delete_session": "DELETE /sessions/{session_id}",
@@ -528,7 +877,7 @@ async def root():
 
 if __name__ == '__main__':
     try:
-        uvicorn.run(
+        run_server(
             app, 
             host='0.0.0.0', 
             port=8000, 
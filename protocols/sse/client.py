@@ -1,3 +1,4 @@
+from shared.http_client import create_http_client
 from datetime import timedelta 
 from datetime import datetime
 from typing import Optional
@@ -25,6 +26,12 @@ STATS_ENDPOINT = f'{SERVER_URL}/stats'
 DOCS_ENDPOINT = f'{SERVER_URL}/docs'
 DEMO_ENDPOINT = f'{SERVER_URL}/demo'
 
+# Shared connection-reusing client; HTTP_VERSION=2 multiplexes requests over one HTTP/2 connection
+http_client = create_http_client()
+
+# How often to reattach (with Last-Event-ID) when a stream drops before the response completes
+MAX_REATTACH_ATTEMPTS = int(os.environ.get('SSE_MAX_REATTACH_ATTEMPTS', '3'))
+
 # Session statistics
 session_stats = {
     'messages_sent': 0,
@@ -34,7 +41,8 @@ session_stats = {
     'session_start': datetime.now(),
     'sessions_created': 0,
     'total_chunks_received': 0,
-    'total_streams': 0
+    'total_streams': 0,
+    'reattachments': 0
 }
 
 # Current session state
@@ -60,6 +68,7 @@ def print_banner():
 ══════════════════════════════════════════════════════════════
   Server: {SERVER_URL:<47} 
   Framework: FastAPI + SSE{' ' * 37} 
+  HTTP: {http_client.http_version:<49} 
   Multi-turn: {Fore.GREEN}ENABLED{Fore.MAGENTA}{' ' * 39} 
   Streaming: {Fore.GREEN}REAL-TIME{Fore.MAGENTA}{' ' * 38} 
   Status: {Fore.GREEN}CONNECTING...{Fore.MAGENTA}{' ' * 39} 
@@ -75,7 +84,7 @@ def check_server_health():
         print(f"{Fore.YELLOW}🔍 Checking FastAPI SSE server health...{Style.RESET_ALL}")
         
         start_time = time.time()
-        response = requests.get(HEALTH_ENDPOINT, timeout=5)
+        response = http_client.get(HEALTH_ENDPOINT, timeout=5)
         ping_time = time.time() - start_time
         
         if response.status_code == 200:
@@ -110,7 +119,7 @@ def create_new_session(model_id=None):
         if model_id:
             payload['model_id'] = model_id
             
-        response = requests.post(NEW_SESSION_ENDPOINT, json=payload, timeout=10)
+        response = http_client.post(NEW_SESSION_ENDPOINT, json=payload, timeout=10)
         
         if response.status_code == 200:
             session_data = response.json()
@@ -145,7 +154,7 @@ def get_session_info(session_id=None):
             print(f"{Fore.RED}❌ No active session{Style.RESET_ALL}")
             return False
             
-        response = requests.get(f"{SESSION_INFO_ENDPOINT}/{session_id}", timeout=5)
+        response = http_client.get(f"{SESSION_INFO_ENDPOINT}/{session_id}", timeout=5)
         
         if response.status_code == 200:
             info = response.json()
@@ -174,7 +183,7 @@ def list_all_sessions():
     List all active sessions on the server
     """
     try:
-        response = requests.get(SESSION_INFO_ENDPOINT, timeout=5)
+        response = http_client.get(SESSION_INFO_ENDPOINT, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -193,6 +202,9 @@ def list_all_sessions():
                     
                     print(f"{Fore.CYAN}│{Style.RESET_ALL} {i}. {session['session_id'][:8]}... ({session['message_count']} msgs, {str(duration).split('.')[0]}, {created_time}){Fore.GREEN}{marker}{Style.RESET_ALL}")
             
+            if data.get('next_cursor'):
+                print(f"{Fore.CYAN}│{Style.RESET_ALL} ... {data['active_sessions'] - len(sessions)} more (first page only)")
+            
             print(f"{Fore.CYAN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
             return True
         else:
@@ -212,7 +224,7 @@ def clear_session_history():
             print(f"{Fore.RED}❌ No active session to clear{Style.RESET_ALL}")
             return False
             
-        response = requests.post(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/clear", timeout=5)
+        response = http_client.post(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/clear", timeout=5)
         
         if response.status_code == 200:
             current_session['message_count'] = 0
@@ -235,7 +247,7 @@ def delete_current_session():
             print(f"{Fore.RED}❌ No active session to delete{Style.RESET_ALL}")
             return False
             
-        response = requests.delete(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}", timeout=5)
+        response = http_client.delete(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}", timeout=5)
         
         if response.status_code == 200:
             print(f"{Fore.GREEN}✅ Session deleted successfully{Style.RESET_ALL}")
@@ -321,6 +333,7 @@ def print_session_stats():
     print(f"{Fore.MAGENTA}│{Style.RESET_ALL} Failed Streams: {Fore.RED}{session_stats['failed_requests']}{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}│{Style.RESET_ALL} Total Chunks Received: {Fore.CYAN}{session_stats['total_chunks_received']}{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}│{Style.RESET_ALL} Avg Chunks per Stream: {Fore.CYAN}{avg_chunks:.1f}{Style.RESET_ALL}")
+    print(f"{Fore.MAGENTA}│{Style.RESET_ALL} Stream Reattachments: {Fore.YELLOW}{session_stats['reattachments']}{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}│{Style.RESET_ALL} Sessions Created: {Fore.CYAN}{session_stats['sessions_created']}{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}│{Style.RESET_ALL} Avg Response Time: {Fore.YELLOW}{avg_response_time:.3f}s{Style.RESET_ALL}")
     
@@ -358,7 +371,7 @@ def get_server_stats():
     Get and display server statistics
     """
     try:
-        response = requests.get(STATS_ENDPOINT, timeout=5)
+        response = http_client.get(STATS_ENDPOINT, timeout=5)
         if response.status_code == 200:
             stats = response.json()
             uptime_str = str(timedelta(seconds=stats['uptime_seconds']))
@@ -437,7 +450,7 @@ def send_message_stream(user_message: str):
     
     try:
         # Send POST request for SSE stream
-        response = requests.post(
+        response = http_client.post(
             CHAT_STREAM_ENDPOINT, 
             json=payload, 
             stream=True,
@@ -445,23 +458,35 @@ def send_message_stream(user_message: str):
             headers={'Accept': 'text/event-stream'}
         )
         
-        if response.status_code == 200:
-            session_context = ""
-            ai_response = ""
-            response_started = False
+        session_context = ""
+        ai_response = ""
+        response_started = False
+        last_event_id = None
+        reattach_attempts = 0
+        
+        while response.status_code == 200:
+            stream_finished = False
             
-            # Process SSE events using simpler line-by-line approach
-            for line in response.iter_lines(decode_unicode=True):
-                if not line:
-                    continue
+            try:
+                # Process SSE events using simpler line-by-line approach
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line:
+                        continue
+                        
+                    line = line.strip()
+                    
+                    # Skip empty lines and comments
+                    if not line or line.startswith(':'):
+                        continue
+                    
+                    # Remember the position in the stream for Last-Event-ID reattachment
+                    if line.startswith('id:'):
+                        last_event_id = line[3:].strip()
+                        continue
+                    
+                    if not line.startswith('data: '):
+                        continue
                     
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith(':'):
-                    continue
-                
-                if line.startswith('data: '):
                     data_str = line[6:]  # Remove 'data: ' prefix
                     
                     # Skip empty data lines
@@ -515,19 +540,40 @@ def send_message_stream(user_message: str):
                             
                             # Log completion
                             log_stream_complete(data['total_chunks'], data['processing_time'], data['message_count'])
+                            stream_finished = True
                             break  # Stream is complete
                             
                         elif data['type'] == 'error':
                             print(f"\n{Fore.RED}❌ Server Error: {data['message']}{Style.RESET_ALL}")
                             session_stats['failed_requests'] += 1
+                            stream_finished = True
                             break
                             
                     except json.JSONDecodeError as e:
                         print(f"{Fore.RED}❌ JSON Error: {e}{Style.RESET_ALL}")
                         print(f"   Raw line: '{line}'")
                         print(f"   Data part: '{data_str}'")
+                            
+                if stream_finished:
+                    break
+                raise requests.exceptions.ChunkedEncodingError("Stream ended before the response completed")
             
-        else:
+            except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError):
+                # Reattach to the same turn; the server replays whatever was missed after last_event_id
+                if last_event_id is None or not current_session['session_id'] or reattach_attempts >= MAX_REATTACH_ATTEMPTS:
+                    raise
+                reattach_attempts += 1
+                session_stats['reattachments'] += 1
+                print(f"\n{Fore.YELLOW}🔄 Stream interrupted, reattaching after event {last_event_id} (attempt {reattach_attempts})...{Style.RESET_ALL}")
+                time.sleep(0.5 * reattach_attempts)
+                response = http_client.get(
+                    f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/stream",
+                    stream=True,
+                    timeout=60,
+                    headers={'Accept': 'text/event-stream', 'Last-Event-ID': last_event_id}
+                )
+        
+        if response.status_code != 200:
             session_stats['failed_requests'] += 1
             print(f"\n{Fore.RED}❌ Server Error: HTTP {response.status_code}{Style.RESET_ALL}")
             if response.text:
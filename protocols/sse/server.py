@@ -1,17 +1,36 @@
 from fastapi.middleware.cors import CORSMiddleware
 from sse_starlette.sse import EventSourceResponse
 from shared.setup import initialize_genai_client
+from shared.metrics import PROMETHEUS_CONTENT_TYPE
+from shared.metrics import MetricsMiddleware
+from shared.metrics import registry
+from shared.compression import CompressionMiddleware
+from shared.compression import compression_stats
+from shared.serving import describe_http_mode
+from shared.serving import run_server
 from fastapi.responses import StreamingResponse
 from fastapi.responses import HTMLResponse 
 from shared.llm import create_chat_session
+from shared.serialization import FastJSONResponse
+from shared.serialization import EventEnvelope
+from shared.serialization import dumps
+from shared.conditional import ConditionalCache
+from shared.conditional import ResourceVersions
+from shared.conditional import VersionedStats
+from shared.session_index import SESSIONS_MAX_PAGE_SIZE
+from shared.session_index import SESSIONS_PAGE_SIZE
+from shared.session_index import SessionIndex
 from contextlib import asynccontextmanager
+from shared.events import SessionEventBus
 from shared.llm import ChatSession
 from fastapi import HTTPException
 from typing import AsyncGenerator 
 from pydantic import BaseModel
 from datetime import datetime
 from fastapi import Request
+from fastapi.responses import Response
 from fastapi import FastAPI
+from fastapi import Query
 from typing import Optional 
 from colorama import Style 
 from colorama import Fore
@@ -19,10 +38,9 @@ from colorama import Back
 from colorama import init 
 from typing import List 
 from typing import Dict 
-import uvicorn
+from collections import deque
 import asyncio
 import time
-import json
 import uuid
 import os
 
@@ -83,24 +101,48 @@ class StatsResponse(BaseModel):
     active_sessions: int
     total_sessions_created: int
     streaming_connections: int
+    replay_hits: int
+    replay_misses: int
+    buffered_events: int
+    event_subscribers: int
+    events_published: int
+    events_delivered: int
+    subscribers_dropped: int
+    compression: Dict[str, dict]
 
 
 # Configuration
 MODEL_ID = os.environ.get('GENAI_MODEL_ID', 'gemini-2.0-flash')
+SSE_REPLAY_BUFFER_SIZE = int(os.environ.get('SSE_REPLAY_BUFFER_SIZE', '512'))  # events kept per session for Last-Event-ID replay
+EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', '256'))  # events buffered per /events subscriber
+
+# Event types that end a turn's stream
+TERMINAL_EVENT_TYPES = ('complete', 'error')
+
+# Chunk events only differ in their text and position, so the rest is encoded once
+CHUNK_ENVELOPE = EventEnvelope({'type': 'chunk'}, ('text', 'chunk_number', 'is_final'))
 
 # Global variables
 chat_sessions: Dict[str, ChatSession] = {}
 session_metadata: Dict[str, dict] = {}
 active_streams: Dict[str, dict] = {}
-chat_stats = {
+session_streams: Dict[str, dict] = {}  # session_id -> ring buffer of recent events and turn counters
+turn_tasks: set = set()  # running turns; the event loop only keeps weak references to tasks
+event_bus = SessionEventBus(max_queue=EVENT_QUEUE_SIZE)  # fans turn events out to GET /sessions/{id}/events
+resource_versions = ResourceVersions()  # bumped on every session/stats mutation, backs the ETags
+conditional_cache = ConditionalCache()
+session_index = SessionIndex()  # ordered by created_at / last_activity, overall and per model
+chat_stats = VersionedStats(resource_versions, {
     'total_requests': 0,
     'successful_requests': 0,
     'failed_requests': 0,
     'total_response_time': 0,
     'total_sessions_created': 0,
     'streaming_connections': 0,
+    'replay_hits': 0,
+    'replay_misses': 0,
     'start_time': datetime.now()
-}
+})
 
 # Lifespan event handler
 @asynccontextmanager
@@ -128,6 +170,7 @@ app = FastAPI(
     title="GenAI SSE Multi-turn Chat API",
     description="Beautiful FastAPI-based SSE multi-turn chat server with real-time streaming",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -140,6 +183,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/br/zstd; streamed responses are flushed per chunk (or per COMPRESSION_FLUSH_MS window)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency, status codes and bytes (outermost, so it sees compressed sizes); served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 def print_banner():
     banner = f"""
 {Fore.CYAN}══════════════════════════════════════════════════════════════
@@ -147,6 +196,7 @@ def print_banner():
 ══════════════════════════════════════════════════════════════
   Model: {MODEL_ID:<48} 
   Framework: FastAPI + SSE{' ' * 37} 
+  HTTP: {describe_http_mode():<49} 
   Multi-turn: {Fore.GREEN}ENABLED{Fore.CYAN}{' ' * 41} 
   Streaming: {Fore.GREEN}REAL-TIME{Fore.CYAN}{' ' * 40} 
   Status: {Fore.GREEN}READY{Fore.CYAN}{' ' * 45} 
@@ -180,6 +230,8 @@ def create_new_session(model_id: str = None) -> tuple[str, ChatSession]:
             'last_activity': datetime.now()
         }
         chat_stats['total_sessions_created'] += 1
+        resource_versions.watch(session_id, chat_session)
+        session_index.add(session_id, model_id, session_metadata[session_id]['created_at'])
         
         print(f"{Fore.CYAN}INFO: Created new session {session_id} with model {model_id}{Style.RESET_ALL}")
         return session_id, chat_session
@@ -199,6 +251,8 @@ def get_or_create_session(session_id: str = None, model_id: str = None) -> tuple
     else:
         chat_session = chat_sessions[session_id]
         session_metadata[session_id]['last_activity'] = datetime.now()
+        resource_versions.bump_session(session_id)
+        session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return session_id, chat_session, is_new_session
 
@@ -255,42 +309,84 @@ def print_stats():
     print(f"{Fore.CYAN}│{Style.RESET_ALL} Active Streams: {Fore.MAGENTA}{len(active_streams)}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}│{Style.RESET_ALL} Total Sessions: {Fore.MAGENTA}{chat_stats['total_sessions_created']}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}│{Style.RESET_ALL} Avg Response Time: {Fore.YELLOW}{avg_response_time:.3f}s{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}│{Style.RESET_ALL} Replay Hits/Misses: {Fore.GREEN}{chat_stats['replay_hits']}{Style.RESET_ALL}/{Fore.RED}{chat_stats['replay_misses']}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
-async def generate_chat_stream(chat_session: ChatSession, user_message: str, session_id: str, client_ip: str) -> AsyncGenerator[str, None]:
+def get_session_stream(session_id: str) -> dict:
     """
-    Generate streaming chat response
+    Get (or create) the replay buffer that turns of a session publish their events into
     """
-    stream_id = str(uuid.uuid4())
-    start_time = time.time()
-    chunk_count = 0
-    
-    try:
-        # Track active stream
-        active_streams[stream_id] = {
+    stream = session_streams.get(session_id)
+    if stream is None:
+        stream = {
             'session_id': session_id,
-            'client_ip': client_ip,
-            'start_time': start_time
+            'events': deque(maxlen=SSE_REPLAY_BUFFER_SIZE),  # (turn, seq, event_type, data)
+            'next_turn': 1,
+            'published_turn': 0,
+            'finished_turn': 0,  # turns run in order, so every turn up to this one has ended
+            'condition': asyncio.Condition(),
+            'lock': asyncio.Lock()
         }
-        chat_stats['streaming_connections'] += 1
-        
-        # Log stream start
-        log_stream_start(session_id, client_ip, user_message)
+        session_streams[session_id] = stream
+    return stream
+
+def parse_event_id(event_id: Optional[str]) -> Optional[tuple[int, int]]:
+    """
+    Parse a '<turn>.<seq>' event id (as sent back in Last-Event-ID)
+    """
+    try:
+        turn, seq = event_id.split('.')
+        return int(turn), int(seq)
+    except (AttributeError, ValueError):
+        return None
+
+async def publish_event(stream: dict, turn: int, seq: int, data: dict, encoded: Optional[str] = None):
+    """
+    Append an event to the session's replay buffer and wake up the streams following it
+    """
+    # Encoded once for the replay buffer, the POSTing client and every /events subscriber
+    encoded = event_bus.publish(stream['session_id'], data, encoded)
+    async with stream['condition']:
+        stream['events'].append((turn, seq, data['type'], encoded))
+        stream['published_turn'] = turn
+        if data['type'] in TERMINAL_EVENT_TYPES:
+            stream['finished_turn'] = turn
+        stream['condition'].notify_all()
+
+async def run_chat_turn(chat_session: ChatSession, user_message: str, session_id: str, turn: int):
+    """
+    Generate one chat turn into the session's replay buffer, independent of any HTTP connection
+    """
+    stream = get_session_stream(session_id)
+    seq = 0
+    
+    async def publish(data: dict, encoded: Optional[str] = None):
+        nonlocal seq
+        seq += 1
+        await publish_event(stream, turn, seq, data, encoded)
+    
+    # Turns of one session run in the order they were requested
+    async with stream['lock']:
+        start_time = time.time()
+        chunk_count = 0
         
         # Send initial stream info
-        yield json.dumps({'type': 'session_info', 'session_id': session_id, 'model': chat_session.model_id})
+        await publish({'type': 'session_info', 'session_id': session_id, 'model': chat_session.model_id})
         
         # Add user message to session
         chat_session.add_message("user", user_message)
         
+        # Observers of the session also see the prompt that started the turn
+        event_bus.publish(session_id, {'type': 'user_message', 'message': user_message})
+        
         # Send status update
-        yield json.dumps({'type': 'status', 'message': 'Generating response...', 'context_messages': chat_session.get_message_count()})
+        await publish({'type': 'status', 'message': 'Generating response...', 'context_messages': chat_session.get_message_count()})
         
         # Simulate streaming by chunking the response
         # In a real implementation, you'd use the actual streaming API
         try:
             # Generate full response first (since GenAI doesn't have native streaming yet)
-            full_response = chat_session.client.models.generate_content(
+            full_response = await chat_session.client.aio.models.generate_content(
                 model=chat_session.model_id,
                 contents=chat_session.chat_history
             )
@@ -316,7 +412,7 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
                         'is_final': i == len(words) - 1
                     }
                     
-                    yield json.dumps(chunk_data)
+                    await publish(chunk_data, CHUNK_ENVELOPE.encode(chunk_data))
                     
                     # Log chunk
                     log_stream_chunk(session_id, chunk_count, current_chunk.strip())
@@ -335,7 +431,7 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
                 'session_id': session_id
             }
             
-            yield json.dumps(completion_data)
+            await publish(completion_data)
             
             # Update statistics
             chat_stats['successful_requests'] += 1
@@ -351,17 +447,66 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
                 'message': str(e),
                 'session_id': session_id
             }
-            yield json.dumps(error_data)
+            await publish(error_data)
             
             chat_stats['failed_requests'] += 1
             print(f"{Fore.RED}ERROR: Error in stream generation: {e}{Style.RESET_ALL}")
+
+async def follow_turn(session_id: str, turn: int, after_seq: int, client_ip: str) -> AsyncGenerator[dict, None]:
+    """
+    Stream one turn's events after after_seq: buffered ones first, then live ones as they are published
+    """
+    stream_id = str(uuid.uuid4())
+    stream = get_session_stream(session_id)
+    
+    try:
+        # Track active stream
+        active_streams[stream_id] = {
+            'session_id': session_id,
+            'client_ip': client_ip,
+            'start_time': time.time()
+        }
+        chat_stats['streaming_connections'] += 1
+        
+        while True:
+            async with stream['condition']:
+                # Newest events sit at the right end, so only the unsent tail is visited
+                pending = []
+                for event in reversed(stream['events']):
+                    if (event[0], event[1]) <= (turn, after_seq):
+                        break
+                    if event[0] == turn:
+                        pending.append(event)
+                pending.reverse()
+                
+                if not pending:
+                    if turn <= stream['finished_turn']:
+                        return  # the turn ended and its remaining events were sent (or evicted)
+                    await stream['condition'].wait()
+                    continue
             
+            for event_turn, seq, event_type, data in pending:
+                after_seq = seq
+                yield {'id': f'{event_turn}.{seq}', 'data': data}
+                if event_type in TERMINAL_EVENT_TYPES:
+                    return
+    
     finally:
         # Clean up stream tracking
         if stream_id in active_streams:
             del active_streams[stream_id]
         chat_stats['streaming_connections'] = max(0, chat_stats['streaming_connections'] - 1)
 
+async def replay_gap(session_id: str, last_event_id: str) -> AsyncGenerator[dict, None]:
+    """
+    Tell a reattaching client that the events it missed are no longer buffered
+    """
+    yield {'data': dumps({
+        'type': 'error',
+        'message': f'Events after {last_event_id} are no longer buffered; resend the message',
+        'session_id': session_id
+    })}
+
 @app.post("/chat/stream")
 async def chat_stream(request: ChatStreamRequest, http_request: Request):
     """
@@ -378,9 +523,20 @@ async def chat_stream(request: ChatStreamRequest, http_request: Request):
         if not user_message:
             raise HTTPException(status_code=400, detail="Message is required")
         
+        # Log stream start
+        log_stream_start(session_id, client_ip, user_message)
+        
+        # The turn runs on its own so a dropped connection can reattach with Last-Event-ID
+        stream = get_session_stream(session_id)
+        turn = stream['next_turn']
+        stream['next_turn'] += 1
+        task = asyncio.create_task(run_chat_turn(chat_session, user_message, session_id, turn))
+        turn_tasks.add(task)
+        task.add_done_callback(turn_tasks.discard)
+        
         # Return SSE stream
         return EventSourceResponse(
-            generate_chat_stream(chat_session, user_message, session_id, client_ip),
+            follow_turn(session_id, turn, 0, client_ip),
             media_type="text/plain"
         )
         
@@ -391,6 +547,70 @@ async def chat_stream(request: ChatStreamRequest, http_request: Request):
         print(f"{Fore.RED}ERROR: Error in chat stream: {e}{Style.RESET_ALL}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.get("/sessions/{session_id}/stream")
+async def reattach_stream(session_id: str, http_request: Request):
+    """
+    Reattach to a session's latest turn, replaying the events after Last-Event-ID
+    """
+    if session_id not in chat_sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    client_ip = get_client_ip(http_request)
+    stream = get_session_stream(session_id)
+    last_event_id = http_request.headers.get('Last-Event-ID') or http_request.query_params.get('last_event_id')
+    position = parse_event_id(last_event_id)
+    
+    if position is None:
+        # No position: follow the most recent turn from its first event
+        if stream['next_turn'] == 1:
+            raise HTTPException(status_code=404, detail="Session has no turns to stream")
+        turn, after_seq = stream['next_turn'] - 1, 0
+    else:
+        turn, after_seq = position
+    
+    # A hit needs the event right after Last-Event-ID (or a later turn) still in the ring buffer
+    turn_seqs = [seq for event_turn, seq, _, _ in stream['events'] if event_turn == turn]
+    if turn <= stream['finished_turn'] and turn_seqs and after_seq >= turn_seqs[-1]:
+        # The client already has the turn's terminal event: 204 tells EventSource to stop reconnecting
+        return Response(status_code=204)
+    queued = stream['published_turn'] < turn < stream['next_turn']
+    if queued or (turn_seqs and turn_seqs[0] <= after_seq + 1):
+        chat_stats['replay_hits'] += 1
+        return EventSourceResponse(follow_turn(session_id, turn, after_seq, client_ip), media_type="text/plain")
+    
+    chat_stats['replay_misses'] += 1
+    return EventSourceResponse(replay_gap(session_id, last_event_id), media_type="text/plain")
+
+async def stream_session_events(subscription, session_id: str) -> AsyncGenerator[dict, None]:
+    """
+    Relay a session's published events to one observer
+    """
+    try:
+        yield {'data': dumps({'type': 'subscribed', 'session_id': session_id})}
+        
+        async for encoded in subscription:
+            yield {'data': encoded}
+        
+        if subscription.dropped:
+            yield {'data': dumps({
+                'type': 'subscriber_dropped',
+                'message': 'Fell too far behind the session; subscribe again to continue',
+                'session_id': session_id
+            })}
+    finally:
+        subscription.close()
+
+@app.get("/sessions/{session_id}/events")
+async def session_events(session_id: str):
+    """
+    Watch every turn of a session as it streams (for dashboards and second devices)
+    """
+    if session_id not in chat_sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    subscription = event_bus.subscribe(session_id)
+    return EventSourceResponse(stream_session_events(subscription, session_id))
+
 @app.post("/sessions/new", response_model=NewSessionResponse)
 async def create_session(request: NewSessionRequest):
     """
@@ -410,26 +630,29 @@ async def create_session(request: NewSessionRequest):
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 @app.get("/sessions/{session_id}", response_model=SessionInfoResponse)
-async def get_session_info(session_id: str):
+async def get_session_info(session_id: str, request: Request):
     """
     Get information about a specific session
     """
     if session_id not in chat_sessions:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    chat_session = chat_sessions[session_id]
-    metadata = session_metadata[session_id]
-    summary = chat_session.get_conversation_summary()
+    def build():
+        chat_session = chat_sessions[session_id]
+        metadata = session_metadata[session_id]
+        summary = chat_session.get_conversation_summary()
+        
+        return SessionInfoResponse(
+            session_id=session_id,
+            model=summary['model_id'],
+            message_count=summary['total_messages'],
+            session_duration_seconds=summary['session_duration_seconds'],
+            user_messages=summary['user_messages'],
+            model_messages=summary['model_messages'],
+            created_at=metadata['created_at'].isoformat()
+        )
     
-    return SessionInfoResponse(
-        session_id=session_id,
-        model=summary['model_id'],
-        message_count=summary['total_messages'],
-        session_duration_seconds=summary['session_duration_seconds'],
-        user_messages=summary['user_messages'],
-        model_messages=summary['model_messages'],
-        created_at=metadata['created_at'].isoformat()
-    )
+    return conditional_cache.respond(request, f'session:{session_id}', resource_versions.session_version(session_id), build)
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
@@ -441,6 +664,11 @@ async def delete_session(session_id: str):
     
     del chat_sessions[session_id]
     del session_metadata[session_id]
+    resource_versions.remove_session(session_id)
+    session_index.remove(session_id)
+    conditional_cache.forget(f'session:{session_id}')
+    session_streams.pop(session_id, None)
+    event_bus.close_session(session_id)
     
     return {"message": f"Session {session_id} deleted successfully"}
 
@@ -454,29 +682,45 @@ async def clear_session(session_id: str):
     
     chat_sessions[session_id].clear_history()
     session_metadata[session_id]['last_activity'] = datetime.now()
+    resource_versions.bump_session(session_id)
+    session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return {"message": f"Session {session_id} history cleared successfully"}
 
 @app.get("/sessions")
-async def list_sessions():
+async def list_sessions(request: Request,
+                        limit: int = Query(SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE),
+                        cursor: Optional[str] = None,
+                        model: Optional[str] = None,
+                        sort: str = Query('created_at', pattern='^(created_at|last_activity)$'),
+                        order: str = Query('asc', pattern='^(asc|desc)$')):
     """
-    List all active sessions
+    List active sessions one page at a time, optionally filtered by model
     """
-    sessions = []
-    for session_id, metadata in session_metadata.items():
-        chat_session = chat_sessions[session_id]
-        summary = chat_session.get_conversation_summary()
+    def build():
+        try:
+            session_ids, next_cursor, total = session_index.page(sort, order, model, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        sessions.append({
-            "session_id": session_id,
-            "model": summary['model_id'],
-            "message_count": summary['total_messages'],
-            "duration_minutes": summary['session_duration_minutes'],
-            "created_at": metadata['created_at'].isoformat(),
-            "last_activity": metadata['last_activity'].isoformat()
-        })
+        sessions = []
+        for session_id in session_ids:
+            chat_session = chat_sessions[session_id]
+            metadata = session_metadata[session_id]
+            summary = chat_session.get_conversation_summary()
+            
+            sessions.append({
+                "session_id": session_id,
+                "model": summary['model_id'],
+                "message_count": summary['total_messages'],
+                "duration_minutes": summary['session_duration_minutes'],
+                "created_at": metadata['created_at'].isoformat(),
+                "last_activity": metadata['last_activity'].isoformat()
+            })
+        
+        return {"active_sessions": total, "sessions": sessions, "next_cursor": next_cursor}
     
-    return {"active_sessions": len(sessions), "sessions": sessions}
+    return conditional_cache.respond(request, f'sessions?{request.url.query}', resource_versions.sessions_version, build)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check(request: Request):
@@ -496,38 +740,59 @@ async def health_check(request: Request):
     print(f"{Fore.BLUE}│{Style.RESET_ALL} Active Streams: {Fore.MAGENTA}{len(active_streams)}{Style.RESET_ALL}")
     print(f"{Fore.BLUE}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
     
-    return HealthResponse(
-        status='healthy',
-        model=MODEL_ID,
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        active_sessions=len(chat_sessions),
-        streaming_connections=len(active_streams)
-    )
+    def build():
+        return HealthResponse(
+            status='healthy',
+            model=MODEL_ID,
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            active_sessions=len(chat_sessions),
+            streaming_connections=len(active_streams)
+        )
+    
+    return conditional_cache.respond(request, 'health', resource_versions.stats_version, build)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Request metrics in the Prometheus text format
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.get("/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request):
     """
     Detailed statistics endpoint
     """
-    uptime = datetime.now() - chat_stats['start_time']
-    avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
-                        if chat_stats['successful_requests'] > 0 else 0)
+    def build():
+        uptime = datetime.now() - chat_stats['start_time']
+        avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
+                            if chat_stats['successful_requests'] > 0 else 0)
+        
+        return StatsResponse(
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            average_response_time=round(avg_response_time, 3),
+            model=MODEL_ID,
+            start_time=chat_stats['start_time'].isoformat(),
+            active_sessions=len(chat_sessions),
+            total_sessions_created=chat_stats['total_sessions_created'],
+            streaming_connections=len(active_streams),
+            replay_hits=chat_stats['replay_hits'],
+            replay_misses=chat_stats['replay_misses'],
+            buffered_events=sum(len(stream['events']) for stream in session_streams.values()),
+            event_subscribers=event_bus.subscriber_count(),
+            events_published=event_bus.stats['events_published'],
+            events_delivered=event_bus.stats['events_delivered'],
+            subscribers_dropped=event_bus.stats['subscribers_dropped'],
+            compression=compression_stats.summary()
+        )
     
-    return StatsResponse(
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        average_response_time=round(avg_response_time, 3),
-        model=MODEL_ID,
-        start_time=chat_stats['start_time'].isoformat(),
-        active_sessions=len(chat_sessions),
-        total_sessions_created=chat_stats['total_sessions_created'],
-        streaming_connections=len(active_streams)
-    )
+    return conditional_cache.respond(request, 'stats', resource_versions.stats_version, build)
 
 @app.get("/demo", response_class=HTMLResponse)
 async def demo_page():
@@ -693,6 +958,8 @@ async def root():
         "features": ["multi-turn conversations", "real-time streaming", "session management"],
         "endpoints": {
             "chat_stream": "POST /chat/stream",
+            "reattach_stream": "GET /sessions/{session_id}/stream (Last-Event-ID)",
+            "session_events": "GET /sessions/{session_id}/events",
             "new_session": "POST /sessions/new",
             "session_info": "GET /sessions/{session_id}",
             "delete_session": "DELETE /sessions/{session_id}",
@@ -708,7 +975,7 @@ async def root():
 
 if __name__ == '__main__':
     try:
-        uvicorn.run(
+        run_server(
             app, 
             host='0.0.0.0', 
             port=8000, 
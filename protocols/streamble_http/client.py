@@ -1,3 +1,4 @@
+from shared.http_client import create_http_client
 from datetime import timedelta 
 from datetime import datetime
 from typing import Optional
@@ -23,6 +24,9 @@ STATS_ENDPOINT = f'{SERVER_URL}/stats'
 DOCS_ENDPOINT = f'{SERVER_URL}/docs'
 DEMO_ENDPOINT = f'{SERVER_URL}/demo'
 
+# Shared connection-reusing client; HTTP_VERSION=2 multiplexes requests over one HTTP/2 connection
+http_client = create_http_client()
+
 # Session statistics
 session_stats = {
     'messages_sent': 0,
@@ -58,6 +62,7 @@ def print_banner():
 ══════════════════════════════════════════════════════════════
   Server: {SERVER_URL:<47} 
   Framework: FastAPI + HTTP Streaming{' ' * 27} 
+  HTTP: {http_client.http_version:<49} 
   Multi-turn: {Fore.GREEN}ENABLED{Fore.MAGENTA}{' ' * 39} 
   Streaming: {Fore.GREEN}CHUNKED HTTP{Fore.MAGENTA}{' ' * 34} 
   Status: {Fore.GREEN}CONNECTING...{Fore.MAGENTA}{' ' * 39} 
@@ -73,7 +78,7 @@ def check_server_health():
         print(f"{Fore.YELLOW}🔍 Checking FastAPI HTTP streaming server health...{Style.RESET_ALL}")
         
         start_time = time.time()
-        response = requests.get(HEALTH_ENDPOINT, timeout=5)
+        response = http_client.get(HEALTH_ENDPOINT, timeout=5)
         ping_time = time.time() - start_time
         
         if response.status_code == 200:
@@ -108,7 +113,7 @@ def create_new_session(model_id=None):
         if model_id:
             payload['model_id'] = model_id
             
-        response = requests.post(NEW_SESSION_ENDPOINT, json=payload, timeout=10)
+        response = http_client.post(NEW_SESSION_ENDPOINT, json=payload, timeout=10)
         
         if response.status_code == 200:
             session_data = response.json()
@@ -143,7 +148,7 @@ def get_session_info(session_id=None):
             print(f"{Fore.RED}❌ No active session{Style.RESET_ALL}")
             return False
             
-        response = requests.get(f"{SESSION_INFO_ENDPOINT}/{session_id}", timeout=5)
+        response = http_client.get(f"{SESSION_INFO_ENDPOINT}/{session_id}", timeout=5)
         
         if response.status_code == 200:
             info = response.json()
@@ -172,7 +177,7 @@ def list_all_sessions():
     List all active sessions on the server
     """
     try:
-        response = requests.get(SESSION_INFO_ENDPOINT, timeout=5)
+        response = http_client.get(SESSION_INFO_ENDPOINT, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -191,6 +196,9 @@ def list_all_sessions():
                     
                     print(f"{Fore.CYAN}│{Style.RESET_ALL} {i}. {session['session_id'][:8]}... ({session['message_count']} msgs, {str(duration).split('.')[0]}, {created_time}){Fore.GREEN}{marker}{Style.RESET_ALL}")
             
+            if data.get('next_cursor'):
+                print(f"{Fore.CYAN}│{Style.RESET_ALL} ... {data['active_sessions'] - len(sessions)} more (first page only)")
+            
             print(f"{Fore.CYAN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
             return True
         else:
@@ -210,7 +218,7 @@ def clear_session_history():
             print(f"{Fore.RED}❌ No active session to clear{Style.RESET_ALL}")
             return False
             
-        response = requests.post(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/clear", timeout=5)
+        response = http_client.post(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}/clear", timeout=5)
         
         if response.status_code == 200:
             current_session['message_count'] = 0
@@ -233,7 +241,7 @@ def delete_current_session():
             print(f"{Fore.RED}❌ No active session to delete{Style.RESET_ALL}")
             return False
             
-        response = requests.delete(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}", timeout=5)
+        response = http_client.delete(f"{SESSION_INFO_ENDPOINT}/{current_session['session_id']}", timeout=5)
         
         if response.status_code == 200:
             print(f"{Fore.GREEN}✅ Session deleted successfully{Style.RESET_ALL}")
@@ -359,7 +367,7 @@ def get_server_stats():
     Get and display server statistics
     """
     try:
-        response = requests.get(STATS_ENDPOINT, timeout=5)
+        response = http_client.get(STATS_ENDPOINT, timeout=5)
         if response.status_code == 200:
             stats = response.json()
             uptime_str = str(timedelta(seconds=stats['uptime_seconds']))
@@ -438,7 +446,7 @@ def send_message_stream(user_message: str):
     
     try:
         # Send POST request for HTTP stream
-        response = requests.post(
+        response = http_client.post(
             CHAT_STREAM_ENDPOINT, 
             json=payload, 
             stream=True,
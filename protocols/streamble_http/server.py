@@ -1,16 +1,36 @@
 from fastapi.middleware.cors import CORSMiddleware
 from shared.setup import initialize_genai_client
+from shared.metrics import PROMETHEUS_CONTENT_TYPE
+from shared.metrics import MetricsMiddleware
+from shared.metrics import registry
+from shared.compression import CompressionMiddleware
+from shared.compression import compression_stats
+from shared.serving import describe_http_mode
+from shared.serving import run_server
 from fastapi.responses import StreamingResponse
 from fastapi.responses import HTMLResponse 
 from shared.llm import create_chat_session
+from shared.serialization import FastJSONResponse
+from shared.serialization import dumps
+from shared.serialization import EventEnvelope
+from shared.serialization import timestamps
+from shared.conditional import ConditionalCache
+from shared.conditional import ResourceVersions
+from shared.conditional import VersionedStats
+from shared.session_index import SESSIONS_MAX_PAGE_SIZE
+from shared.session_index import SESSIONS_PAGE_SIZE
+from shared.session_index import SessionIndex
 from contextlib import asynccontextmanager
+from shared.events import SessionEventBus
 from shared.llm import ChatSession
 from fastapi import HTTPException
 from typing import AsyncGenerator
 from pydantic import BaseModel
 from datetime import datetime
 from fastapi import Request
+from fastapi.responses import Response
 from fastapi import FastAPI
+from fastapi import Query
 from typing import Optional 
 from colorama import Style
 from colorama import Fore
@@ -19,9 +39,7 @@ from colorama import init
 from typing import List 
 from typing import Dict
 import asyncio
-import uvicorn
 import uuid
-import json
 import time
 import os
 
@@ -82,15 +100,28 @@ class StatsResponse(BaseModel):
     active_sessions: int
     total_sessions_created: int
     streaming_connections: int
+    event_subscribers: int
+    events_published: int
+    events_delivered: int
+    subscribers_dropped: int
+    compression: Dict[str, dict]
 
 # Configuration
 MODEL_ID = os.environ.get('GENAI_MODEL_ID', 'gemini-2.0-flash')
+EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', '256'))  # events buffered per /events subscriber
+
+# Chunk events only differ in their text, position and time, so the rest is encoded once
+CHUNK_ENVELOPE = EventEnvelope({'type': 'chunk'}, ('text', 'chunk_number', 'is_final', 'timestamp'))
 
 # Global variables
 chat_sessions: Dict[str, ChatSession] = {}
 session_metadata: Dict[str, dict] = {}
 active_streams: Dict[str, dict] = {}
-chat_stats = {
+event_bus = SessionEventBus(max_queue=EVENT_QUEUE_SIZE)  # fans turn events out to GET /sessions/{id}/events
+resource_versions = ResourceVersions()  # bumped on every session/stats mutation, backs the ETags
+conditional_cache = ConditionalCache()
+session_index = SessionIndex()  # ordered by created_at / last_activity, overall and per model
+chat_stats = VersionedStats(resource_versions, {
     'total_requests': 0,
     'successful_requests': 0,
     'failed_requests': 0,
@@ -98,7 +129,7 @@ chat_stats = {
     'total_sessions_created': 0,
     'streaming_connections': 0,
     'start_time': datetime.now()
-}
+})
 
 # Lifespan event handler
 @asynccontextmanager
@@ -126,6 +157,7 @@ app = FastAPI(
     title="Streamable HTTP Multi-turn Chat API",
     description="FastAPI-based streamable HTTP multi-turn chat server with chunked streaming",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -138,6 +170,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated gzip/br/zstd; streamed responses are flushed per chunk (or per COMPRESSION_FLUSH_MS window)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency, status codes and bytes (outermost, so it sees compressed sizes); served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 def print_banner():
     banner = f"""
 {Fore.CYAN}╔══════════════════════════════════════════════════════════════╗
@@ -145,6 +183,7 @@ def print_banner():
 ╠══════════════════════════════════════════════════════════════╣
 ║  Model: {MODEL_ID:<48} ║
 ║  Framework: FastAPI + HTTP Streaming{' ' * 27} ║
+║  HTTP: {describe_http_mode():<49} ║
 ║  Multi-turn: {Fore.GREEN}ENABLED{Fore.CYAN}{' ' * 41} ║
 ║  Streaming: {Fore.GREEN}CHUNKED HTTP{Fore.CYAN}{' ' * 36} ║
 ║  Status: {Fore.GREEN}READY{Fore.CYAN}{' ' * 45} ║
@@ -178,6 +217,8 @@ def create_new_session(model_id: str = None) -> tuple[str, ChatSession]:
             'last_activity': datetime.now()
         }
         chat_stats['total_sessions_created'] += 1
+        resource_versions.watch(session_id, chat_session)
+        session_index.add(session_id, model_id, session_metadata[session_id]['created_at'])
         
         print(f"{Fore.CYAN}INFO: Created new session {session_id} with model {model_id}{Style.RESET_ALL}")
         return session_id, chat_session
@@ -197,6 +238,8 @@ def get_or_create_session(session_id: str = None, model_id: str = None) -> tuple
     else:
         chat_session = chat_sessions[session_id]
         session_metadata[session_id]['last_activity'] = datetime.now()
+        resource_versions.bump_session(session_id)
+        session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return session_id, chat_session, is_new_session
 
@@ -277,18 +320,25 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
         log_stream_start(session_id, client_ip, user_message)
         
         # Send initial stream info as JSON chunk
-        yield json.dumps({
+        yield event_bus.publish(session_id, {
             'type': 'session_info', 
             'session_id': session_id, 
             'model': chat_session.model_id,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamps.now()
         }) + '\n'
         
         # Add user message to session
         chat_session.add_message("user", user_message)
         
+        # Observers of the session also see the prompt that started the turn
+        event_bus.publish(session_id, {
+            'type': 'user_message',
+            'message': user_message,
+            'timestamp': timestamps.now()
+        })
+        
         # Send status update as JSON chunk
-        yield json.dumps({
+        yield event_bus.publish(session_id, {
             'type': 'status', 
             'message': 'Generating response...', 
             'context_messages': chat_session.get_message_count()
@@ -321,10 +371,10 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
                         'text': current_chunk.strip(),
                         'chunk_number': chunk_count,
                         'is_final': i == len(words) - 1,
-                        'timestamp': datetime.now().isoformat()
+                        'timestamp': timestamps.now()
                     }
                     
-                    yield json.dumps(chunk_data) + '\n'
+                    yield event_bus.publish(session_id, chunk_data, CHUNK_ENVELOPE.encode(chunk_data)) + '\n'
                     
                     # Log chunk
                     log_stream_chunk(session_id, chunk_count, current_chunk.strip())
@@ -341,10 +391,10 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
                 'processing_time': round(total_time, 3),
                 'message_count': chat_session.get_message_count(),
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamps.now()
             }
             
-            yield json.dumps(completion_data) + '\n'
+            yield event_bus.publish(session_id, completion_data) + '\n'
             
             # Update statistics
             chat_stats['successful_requests'] += 1
@@ -359,9 +409,9 @@ async def generate_chat_stream(chat_session: ChatSession, user_message: str, ses
                 'type': 'error',
                 'message': str(e),
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamps.now()
             }
-            yield json.dumps(error_data) + '\n'
+            yield event_bus.publish(session_id, error_data) + '\n'
             
             chat_stats['failed_requests'] += 1
             print(f"{Fore.RED}ERROR: Error in stream generation: {e}{Style.RESET_ALL}")
@@ -406,6 +456,48 @@ async def chat_stream(request: ChatStreamRequest, http_request: Request):
         print(f"{Fore.RED}ERROR: Error in chat stream: {e}{Style.RESET_ALL}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def stream_session_events(subscription, session_id: str) -> AsyncGenerator[str, None]:
+    """
+    Relay a session's published events to one observer as NDJSON
+    """
+    try:
+        yield dumps({
+            'type': 'subscribed',
+            'session_id': session_id,
+            'timestamp': timestamps.now()
+        }) + '\n'
+        
+        async for encoded in subscription:
+            yield encoded + '\n'
+        
+        if subscription.dropped:
+            yield dumps({
+                'type': 'subscriber_dropped',
+                'message': 'Fell too far behind the session; subscribe again to continue',
+                'session_id': session_id,
+                'timestamp': timestamps.now()
+            }) + '\n'
+    finally:
+        subscription.close()
+
+@app.get("/sessions/{session_id}/events")
+async def session_events(session_id: str):
+    """
+    Watch every turn of a session as it streams (for dashboards and second devices)
+    """
+    if session_id not in chat_sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    subscription = event_bus.subscribe(session_id)
+    return StreamingResponse(
+        stream_session_events(subscription, session_id),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive"
+        }
+    )
+
 @app.post("/sessions/new", response_model=NewSessionResponse)
 async def create_session(request: NewSessionRequest):
     """
@@ -425,26 +517,29 @@ async def create_session(request: NewSessionRequest):
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 @app.get("/sessions/{session_id}", response_model=SessionInfoResponse)
-async def get_session_info(session_id: str):
+async def get_session_info(session_id: str, request: Request):
     """
     Get information about a specific session
     """
     if session_id not in chat_sessions:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    chat_session = chat_sessions[session_id]
-    metadata = session_metadata[session_id]
-    summary = chat_session.get_conversation_summary()
+    def build():
+        chat_session = chat_sessions[session_id]
+        metadata = session_metadata[session_id]
+        summary = chat_session.get_conversation_summary()
+        
+        return SessionInfoResponse(
+            session_id=session_id,
+            model=summary['model_id'],
+            message_count=summary['total_messages'],
+            session_duration_seconds=summary['session_duration_seconds'],
+            user_messages=summary['user_messages'],
+            model_messages=summary['model_messages'],
+            created_at=metadata['created_at'].isoformat()
+        )
     
-    return SessionInfoResponse(
-        session_id=session_id,
-        model=summary['model_id'],
-        message_count=summary['total_messages'],
-        session_duration_seconds=summary['session_duration_seconds'],
-        user_messages=summary['user_messages'],
-        model_messages=summary['model_messages'],
-        created_at=metadata['created_at'].isoformat()
-    )
+    return conditional_cache.respond(request, f'session:{session_id}', resource_versions.session_version(session_id), build)
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
@@ -456,6 +551,10 @@ async def delete_session(session_id: str):
     
     del chat_sessions[session_id]
     del session_metadata[session_id]
+    resource_versions.remove_session(session_id)
+    session_index.remove(session_id)
+    conditional_cache.forget(f'session:{session_id}')
+    event_bus.close_session(session_id)
     
     return {"message": f"Session {session_id} deleted successfully"}
 
@@ -469,29 +568,45 @@ async def clear_session(session_id: str):
     
     chat_sessions[session_id].clear_history()
     session_metadata[session_id]['last_activity'] = datetime.now()
+    resource_versions.bump_session(session_id)
+    session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return {"message": f"Session {session_id} history cleared successfully"}
 
 @app.get("/sessions")
-async def list_sessions():
+async def list_sessions(request: Request,
+                        limit: int = Query(SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE),
+                        cursor: Optional[str] = None,
+                        model: Optional[str] = None,
+                        sort: str = Query('created_at', pattern='^(created_at|last_activity)$'),
+                        order: str = Query('asc', pattern='^(asc|desc)$')):
     """
-    List all active sessions
+    List active sessions one page at a time, optionally filtered by model
     """
-    sessions = []
-    for session_id, metadata in session_metadata.items():
-        chat_session = chat_sessions[session_id]
-        summary = chat_session.get_conversation_summary()
+    def build():
+        try:
+            session_ids, next_cursor, total = session_index.page(sort, order, model, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        sessions.append({
-            "session_id": session_id,
-            "model": summary['model_id'],
-            "message_count": summary['total_messages'],
-            "duration_minutes": summary['session_duration_minutes'],
-            "created_at": metadata['created_at'].isoformat(),
-            "last_activity": metadata['last_activity'].isoformat()
-        })
+        sessions = []
+        for session_id in session_ids:
+            chat_session = chat_sessions[session_id]
+            metadata = session_metadata[session_id]
+            summary = chat_session.get_conversation_summary()
+            
+            sessions.append({
+                "session_id": session_id,
+                "model": summary['model_id'],
+                "message_count": summary['total_messages'],
+                "duration_minutes": summary['session_duration_minutes'],
+                "created_at": metadata['created_at'].isoformat(),
+                "last_activity": metadata['last_activity'].isoformat()
+            })
+        
+        return {"active_sessions": total, "sessions": sessions, "next_cursor": next_cursor}
     
-    return {"active_sessions": len(sessions), "sessions": sessions}
+    return conditional_cache.respond(request, f'sessions?{request.url.query}', resource_versions.sessions_version, build)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check(request: Request):
@@ -511,38 +626,56 @@ async def health_check(request: Request):
     print(f"{Fore.BLUE}│{Style.RESET_ALL} Active Streams: {Fore.MAGENTA}{len(active_streams)}{Style.RESET_ALL}")
     print(f"{Fore.BLUE}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
     
-    return HealthResponse(
-        status='healthy',
-        model=MODEL_ID,
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        active_sessions=len(chat_sessions),
-        streaming_connections=len(active_streams)
-    )
+    def build():
+        return HealthResponse(
+            status='healthy',
+            model=MODEL_ID,
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            active_sessions=len(chat_sessions),
+            streaming_connections=len(active_streams)
+        )
+    
+    return conditional_cache.respond(request, 'health', resource_versions.stats_version, build)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Request metrics in the Prometheus text format
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.get("/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request):
     """
     Detailed statistics endpoint
     """
-    uptime = datetime.now() - chat_stats['start_time']
-    avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
-                        if chat_stats['successful_requests'] > 0 else 0)
+    def build():
+        uptime = datetime.now() - chat_stats['start_time']
+        avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
+                            if chat_stats['successful_requests'] > 0 else 0)
+        
+        return StatsResponse(
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            average_response_time=round(avg_response_time, 3),
+            model=MODEL_ID,
+            start_time=chat_stats['start_time'].isoformat(),
+            active_sessions=len(chat_sessions),
+            total_sessions_created=chat_stats['total_sessions_created'],
+            streaming_connections=len(active_streams),
+            event_subscribers=event_bus.subscriber_count(),
+            events_published=event_bus.stats['events_published'],
+            events_delivered=event_bus.stats['events_delivered'],
+            subscribers_dropped=event_bus.stats['subscribers_dropped'],
+            compression=compression_stats.summary()
+        )
     
-    return StatsResponse(
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        average_response_time=round(avg_response_time, 3),
-        model=MODEL_ID,
-        start_time=chat_stats['start_time'].isoformat(),
-        active_sessions=len(chat_sessions),
-        total_sessions_created=chat_stats['total_sessions_created'],
-        streaming_connections=len(active_streams)
-    )
+    return conditional_cache.respond(request, 'stats', resource_versions.stats_version, build)
 
 @app.get("/demo", response_class=HTMLResponse)
 async def demo_page():
@@ -701,6 +834,7 @@ async def root():
         "features": ["multi-turn conversations", "chunked HTTP streaming", "session management"],
         "endpoints": {
             "chat_stream": "POST /chat/stream",
+            "session_events": "GET /sessions/{session_id}/events",
             "new_session": "POST /sessions/new",
             "session_info": "GET /sessions/{session_id}",
             "delete_session": "DELETE /sessions/{session_id}",
@@ -716,7 +850,7 @@ async def root():
 
 if __name__ == '__main__':
     try:
-        uvicorn.run(
+        run_server(
             app, 
             host='0.0.0.0', 
             port=8000, 
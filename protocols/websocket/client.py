@@ -1,3 +1,7 @@
+from shared.codec import get_codec_for_subprotocol
+from shared.codec import FrameDecodeError
+from shared.codec import payload_size
+from shared.codec import get_codec
 from datetime import timedelta
 from datetime import datetime
 from typing import Optional
@@ -10,7 +14,6 @@ import threading
 import requests
 import asyncio
 import signal
-import json
 import time
 import sys
 import os
@@ -30,6 +33,10 @@ STATS_ENDPOINT = f'{HTTP_BASE_URL}/stats'
 DOCS_ENDPOINT = f'{HTTP_BASE_URL}/docs'
 DEMO_ENDPOINT = f'{HTTP_BASE_URL}/demo'
 
+# Frame encoding offered in the handshake ('json' or 'msgpack') and transport compression ('deflate' or 'none')
+WS_ENCODING = os.environ.get('WS_ENCODING', 'json')
+WS_COMPRESSION = os.environ.get('WS_COMPRESSION', 'deflate')
+
 # Session statistics
 session_stats = {
     'messages_sent': 0,
@@ -41,7 +48,13 @@ session_stats = {
     'total_chunks_received': 0,
     'total_streams': 0,
     'connection_attempts': 0,
-    'reconnections': 0
+    'reconnections': 0,
+    'cancelled_requests': 0,
+    'resumed_streams': 0,
+    'bytes_sent': 0,
+    'bytes_received': 0,
+    'frames_sent': 0,
+    'frames_received': 0
 }
 
 # Current session state
@@ -64,7 +77,13 @@ websocket_state = {
     'event_loop': None,
     'handler_task': None,
     'should_stop': False,
-    'waiting_for_input': False  # Add this flag
+    'waiting_for_input': False,  # Add this flag
+    'encoding': WS_ENCODING,
+    'codec': None,
+    'compression': None,
+    'next_request_id': 0,
+    'pending_turns': [],  # request_ids of chat turns still in flight, oldest first
+    'resume_turn': None  # {'turn_id', 'last_chunk_number'} of the response being streamed
 }
 
 # Global lock for print operations
@@ -134,6 +153,8 @@ def print_websocket_connect():
     safe_print(f"  Protocol: WebSocket")
     safe_print(f"  Connection: {Fore.CYAN}{current_session['connection_id'][:8] if current_session['connection_id'] else 'Unknown'}...{Style.RESET_ALL}")
     safe_print(f"  Bidirectional: {Fore.GREEN}ENABLED{Style.RESET_ALL}")
+    safe_print(f"  Encoding: {Fore.CYAN}{websocket_state['codec'].name if websocket_state['codec'] else 'json'}{Style.RESET_ALL}")
+    safe_print(f"  Compression: {Fore.CYAN}{websocket_state['compression'] or 'none'}{Style.RESET_ALL}")
     safe_print(f"{Fore.GREEN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
 def print_websocket_disconnect(reason: str = "Normal"):
@@ -192,12 +213,17 @@ def print_session_stats():
     print(f"  Messages Sent: {Fore.YELLOW}{session_stats['messages_sent']}{Style.RESET_ALL}")
     print(f"  Successful Streams: {Fore.GREEN}{session_stats['successful_requests']}{Style.RESET_ALL}")
     print(f"  Failed Streams: {Fore.RED}{session_stats['failed_requests']}{Style.RESET_ALL}")
+    print(f"  Cancelled Streams: {Fore.YELLOW}{session_stats['cancelled_requests']}{Style.RESET_ALL}")
+    print(f"  Resumed Streams: {Fore.YELLOW}{session_stats['resumed_streams']}{Style.RESET_ALL}")
     print(f"  Total Chunks Received: {Fore.CYAN}{session_stats['total_chunks_received']}{Style.RESET_ALL}")
     print(f"  Avg Chunks per Stream: {Fore.CYAN}{avg_chunks:.1f}{Style.RESET_ALL}")
     print(f"  Connection Attempts: {Fore.YELLOW}{session_stats['connection_attempts']}{Style.RESET_ALL}")
     print(f"  Reconnections: {Fore.YELLOW}{session_stats['reconnections']}{Style.RESET_ALL}")
     print(f"  Sessions Created: {Fore.CYAN}{session_stats['sessions_created']}{Style.RESET_ALL}")
     print(f"  Avg Response Time: {Fore.YELLOW}{avg_response_time:.3f}s{Style.RESET_ALL}")
+    print(f"  Bytes Received: {Fore.CYAN}{session_stats['bytes_received']}{Style.RESET_ALL} ({session_stats['frames_received']} frames)")
+    print(f"  Bytes Sent: {Fore.CYAN}{session_stats['bytes_sent']}{Style.RESET_ALL} ({session_stats['frames_sent']} frames)")
+    print(f"  Encoding: {Fore.CYAN}{websocket_state['encoding']}{Style.RESET_ALL}")
     
     connection_status = f"{Fore.GREEN}Connected{Style.RESET_ALL}" if websocket_state['is_connected'] else f"{Fore.RED}Disconnected{Style.RESET_ALL}"
     print(f"  WebSocket Status: {connection_status}")
@@ -228,6 +254,8 @@ def print_help():
     print(f"{Fore.CYAN}  /connect{Style.RESET_ALL}  - Connect to WebSocket server")
     print(f"{Fore.CYAN}  /disconnect{Style.RESET_ALL} - Disconnect from WebSocket server")
     print(f"{Fore.CYAN}  /ping{Style.RESET_ALL}     - Send ping to server")
+    print(f"{Fore.CYAN}  /cancel{Style.RESET_ALL}   - Cancel the latest in-flight response (or /cancel <request_id>)")
+    print(f"{Fore.CYAN}  /encoding{Style.RESET_ALL} - Show or switch frame encoding (json, msgpack)")
     print()
     print(f"{Fore.YELLOW}🔄 Session Management:{Style.RESET_ALL}")
     print(f"{Fore.CYAN}  /new{Style.RESET_ALL}      - Create a new chat session")
@@ -249,10 +277,15 @@ def get_server_stats():
             print(f"  Total Requests: {Fore.YELLOW}{stats['total_requests']}{Style.RESET_ALL}")
             print(f"  Successful: {Fore.GREEN}{stats['successful_requests']}{Style.RESET_ALL}")
             print(f"  Failed: {Fore.RED}{stats['failed_requests']}{Style.RESET_ALL}")
+            print(f"  Cancelled: {Fore.YELLOW}{stats.get('cancelled_requests', 0)}{Style.RESET_ALL}")
             print(f"  Active Sessions: {Fore.MAGENTA}{stats['active_sessions']}{Style.RESET_ALL}")
             print(f"  WebSocket Connections: {Fore.MAGENTA}{stats['websocket_connections']}{Style.RESET_ALL}")
             print(f"  Total Sessions Created: {Fore.MAGENTA}{stats['total_sessions_created']}{Style.RESET_ALL}")
             print(f"  Avg Response Time: {Fore.YELLOW}{stats['average_response_time']:.3f}s{Style.RESET_ALL}")
+            print(f"  Bytes Sent: {Fore.YELLOW}{stats.get('bytes_sent', 0)}{Style.RESET_ALL} ({stats.get('frames_sent', 0)} frames)")
+            print(f"  Bytes Received: {Fore.YELLOW}{stats.get('bytes_received', 0)}{Style.RESET_ALL} ({stats.get('frames_received', 0)} frames)")
+            for name, counters in stats.get('encodings', {}).items():
+                print(f"    {name}: {counters['connections']} connections, {counters['bytes_sent']} bytes out, {counters['bytes_received']} bytes in")
             print(f"  Model: {Fore.MAGENTA}{stats['model']}{Style.RESET_ALL}")
             print(f"  Framework: {Fore.MAGENTA}FastAPI + WebSockets{Style.RESET_ALL}")
             print(f"{Fore.CYAN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
@@ -319,6 +352,9 @@ def list_all_sessions():
                     
                     print(f"  {i}. {session['session_id'][:8]}... ({session['message_count']} msgs, {clients} clients, {str(duration).split('.')[0]}, {created_time}){Fore.GREEN}{marker}{Style.RESET_ALL}")
             
+            if data.get('next_cursor'):
+                print(f"  ... {data['active_sessions'] - len(sessions)} more (first page only)")
+            
             print(f"{Fore.CYAN}└──────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
             return True
         else:
@@ -368,6 +404,15 @@ def show_input_prompt():
     with print_lock:
         print(f'\n{Fore.CYAN}You{session_indicator}{connection_indicator}{Style.RESET_ALL} {Fore.WHITE}›{Style.RESET_ALL} ', end='', flush=True)
 
+async def send_from_loop(websocket, message: dict):
+    """
+    Send a message from inside the WebSocket event loop (protocol replies such as pong or resume)
+    """
+    payload = websocket_state['codec'].encode({**message, 'timestamp': datetime.now().isoformat()})
+    await websocket.send(payload)
+    session_stats['bytes_sent'] += payload_size(payload)
+    session_stats['frames_sent'] += 1
+
 async def websocket_handler():
     """
     Handle WebSocket connection and messages
@@ -376,8 +421,15 @@ async def websocket_handler():
     
     while not websocket_state['should_stop']:
         try:
-            async with websockets.connect(WEBSOCKET_URL) as websocket:
+            requested_codec = get_codec(websocket_state['encoding'])
+            async with websockets.connect(
+                WEBSOCKET_URL,
+                subprotocols=[requested_codec.subprotocol],
+                compression='deflate' if WS_COMPRESSION == 'deflate' else None
+            ) as websocket:
                 websocket_state['websocket'] = websocket
+                websocket_state['codec'] = get_codec_for_subprotocol(websocket.subprotocol)
+                websocket_state['compression'] = websocket.response.headers.get('Sec-WebSocket-Extensions')
                 websocket_state['is_connected'] = True
                 
                 print_websocket_connect()
@@ -385,9 +437,12 @@ async def websocket_handler():
                 async for message in websocket:
                     if websocket_state['should_stop']:
                         break
+                    
+                    session_stats['bytes_received'] += payload_size(message)
+                    session_stats['frames_received'] += 1
                         
                     try:
-                        data = json.loads(message)
+                        data = websocket_state['codec'].decode(message)
                         message_type = data.get('type', 'unknown')
                         
                         if message_type == 'connected':
@@ -396,8 +451,13 @@ async def websocket_handler():
                             if 'server_info' in data:
                                 info = data['server_info']
                                 safe_print(f"{Fore.CYAN}📡 Server: {info.get('framework', 'Unknown')} ({info.get('model', 'Unknown')}){Style.RESET_ALL}")
+                            # Pick up a response that was cut off by the dropped connection
+                            resume = websocket_state['resume_turn']
+                            if resume:
+                                safe_print(f"{Fore.YELLOW}⏯️  Resuming response after chunk #{resume['last_chunk_number']}...{Style.RESET_ALL}")
+                                await send_from_loop(websocket, {'type': 'resume', **resume})
                             # Show prompt after connection
-                            if websocket_state['waiting_for_input']:
+                            elif websocket_state['waiting_for_input']:
                                 show_input_prompt()
                         
                         elif message_type == 'session_created' or message_type == 'session_joined':
@@ -417,10 +477,18 @@ async def websocket_handler():
                                 show_input_prompt()
                         
                         elif message_type == 'status':
+                            # Track the turn from here: a drop while the model is still generating needs a resume too
+                            if data.get('turn_id'):
+                                websocket_state['resume_turn'] = {'turn_id': data['turn_id'], 'last_chunk_number': 0}
                             session_context = f"(Context: {data.get('context_messages', 0)} messages)"
                             safe_print(f"{Fore.YELLOW}💭 {data.get('message', 'Processing...')} {session_context}{Style.RESET_ALL}")
                         
+                        elif message_type == 'resumed':
+                            session_stats['resumed_streams'] += 1
+                            websocket_state['pending_turns'].append(data.get('request_id'))
+                        
                         elif message_type == 'response_start':
+                            websocket_state['resume_turn'] = {'turn_id': data.get('turn_id'), 'last_chunk_number': 0}
                             websocket_state['is_streaming'] = True
                             websocket_state['current_response'] = ''
                             websocket_state['chunk_count'] = 0
@@ -435,12 +503,17 @@ async def websocket_handler():
                             session_stats['total_chunks_received'] += 1
                             chunk_text = data.get('text', '')
                             websocket_state['current_response'] += chunk_text + " "
+                            if websocket_state['resume_turn'] and websocket_state['resume_turn']['turn_id'] == data.get('turn_id', websocket_state['resume_turn']['turn_id']):
+                                websocket_state['resume_turn']['last_chunk_number'] = data.get('chunk_number', 0)
                             
                             # Print chunk in real-time
                             with print_lock:
                                 print(f"{Fore.WHITE}{chunk_text} {Style.RESET_ALL}", end='', flush=True)
                         
                         elif message_type == 'response_complete':
+                            websocket_state['resume_turn'] = None
+                            if data.get('request_id') in websocket_state['pending_turns']:
+                                websocket_state['pending_turns'].remove(data['request_id'])
                             if websocket_state['is_streaming']:
                                 safe_print()  # New line after response
                                 display_ai_response_footer()
@@ -469,6 +542,19 @@ async def websocket_handler():
                             if websocket_state['waiting_for_input']:
                                 show_input_prompt()
                         
+                        elif message_type == 'cancelled':
+                            websocket_state['resume_turn'] = None
+                            if data.get('request_id') in websocket_state['pending_turns']:
+                                websocket_state['pending_turns'].remove(data['request_id'])
+                            session_stats['cancelled_requests'] += 1
+                            if websocket_state['is_streaming']:
+                                safe_print()  # New line after partial response
+                                websocket_state['is_streaming'] = False
+                            safe_print(f"{Fore.YELLOW}🛑 Response {data.get('request_id')} cancelled (Context: {data.get('message_count', 0)} messages){Style.RESET_ALL}")
+                            
+                            if websocket_state['waiting_for_input']:
+                                show_input_prompt()
+                        
                         elif message_type == 'session_update':
                             update_type = data.get('update_type')
                             if update_type == 'user_typing' and data.get('typing'):
@@ -483,6 +569,10 @@ async def websocket_handler():
                                 show_input_prompt()
                         
                         elif message_type == 'error':
+                            if data.get('turn_id') and websocket_state['resume_turn'] and data['turn_id'] == websocket_state['resume_turn']['turn_id']:
+                                websocket_state['resume_turn'] = None
+                            if data.get('request_id') in websocket_state['pending_turns']:
+                                websocket_state['pending_turns'].remove(data['request_id'])
                             session_stats['failed_requests'] += 1
                             safe_print(f"\n{Fore.RED}❌ Server Error: {data.get('message', 'Unknown error')}{Style.RESET_ALL}")
                             
@@ -490,6 +580,10 @@ async def websocket_handler():
                             if websocket_state['waiting_for_input']:
                                 show_input_prompt()
                         
+                        elif message_type == 'ping':
+                            # Server heartbeat: reply straight from the event loop, without printing
+                            await send_from_loop(websocket, {'type': 'pong'})
+                        
                         elif message_type == 'pong':
                             safe_print(f"{Fore.GREEN}🏓 Pong received from server{Style.RESET_ALL}")
                             
@@ -497,8 +591,8 @@ async def websocket_handler():
                             if websocket_state['waiting_for_input']:
                                 show_input_prompt()
                         
-                    except json.JSONDecodeError:
-                        safe_print(f"{Fore.RED}❌ Invalid JSON received from server{Style.RESET_ALL}")
+                    except FrameDecodeError:
+                        safe_print(f"{Fore.RED}❌ Invalid {websocket_state['codec'].name} frame received from server{Style.RESET_ALL}")
                         if websocket_state['waiting_for_input']:
                             show_input_prompt()
                     except Exception as e:
@@ -515,6 +609,8 @@ async def websocket_handler():
         finally:
             websocket_state['is_connected'] = False
             websocket_state['websocket'] = None
+            websocket_state['codec'] = None
+            websocket_state['pending_turns'].clear()
             
             # Try to reconnect after a delay if not stopping
             if not websocket_state['should_stop']:
@@ -559,6 +655,9 @@ def connect_websocket():
     print(f"{Fore.YELLOW}🔌 Connecting to WebSocket server...{Style.RESET_ALL}")
     
     try:
+        # Clear a previous /disconnect so the handler loop runs again
+        websocket_state['should_stop'] = False
+        
         # Start background WebSocket task
         websocket_background_task()
         
@@ -607,16 +706,21 @@ def disconnect_websocket():
     websocket_state['is_connected'] = False
     websocket_state['websocket'] = None
 
-def send_websocket_message(message_type: str, data: dict = None):
+def send_websocket_message(message_type: str, data: dict = None) -> Optional[str]:
     """
-    Send a message via WebSocket
+    Send a message via WebSocket, returning its request_id (None on failure)
     """
     if not websocket_state['is_connected'] or not websocket_state['websocket']:
         print(f"{Fore.RED}❌ WebSocket not connected{Style.RESET_ALL}")
-        return False
+        return None
+    
+    # Every message carries a request_id so replies to concurrent turns can be told apart
+    websocket_state['next_request_id'] += 1
+    request_id = f"r{websocket_state['next_request_id']}"
     
     message = {
         'type': message_type,
+        'request_id': request_id,
         'timestamp': datetime.now().isoformat()
     }
     
@@ -625,15 +729,18 @@ def send_websocket_message(message_type: str, data: dict = None):
     
     try:
         if websocket_state['event_loop']:
+            payload = (websocket_state['codec'] or get_codec('json')).encode(message)
             future = asyncio.run_coroutine_threadsafe(
-                websocket_state['websocket'].send(json.dumps(message)),
+                websocket_state['websocket'].send(payload),
                 websocket_state['event_loop']
             )
             future.result(timeout=1)
-            return True
+            session_stats['bytes_sent'] += payload_size(payload)
+            session_stats['frames_sent'] += 1
+            return request_id
     except Exception as e:
         print(f"{Fore.RED}❌ Error sending WebSocket message: {e}{Style.RESET_ALL}")
-        return False
+        return None
 
 def send_chat_message(user_message: str):
     """
@@ -647,12 +754,14 @@ def send_chat_message(user_message: str):
     
     print_message_sent('chat', user_message)
     
-    success = send_websocket_message('chat', {
+    request_id = send_websocket_message('chat', {
         'message': user_message,
         'session_id': current_session['session_id']
     })
     
-    if not success:
+    if request_id:
+        websocket_state['pending_turns'].append(request_id)
+    else:
         session_stats['failed_requests'] += 1
 
 def create_new_session():
@@ -677,6 +786,42 @@ def send_ping():
     print(f"{Fore.YELLOW}🏓 Sending ping to server...{Style.RESET_ALL}")
     send_websocket_message('ping')
 
+def cancel_response(request_id: str = None):
+    """
+    Cancel an in-flight response (the most recent one by default)
+    """
+    if not websocket_state['is_connected']:
+        print(f"{Fore.RED}❌ Not connected to WebSocket server{Style.RESET_ALL}")
+        return
+    
+    target = request_id or (websocket_state['pending_turns'][-1] if websocket_state['pending_turns'] else None)
+    if not target:
+        print(f"{Fore.YELLOW}⚠️  No response in flight{Style.RESET_ALL}")
+        return
+    
+    print(f"{Fore.YELLOW}🛑 Cancelling response {target}...{Style.RESET_ALL}")
+    send_websocket_message('cancel', {'target_request_id': target})
+
+def switch_encoding(encoding: str = None):
+    """
+    Show the current frame encoding, or reconnect using a different one
+    """
+    if not encoding:
+        codec_name = websocket_state['codec'].name if websocket_state['codec'] else 'none'
+        print(f"{Fore.CYAN}📦 Requested encoding: {websocket_state['encoding']} | Negotiated: {codec_name} | Compression: {websocket_state['compression'] or 'none'}{Style.RESET_ALL}")
+        return
+    
+    codec = get_codec(encoding)
+    if codec.name != encoding.lower():
+        print(f"{Fore.RED}❌ Encoding '{encoding}' is not available (is msgpack installed?){Style.RESET_ALL}")
+        return
+    
+    websocket_state['encoding'] = codec.name
+    print(f"{Fore.YELLOW}📦 Switching to {codec.name} frames...{Style.RESET_ALL}")
+    if websocket_state['is_connected']:
+        disconnect_websocket()
+    connect_websocket()
+
 def main():
     """
     Main chat loop
@@ -776,6 +921,16 @@ def main():
                 send_ping()
                 continue
             
+            elif user_message.lower().startswith('/cancel'):
+                parts = user_message.split()
+                cancel_response(parts[1] if len(parts) > 1 else None)
+                continue
+            
+            elif user_message.lower().startswith('/encoding'):
+                parts = user_message.split()
+                switch_encoding(parts[1] if len(parts) > 1 else None)
+                continue
+            
             elif user_message.lower() == '/new':
                 create_new_session()
                 continue
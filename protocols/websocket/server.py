@@ -1,16 +1,36 @@
 from fastapi.middleware.cors import CORSMiddleware
 from shared.setup import initialize_genai_client
+from shared.metrics import PROMETHEUS_CONTENT_TYPE
+from shared.metrics import MetricsMiddleware
+from shared.metrics import registry
+from shared.codec import negotiate_codec
 from contextlib import asynccontextmanager
 from shared.llm import create_chat_session
+from shared.serialization import FastJSONResponse
+from shared.serialization import EventEnvelope
+from shared.serialization import timestamps
+from shared.conditional import ConditionalCache
+from shared.conditional import ResourceVersions
+from shared.conditional import VersionedStats
+from shared.session_index import SESSIONS_MAX_PAGE_SIZE
+from shared.session_index import SESSIONS_PAGE_SIZE
+from shared.session_index import SessionIndex
 from fastapi.responses import HTMLResponse
 from fastapi import WebSocketDisconnect
+from shared.codec import payload_size
 from shared.llm import ChatSession
+from shared.codec import FrameDecodeError
+from shared.codec import JSON_CODEC
 from fastapi import HTTPException
 from pydantic import BaseModel
 from datetime import datetime
 from fastapi import WebSocket
 from fastapi import Request 
+from fastapi.responses import Response
 from fastapi import FastAPI
+from fastapi import Query
+from shared.codec import CODECS
+from shared.timers import TimerWheel
 from typing import Optional 
 from colorama import Style
 from colorama import Back
@@ -18,12 +38,14 @@ from colorama import Fore
 from colorama import init 
 from typing import Dict
 from typing import List 
+from typing import Union
 from typing import Set
+from collections import deque
+import functools
 import uvicorn
 import asyncio
 import uuid
 import time
-import json
 import os
 
 
@@ -63,30 +85,90 @@ class StatsResponse(BaseModel):
     total_requests: int
     successful_requests: int
     failed_requests: int
+    cancelled_requests: int
     average_response_time: float
     model: str
     start_time: str
     active_sessions: int
     total_sessions_created: int
     websocket_connections: int
+    active_turns: int
+    bytes_sent: int
+    bytes_received: int
+    frames_sent: int
+    frames_received: int
+    encodings: Dict[str, dict]
+    heartbeats_sent: int
+    reaped_idle_connections: int
+    reaped_unresponsive_connections: int
+    resumable_turns: int
+    resume_buffer_bytes: int
+    resumed_turns: int
+    replayed_chunks: int
+    resume_misses: int
+    resume_buffers_evicted: int
 
 # Configuration
 MODEL_ID = os.environ.get('GENAI_MODEL_ID', 'gemini-2.0-flash')
+WS_PER_MESSAGE_DEFLATE = os.environ.get('WS_PER_MESSAGE_DEFLATE', 'true').lower() != 'false'
+
+# Heartbeat and reaper timing in seconds (an interval or idle timeout of 0 disables it)
+WS_HEARTBEAT_INTERVAL = float(os.environ.get('WS_HEARTBEAT_INTERVAL', '20'))
+WS_HEARTBEAT_TIMEOUT = float(os.environ.get('WS_HEARTBEAT_TIMEOUT', '10'))
+WS_IDLE_TIMEOUT = float(os.environ.get('WS_IDLE_TIMEOUT', '300'))
+WS_REAPER_TICK = float(os.environ.get('WS_REAPER_TICK', '1'))
+
+# Replay buffers for resuming turns: seconds kept after a turn ends, events kept per turn, total memory cap
+WS_RESUME_TTL = float(os.environ.get('WS_RESUME_TTL', '120'))
+WS_RESUME_MAX_EVENTS = int(os.environ.get('WS_RESUME_MAX_EVENTS', '2000'))
+WS_RESUME_BUFFER_BYTES = int(os.environ.get('WS_RESUME_BUFFER_BYTES', str(16 * 1024 * 1024)))
 
 # Global variables
 chat_sessions: Dict[str, ChatSession] = {}
 session_metadata: Dict[str, dict] = {}
 websocket_connections: Dict[str, WebSocket] = {}
-connection_sessions: Dict[str, str] = {}  # connection_id -> session_id
-chat_stats = {
+connection_sessions: Dict[str, str] = {}  # connection_id -> default session_id
+connection_joined_sessions: Dict[str, Set[str]] = {}  # connection_id -> every session_id it follows
+connection_turns: Dict[str, Dict[str, tuple]] = {}  # connection_id -> request_id -> (session_id, task)
+session_locks: Dict[str, asyncio.Lock] = {}  # session_id -> lock serializing its turns
+turn_streams: Dict[str, dict] = {}  # turn_id -> replay buffer and live follower of a turn
+resume_buffer_bytes = 0
+background_tasks: Set[asyncio.Task] = set()  # heartbeats, closes and cancel notices in flight; the event loop only keeps weak references to tasks
+resource_versions = ResourceVersions()  # bumped on every session/stats mutation, backs the ETags
+conditional_cache = ConditionalCache()
+session_index = SessionIndex()  # ordered by created_at / last_activity, overall and per model
+chat_stats = VersionedStats(resource_versions, {
     'total_requests': 0,
     'successful_requests': 0,
     'failed_requests': 0,
+    'cancelled_requests': 0,
     'total_response_time': 0,
     'total_sessions_created': 0,
     'websocket_connections': 0,
+    'bytes_sent': 0,
+    'bytes_received': 0,
+    'frames_sent': 0,
+    'frames_received': 0,
+    'heartbeats_sent': 0,
+    'reaped_idle_connections': 0,
+    'reaped_unresponsive_connections': 0,
+    'resumed_turns': 0,
+    'replayed_chunks': 0,
+    'resume_misses': 0,
+    'resume_buffers_evicted': 0,
     'start_time': datetime.now()
+})
+# Per-encoding traffic counters, used to compare bandwidth between JSON and binary frames
+encoding_stats: Dict[str, dict] = {
+    name: {'connections': 0, 'bytes_sent': 0, 'bytes_received': 0, 'frames_sent': 0, 'frames_received': 0}
+    for name in CODECS
 }
+# Per-connection 'ping' (heartbeat due), 'pong' (heartbeat reply due) and 'idle' deadlines,
+# keyed by (connection_id, kind), plus (turn_id, 'resume') replay buffer expiry, on the time.monotonic() clock
+connection_timers = TimerWheel(
+    WS_REAPER_TICK,
+    max(WS_HEARTBEAT_INTERVAL, WS_HEARTBEAT_TIMEOUT, WS_IDLE_TIMEOUT, WS_RESUME_TTL) + WS_REAPER_TICK
+)
 
 # Lifespan event handler
 @asynccontextmanager
@@ -98,17 +180,21 @@ async def lifespan(app: FastAPI):
     print(f"{Fore.YELLOW}📊 Statistics endpoint: http://localhost:8000/stats{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}❤️  Health check: http://localhost:8000/health{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}🔌 WebSocket Demo: http://localhost:8000/demo{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}💓 Heartbeat: every {WS_HEARTBEAT_INTERVAL:g}s of silence, {WS_HEARTBEAT_TIMEOUT:g}s to reply | Idle timeout: {WS_IDLE_TIMEOUT:g}s{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}🔧 Use Ctrl+C to stop the server{Style.RESET_ALL}\n")
     
+    reaper_task = asyncio.create_task(reap_connections())
+    
     yield
     
     # Shutdown
+    reaper_task.cancel()
     print(f"\n\n{Fore.YELLOW}👋 FastAPI WebSocket server shutting down gracefully...{Style.RESET_ALL}")
     print(f"{Fore.CYAN}💭 Active sessions: {len(chat_sessions)}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}🔌 Active WebSocket connections: {len(websocket_connections)}{Style.RESET_ALL}")
     
     # Close all WebSocket connections
-    for connection_id, websocket in websocket_connections.items():
+    for connection_id, websocket in list(websocket_connections.items()):
         try:
             await websocket.close()
         except:
@@ -122,6 +208,7 @@ app = FastAPI(
     title="GenAI WebSocket Multi-turn Chat API",
     description="Beautiful FastAPI-based WebSocket multi-turn chat server with real-time bidirectional communication",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -134,6 +221,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status codes and bytes for HTTP requests; served at /metrics
+app.add_middleware(MetricsMiddleware)
+
 def print_banner():
     banner = f""" {Fore.CYAN}╔══════════════════════════════════════════════════════════════╗
                🔌 FASTAPI WEBSOCKET CHAT SERVER 🔌             
@@ -173,6 +263,8 @@ def create_new_session(model_id: str = None) -> tuple[str, ChatSession]:
             'last_activity': datetime.now()
         }
         chat_stats['total_sessions_created'] += 1
+        resource_versions.watch(session_id, chat_session)
+        session_index.add(session_id, model_id, session_metadata[session_id]['created_at'])
         
         print(f"{Fore.GREEN}✨ Created new session {session_id[:8]}... with model {model_id}{Style.RESET_ALL}")
         return session_id, chat_session
@@ -192,10 +284,12 @@ def get_or_create_session(session_id: str = None, model_id: str = None) -> tuple
     else:
         chat_session = chat_sessions[session_id]
         session_metadata[session_id]['last_activity'] = datetime.now()
+        resource_versions.bump_session(session_id)
+        session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     return session_id, chat_session, is_new_session
 
-def print_websocket_connect(connection_id: str, client_ip: str):
+def print_websocket_connect(connection_id: str, client_ip: str, encoding: str = 'json'):
     """
     Print WebSocket connection info
     """
@@ -206,6 +300,7 @@ def print_websocket_connect(connection_id: str, client_ip: str):
     print(f"  Client IP: {Fore.GREEN}{client_ip}{Style.RESET_ALL}")
     print(f"  Active Connections: {len(websocket_connections) + 1}")
     print(f"  Protocol: WebSocket")
+    print(f"  Encoding: {Fore.CYAN}{encoding}{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
 def print_websocket_disconnect(connection_id: str, reason: str = "Normal"):
@@ -272,50 +367,516 @@ def print_stats():
     print(f"  Total Requests: {Fore.YELLOW}{chat_stats['total_requests']}{Style.RESET_ALL}")
     print(f"  Successful: {Fore.GREEN}{chat_stats['successful_requests']}{Style.RESET_ALL}")
     print(f"  Failed: {Fore.RED}{chat_stats['failed_requests']}{Style.RESET_ALL}")
+    print(f"  Cancelled: {Fore.YELLOW}{chat_stats['cancelled_requests']}{Style.RESET_ALL}")
     print(f"  Active Sessions: {Fore.MAGENTA}{len(chat_sessions)}{Style.RESET_ALL}")
     print(f"  WebSocket Connections: {Fore.MAGENTA}{len(websocket_connections)}{Style.RESET_ALL}")
     print(f"  Total Sessions: {Fore.MAGENTA}{chat_stats['total_sessions_created']}{Style.RESET_ALL}")
     print(f"  Avg Response Time: {Fore.YELLOW}{avg_response_time:.3f}s{Style.RESET_ALL}")
+    print(f"  Bytes Sent: {Fore.YELLOW}{chat_stats['bytes_sent']}{Style.RESET_ALL} ({chat_stats['frames_sent']} frames)")
+    print(f"  Bytes Received: {Fore.YELLOW}{chat_stats['bytes_received']}{Style.RESET_ALL} ({chat_stats['frames_received']} frames)")
+    print(f"  Heartbeats Sent: {Fore.YELLOW}{chat_stats['heartbeats_sent']}{Style.RESET_ALL}")
+    print(f"  Reaped (idle/unresponsive): {Fore.RED}{chat_stats['reaped_idle_connections']}/{chat_stats['reaped_unresponsive_connections']}{Style.RESET_ALL}")
+    print(f"  Resumed Turns: {Fore.YELLOW}{chat_stats['resumed_turns']}{Style.RESET_ALL} ({chat_stats['replayed_chunks']} chunks replayed, {chat_stats['resume_misses']} misses)")
     print(f"{Fore.CYAN}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
 
-async def send_message(websocket: WebSocket, message_type: str, data: dict):
+def record_traffic(websocket: WebSocket, direction: str, size: int):
+    """
+    Update global and per-encoding byte counters for one frame
+    """
+    codec = getattr(websocket.state, 'codec', JSON_CODEC)
+    chat_stats[f'bytes_{direction}'] += size
+    chat_stats[f'frames_{direction}'] += 1
+    encoding_stats[codec.name][f'bytes_{direction}'] += size
+    encoding_stats[codec.name][f'frames_{direction}'] += 1
+
+async def send_frame(websocket: WebSocket, message: dict, envelope: Optional[EventEnvelope] = None):
+    """
+    Encode a message with the connection's negotiated codec (or a pre-encoded JSON envelope) and send it
+    """
+    codec = getattr(websocket.state, 'codec', JSON_CODEC)
+    payload = envelope.encode(message) if envelope is not None and codec is JSON_CODEC else codec.encode(message)
+    
+    if codec.binary:
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+    
+    record_traffic(websocket, 'sent', payload_size(payload))
+
+async def receive_frame(websocket: WebSocket) -> Union[str, bytes]:
+    """
+    Receive one text or binary frame from the client
+    """
+    message = await websocket.receive()
+    if message['type'] == 'websocket.disconnect':
+        raise WebSocketDisconnect(message.get('code', 1000))
+    
+    data = message.get('text')
+    if data is None:
+        data = message.get('bytes') or b''
+    
+    record_traffic(websocket, 'received', payload_size(data))
+    return data
+
+async def send_message(websocket: WebSocket, message_type: str, data: dict, request_id: Optional[str] = None):
     """
     Send a structured message to WebSocket client
     """
     message = {
         'type': message_type,
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamps.now(),
         **data
     }
-    await websocket.send_text(json.dumps(message))
+    if request_id:
+        message['request_id'] = request_id
+    
+    # Turns run as concurrent tasks, so frames from different turns must not interleave mid-send
+    async with websocket.state.send_lock:
+        await send_frame(websocket, message)
+
+def attach_session(connection_id: str, session_id: str):
+    """
+    Make session_id the connection's default session and subscribe it to session updates
+    """
+    connection_sessions[connection_id] = session_id
+    connection_joined_sessions.setdefault(connection_id, set()).add(session_id)
+    resource_versions.bump_session(session_id)  # connected_clients changed
 
 async def broadcast_session_update(session_id: str, update_type: str, data: dict):
     """
     Broadcast session updates to all connected clients for this session
     """
-    message = {
-        'type': 'session_update',
+    data = {
         'session_id': session_id,
         'update_type': update_type,
-        'timestamp': datetime.now().isoformat(),
         **data
     }
     
     # Send to all connections associated with this session
     disconnected = []
-    for connection_id, websocket in websocket_connections.items():
-        if connection_sessions.get(connection_id) == session_id:
+    for connection_id, websocket in list(websocket_connections.items()):
+        if session_id in connection_joined_sessions.get(connection_id, ()):
             try:
-                await websocket.send_text(json.dumps(message))
+                await send_message(websocket, 'session_update', data)
             except:
                 disconnected.append(connection_id)
     
     # Clean up disconnected connections
     for connection_id in disconnected:
-        if connection_id in websocket_connections:
-            del websocket_connections[connection_id]
-        if connection_id in connection_sessions:
-            del connection_sessions[connection_id]
+        await cleanup_connection(connection_id)
+
+def touch_connection(connection_id: str, active: bool = True):
+    """
+    Record that a frame arrived: push back the heartbeat, and the idle deadline for real activity
+    """
+    now = time.monotonic()
+    
+    # Any frame proves the peer is alive, so an outstanding heartbeat no longer needs a reply
+    connection_timers.cancel((connection_id, 'pong'))
+    if WS_HEARTBEAT_INTERVAL > 0:
+        connection_timers.schedule((connection_id, 'ping'), now + WS_HEARTBEAT_INTERVAL)
+    if active and WS_IDLE_TIMEOUT > 0:
+        connection_timers.schedule((connection_id, 'idle'), now + WS_IDLE_TIMEOUT)
+
+async def cleanup_connection(connection_id: str):
+    """
+    Forget a connection and everything tied to it (safe to call more than once)
+    """
+    if websocket_connections.pop(connection_id, None) is None:
+        return
+    
+    # Turns still generating keep running so a reconnecting client can resume them
+    detach_turns(connection_id)
+    connection_sessions.pop(connection_id, None)
+    for kind in ('ping', 'pong', 'idle'):
+        connection_timers.cancel((connection_id, kind))
+    chat_stats['websocket_connections'] = max(0, chat_stats['websocket_connections'] - 1)
+    
+    # Notify other clients about disconnection
+    for session_id in connection_joined_sessions.pop(connection_id, set()):
+        if session_id in chat_sessions:
+            resource_versions.bump_session(session_id)
+        try:
+            await broadcast_session_update(session_id, 'user_disconnected', {
+                'connection_id': connection_id
+            })
+        except:
+            pass
+
+async def send_heartbeat(websocket: WebSocket, connection_id: str):
+    """
+    Send a server-initiated ping; the client must answer with any frame (normally 'pong')
+    """
+    try:
+        await send_message(websocket, 'ping', {'connection_id': connection_id})
+    except:
+        pass
+
+async def close_connection(websocket: WebSocket, reason: str):
+    """
+    Close a reaped connection without blocking the reaper on a dead peer
+    """
+    try:
+        await websocket.close(code=1001, reason=reason)
+    except:
+        pass
+
+async def reap_connections():
+    """
+    Background reaper: each tick only touches the timers (connections and replay buffers) that came due
+    """
+    while True:
+        await asyncio.sleep(WS_REAPER_TICK)
+        
+        for connection_id, kind in connection_timers.advance(time.monotonic()):
+            if kind == 'resume':
+                expire_turn(connection_id)  # keyed by turn_id
+                continue
+            
+            websocket = websocket_connections.get(connection_id)
+            if websocket is None:
+                continue
+            
+            if kind == 'ping':
+                chat_stats['heartbeats_sent'] += 1
+                connection_timers.schedule((connection_id, 'pong'), time.monotonic() + WS_HEARTBEAT_TIMEOUT)
+                run_in_background(send_heartbeat(websocket, connection_id))
+            
+            elif kind == 'idle' and connection_turns.get(connection_id):
+                # Still streaming a response, which is not idleness
+                connection_timers.schedule((connection_id, 'idle'), time.monotonic() + WS_IDLE_TIMEOUT)
+            
+            else:
+                if kind == 'idle':
+                    reason = 'Idle timeout'
+                    chat_stats['reaped_idle_connections'] += 1
+                else:
+                    reason = 'Heartbeat timeout'
+                    chat_stats['reaped_unresponsive_connections'] += 1
+                
+                print_websocket_disconnect(connection_id, f"Reaped ({reason})")
+                run_in_background(close_connection(websocket, reason))
+                await cleanup_connection(connection_id)
+
+def run_in_background(coroutine) -> asyncio.Task:
+    """
+    Start a task that nothing awaits, keeping it referenced until it finishes
+    """
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def event_size(message: dict) -> int:
+    """
+    Approximate memory held by one buffered turn event
+    """
+    return len(message.get('text', '')) + len(message.get('full_response', '')) + 128
+
+async def publish_turn_event(turn: dict, message_type: str, data: dict):
+    """
+    Buffer a turn event for replay and deliver it to the connection currently following the turn
+    """
+    global resume_buffer_bytes
+    
+    message = {
+        'type': message_type,
+        'timestamp': timestamps.now(),
+        'turn_id': turn['turn_id'],
+        'request_id': turn['request_id'],
+        **data
+    }
+    
+    # The per-turn buffer is bounded: a full one drops its oldest event on append, and chunks
+    # that fall out can no longer be resumed from
+    if len(turn['events']) == turn['events'].maxlen:
+        drop_oldest_event(turn)
+    
+    turn['events'].append(message)
+    turn['bytes'] += event_size(message)
+    resume_buffer_bytes += event_size(message)
+    enforce_resume_buffer_cap()
+    
+    websocket = turn['websocket']
+    if websocket is None:
+        return
+    try:
+        async with websocket.state.send_lock:
+            await send_frame(websocket, message, turn['chunk_envelope'] if message_type == 'chunk' else None)
+    except Exception:
+        # The connection went away; keep generating so a reconnecting client can resume
+        if turn['websocket'] is websocket:
+            turn['websocket'] = None
+
+def drop_oldest_event(turn: dict):
+    """
+    Drop the oldest event of a turn's replay buffer; resuming from before it reports the gap
+    """
+    global resume_buffer_bytes
+    
+    dropped = turn['events'].popleft()
+    turn['base_seq'] += 1
+    turn['bytes'] -= event_size(dropped)
+    resume_buffer_bytes -= event_size(dropped)
+    if dropped['type'] == 'chunk':
+        turn['dropped_through_chunk'] = dropped['chunk_number']
+
+def expire_turn(turn_id: str):
+    """
+    Drop a turn's replay buffer
+    """
+    global resume_buffer_bytes
+    
+    turn = turn_streams.pop(turn_id, None)
+    if turn is not None:
+        resume_buffer_bytes -= turn['bytes']
+        connection_timers.cancel((turn_id, 'resume'))
+
+def enforce_resume_buffer_cap():
+    """
+    Fit the replay buffers into the memory cap: evict the oldest finished turns first, then
+    trim the oldest events of in-flight turns
+    """
+    if resume_buffer_bytes <= WS_RESUME_BUFFER_BYTES:
+        return
+    for turn_id, turn in list(turn_streams.items()):
+        if resume_buffer_bytes <= WS_RESUME_BUFFER_BYTES:
+            return
+        if turn['done']:
+            expire_turn(turn_id)
+            chat_stats['resume_buffers_evicted'] += 1
+    for turn in list(turn_streams.values()):
+        while turn['events'] and resume_buffer_bytes > WS_RESUME_BUFFER_BYTES:
+            drop_oldest_event(turn)
+        if resume_buffer_bytes <= WS_RESUME_BUFFER_BYTES:
+            return
+
+async def run_chat_turn(turn: dict, chat_session: ChatSession, user_message: str):
+    """
+    Generate and stream one chat turn; turns in the same session run one at a time
+    """
+    session_id = turn['session_id']
+    session_lock = session_locks.setdefault(session_id, asyncio.Lock())
+    history_length = None
+    
+    try:
+        if session_lock.locked():
+            await publish_turn_event(turn, 'status', {
+                'message': 'Waiting for the previous turn in this session...',
+                'session_id': session_id,
+                'context_messages': chat_session.get_message_count()
+            })
+        
+        async with session_lock:
+            history_length = chat_session.get_message_count()
+            
+            # Send status update
+            await publish_turn_event(turn, 'status', {
+                'message': 'Generating response...',
+                'session_id': session_id,
+                'context_messages': history_length
+            })
+            
+            print_response_start(turn['connection_id'] or 'detached', session_id, history_length)
+            
+            start_time = time.time()
+            
+            try:
+                # Add user message to session
+                chat_session.add_message("user", user_message)
+                
+                # Generate full response first with the async client so other turns keep running
+                # and cancelling this task aborts the upstream request
+                full_response = await chat_session.client.aio.models.generate_content(
+                    model=chat_session.model_id,
+                    contents=chat_session.chat_history
+                )
+                response_text = full_response.text.strip()
+                
+                # Add model response to history
+                chat_session.add_message("model", response_text)
+                
+                # Send response start indicator
+                await publish_turn_event(turn, 'response_start', {
+                    'session_id': session_id,
+                    'total_length': len(response_text)
+                })
+                
+                # Simulate streaming by sending chunks
+                words = response_text.split()
+                current_chunk = ""
+                chunk_count = 0
+                
+                for i, word in enumerate(words):
+                    current_chunk += word + " "
+                    
+                    # Send chunk every 3-5 words or at end
+                    if (i + 1) % 4 == 0 or i == len(words) - 1:
+                        chunk_count += 1
+                        chunk_text = current_chunk.strip()
+                        
+                        await publish_turn_event(turn, 'chunk', {
+                            'text': chunk_text,
+                            'chunk_number': chunk_count,
+                            'is_final': i == len(words) - 1,
+                            'session_id': session_id
+                        })
+                        
+                        print_chunk_sent(turn['connection_id'] or 'detached', chunk_count, chunk_text)
+                        current_chunk = ""
+                        
+                        # Simulate natural typing delay
+                        await asyncio.sleep(0.1)
+                
+                # Send completion info
+                total_time = time.time() - start_time
+                await publish_turn_event(turn, 'response_complete', {
+                    'total_chunks': chunk_count,
+                    'processing_time': round(total_time, 3),
+                    'message_count': chat_session.get_message_count(),
+                    'session_id': session_id,
+                    'full_response': response_text
+                })
+                
+                # Update statistics
+                chat_stats['successful_requests'] += 1
+                chat_stats['total_response_time'] += total_time
+                
+                # Broadcast session update to other clients
+                await broadcast_session_update(session_id, 'message_added', {
+                    'message_count': chat_session.get_message_count(),
+                    'last_message_preview': user_message[:50] + ('...' if len(user_message) > 50 else '')
+                })
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                chat_stats['failed_requests'] += 1
+                await publish_turn_event(turn, 'error', {
+                    'message': f'Error generating response: {str(e)}',
+                    'session_id': session_id
+                })
+                print(f"{Fore.RED}❌ Error in chat generation: {e}{Style.RESET_ALL}")
+    
+    except asyncio.CancelledError:
+        # A cancelled turn never happened: drop whatever it added to the history
+        if history_length is not None:
+            del chat_session.chat_history[history_length:]
+            chat_session.mark_changed()
+        raise
+
+def finish_turn(turn: dict, task: asyncio.Task):
+    """
+    Done-callback for turn tasks (also runs for turns cancelled before they started)
+    """
+    if turn['connection_id']:
+        connection_turns.get(turn['connection_id'], {}).pop(turn['request_id'], None)
+    
+    # Keep the finished turn replayable for a while, then let the reaper expire it
+    turn['done'] = True
+    turn['task'] = None
+    connection_timers.schedule((turn['turn_id'], 'resume'), time.monotonic() + WS_RESUME_TTL)
+    
+    if task.cancelled():
+        chat_stats['cancelled_requests'] += 1
+        print(f"{Fore.YELLOW}🛑 Cancelled turn {turn['request_id']} in session {turn['session_id'][:8]}...{Style.RESET_ALL}")
+        chat_session = chat_sessions.get(turn['session_id'])
+        run_in_background(publish_turn_event(turn, 'cancelled', {
+            'session_id': turn['session_id'],
+            'message_count': chat_session.get_message_count() if chat_session else 0
+        }))
+
+def cancel_turns(connection_id: str, request_id: str = None, session_id: str = None) -> List[str]:
+    """
+    Cancel in-flight turns of a connection, optionally narrowed to one request or one session
+    """
+    cancelled = []
+    for turn_request_id, (turn_session_id, task) in list(connection_turns.get(connection_id, {}).items()):
+        if request_id and turn_request_id != request_id:
+            continue
+        if session_id and turn_session_id != session_id:
+            continue
+        task.cancel()
+        cancelled.append(turn_request_id)
+    return cancelled
+
+def detach_turns(connection_id: str):
+    """
+    Stop delivering a closed connection's turns; they keep generating into their replay buffers
+    """
+    for turn_request_id, (turn_session_id, task) in connection_turns.pop(connection_id, {}).items():
+        turn = turn_streams.get(task.get_name())
+        if turn is not None:
+            turn['websocket'] = None
+            turn['connection_id'] = None
+
+async def resume_turn(websocket: WebSocket, connection_id: str, request_id: Optional[str],
+                      turn_id: str, last_chunk_number: int):
+    """
+    Replay the chunks a reconnecting client missed, then hand it the live tail of the turn
+    """
+    turn = turn_streams.get(turn_id)
+    if turn is None:
+        chat_stats['resume_misses'] += 1
+        await send_message(websocket, 'error', {
+            'message': 'Turn not found or its replay buffer has expired',
+            'turn_id': turn_id
+        }, request_id)
+        return
+    
+    if last_chunk_number < turn['dropped_through_chunk']:
+        chat_stats['resume_misses'] += 1
+        await send_message(websocket, 'error', {
+            'message': f"Chunks up to #{turn['dropped_through_chunk']} are no longer buffered",
+            'turn_id': turn_id
+        }, request_id)
+        return
+    
+    # Take the turn over from whichever connection followed it before
+    if turn['connection_id'] and turn['connection_id'] != connection_id:
+        connection_turns.get(turn['connection_id'], {}).pop(turn['request_id'], None)
+    turn['websocket'] = None
+    turn['connection_id'] = connection_id
+    attach_session(connection_id, turn['session_id'])
+    if turn['task'] is not None:
+        connection_turns[connection_id][turn['request_id']] = (turn['session_id'], turn['task'])
+    
+    chat_stats['resumed_turns'] += 1
+    await send_message(websocket, 'resumed', {
+        'turn_id': turn_id,
+        'session_id': turn['session_id'],
+        'last_chunk_number': last_chunk_number,
+        'done': turn['done']
+    }, request_id)
+    
+    # Replay by sequence number until caught up; events published meanwhile are picked up by
+    # the loop, and the live tail starts with no await between the last check and the attach
+    seq = turn['base_seq']
+    replayed_through = last_chunk_number
+    while seq < turn['base_seq'] + len(turn['events']):
+        # The memory cap can trim this turn while the replay waits on the socket
+        if replayed_through < turn['dropped_through_chunk']:
+            chat_stats['resume_misses'] += 1
+            await send_message(websocket, 'error', {
+                'message': f"Chunks up to #{turn['dropped_through_chunk']} are no longer buffered",
+                'turn_id': turn_id
+            }, request_id)
+            return
+        seq = max(seq, turn['base_seq'])
+        event = turn['events'][seq - turn['base_seq']]
+        seq += 1
+        if event['type'] == 'chunk' and event['chunk_number'] <= last_chunk_number:
+            continue
+        if event['type'] in ('status', 'response_start') and last_chunk_number > 0:
+            continue
+        if event['type'] == 'chunk':
+            chat_stats['replayed_chunks'] += 1
+            replayed_through = event['chunk_number']
+        async with websocket.state.send_lock:
+            await send_frame(websocket, event)
+    
+    if turn['connection_id'] == connection_id:
+        turn['websocket'] = websocket
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -325,49 +886,71 @@ async def websocket_endpoint(websocket: WebSocket):
     connection_id = str(uuid.uuid4())
     client_ip = websocket.client.host if websocket.client else "Unknown"
     
-    await websocket.accept()
+    # Negotiate the frame encoding: Sec-WebSocket-Protocol first, then ?encoding=
+    codec, subprotocol = negotiate_codec(
+        websocket.scope.get('subprotocols', []),
+        websocket.query_params.get('encoding')
+    )
+    websocket.state.codec = codec
+    websocket.state.send_lock = asyncio.Lock()
+    
+    await websocket.accept(subprotocol=subprotocol)
     websocket_connections[connection_id] = websocket
+    connection_turns[connection_id] = {}
+    touch_connection(connection_id)
     chat_stats['websocket_connections'] += 1
+    encoding_stats[codec.name]['connections'] += 1
     
-    print_websocket_connect(connection_id, client_ip)
+    print_websocket_connect(connection_id, client_ip, codec.name)
     
     # Send welcome message
     await send_message(websocket, 'connected', {
         'connection_id': connection_id,
         'message': 'WebSocket connected successfully!',
+        'encoding': codec.name,
+        'compact': codec.compact,
         'server_info': {
             'model': MODEL_ID,
             'framework': 'FastAPI + WebSockets',
-            'features': ['multi-turn', 'real-time', 'bidirectional']
+            'features': ['multi-turn', 'real-time', 'bidirectional', 'multiplexed-turns', 'cancellation', 'resume'],
+            'encodings': list(CODECS),
+            'per_message_deflate': WS_PER_MESSAGE_DEFLATE
         }
     })
     
     try:
         while True:
             # Receive message from client
-            data = await websocket.receive_text()
+            data = await receive_frame(websocket)
+            request_id = None
             
             try:
-                message = json.loads(data)
+                message = codec.decode(data)
                 message_type = message.get('type', 'unknown')
+                request_id = message.get('request_id')
+                
+                # Heartbeat replies keep the connection alive but do not count as activity
+                touch_connection(connection_id, active=message_type != 'pong')
+                if message_type == 'pong':
+                    continue
                 
                 chat_stats['total_requests'] += 1
                 
                 if message_type == 'ping':
                     # Handle ping/pong for connection health
-                    await send_message(websocket, 'pong', {'connection_id': connection_id})
+                    await send_message(websocket, 'pong', {'connection_id': connection_id}, request_id)
                 
                 elif message_type == 'create_session':
                     # Create new session
                     model_id = message.get('model_id', MODEL_ID)
                     session_id, chat_session = create_new_session(model_id)
-                    connection_sessions[connection_id] = session_id
+                    attach_session(connection_id, session_id)
                     
                     await send_message(websocket, 'session_created', {
                         'session_id': session_id,
                         'model': model_id,
                         'connection_id': connection_id
-                    })
+                    }, request_id)
                     
                     print_message_received(connection_id, session_id, 'create_session', model_id)
                 
@@ -375,7 +958,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     # Join existing session
                     session_id = message.get('session_id')
                     if session_id and session_id in chat_sessions:
-                        connection_sessions[connection_id] = session_id
+                        attach_session(connection_id, session_id)
                         chat_session = chat_sessions[session_id]
                         
                         await send_message(websocket, 'session_joined', {
@@ -383,27 +966,34 @@ async def websocket_endpoint(websocket: WebSocket):
                             'model': chat_session.model_id,
                             'message_count': chat_session.get_message_count(),
                             'connection_id': connection_id
-                        })
+                        }, request_id)
                         
                         print_message_received(connection_id, session_id, 'join_session', session_id)
                     else:
                         await send_message(websocket, 'error', {
                             'message': 'Session not found',
                             'session_id': session_id
-                        })
+                        }, request_id)
                 
                 elif message_type == 'chat':
                     # Handle chat message
                     user_message = message.get('message', '').strip()
                     session_id = message.get('session_id') or connection_sessions.get(connection_id)
+                    request_id = request_id or str(uuid.uuid4())
                     
                     if not user_message:
-                        await send_message(websocket, 'error', {'message': 'Message is required'})
+                        await send_message(websocket, 'error', {'message': 'Message is required'}, request_id)
+                        continue
+                    
+                    if request_id in connection_turns[connection_id]:
+                        await send_message(websocket, 'error', {
+                            'message': f'Request {request_id} is already in flight'
+                        }, request_id)
                         continue
                     
                     # Get or create session
                     session_id, chat_session, is_new_session = get_or_create_session(session_id)
-                    connection_sessions[connection_id] = session_id
+                    attach_session(connection_id, session_id)
                     
                     print_message_received(connection_id, session_id, 'chat', user_message)
                     
@@ -412,147 +1002,89 @@ async def websocket_endpoint(websocket: WebSocket):
                             'session_id': session_id,
                             'model': chat_session.model_id,
                             'connection_id': connection_id
-                        })
+                        }, request_id)
                     
-                    # Send status update
-                    await send_message(websocket, 'status', {
-                        'message': 'Generating response...',
+                    # Each turn gets a replay buffer so it can be resumed after a dropped connection
+                    turn_id = str(uuid.uuid4())
+                    turn = {
+                        'turn_id': turn_id,
+                        'request_id': request_id,
                         'session_id': session_id,
-                        'context_messages': chat_session.get_message_count()
-                    })
-                    
-                    print_response_start(connection_id, session_id, chat_session.get_message_count())
-                    
-                    start_time = time.time()
-                    
-                    try:
-                        # Add user message to session
-                        chat_session.add_message("user", user_message)
-                        
-                        # Generate full response first (since GenAI doesn't have native streaming yet)
-                        full_response = chat_session.client.models.generate_content(
-                            model=chat_session.model_id,
-                            contents=chat_session.chat_history
+                        'connection_id': connection_id,
+                        'websocket': websocket,
+                        'events': deque(maxlen=WS_RESUME_MAX_EVENTS),
+                        'base_seq': 0,
+                        'bytes': 0,
+                        'dropped_through_chunk': 0,
+                        'done': False,
+                        'task': None,
+                        # Chunks only differ in text, number and timing: the rest is encoded once per turn
+                        'chunk_envelope': EventEnvelope(
+                            {'type': 'chunk', 'turn_id': turn_id, 'request_id': request_id, 'session_id': session_id},
+                            ('timestamp', 'text', 'chunk_number', 'is_final')
                         )
-                        response_text = full_response.text.strip()
-                        
-                        # Add model response to history
-                        chat_session.add_message("model", response_text)
-                        
-                        # Send response start indicator
-                        await send_message(websocket, 'response_start', {
-                            'session_id': session_id,
-                            'total_length': len(response_text)
-                        })
-                        
-                        # Simulate streaming by sending chunks
-                        words = response_text.split()
-                        current_chunk = ""
-                        chunk_count = 0
-                        
-                        for i, word in enumerate(words):
-                            current_chunk += word + " "
-                            
-                            # Send chunk every 3-5 words or at end
-                            if (i + 1) % 4 == 0 or i == len(words) - 1:
-                                chunk_count += 1
-                                chunk_text = current_chunk.strip()
-                                
-                                await send_message(websocket, 'chunk', {
-                                    'text': chunk_text,
-                                    'chunk_number': chunk_count,
-                                    'is_final': i == len(words) - 1,
-                                    'session_id': session_id
-                                })
-                                
-                                print_chunk_sent(connection_id, chunk_count, chunk_text)
-                                current_chunk = ""
-                                
-                                # Simulate natural typing delay
-                                await asyncio.sleep(0.1)
-                        
-                        # Send completion info
-                        total_time = time.time() - start_time
-                        await send_message(websocket, 'response_complete', {
-                            'total_chunks': chunk_count,
-                            'processing_time': round(total_time, 3),
-                            'message_count': chat_session.get_message_count(),
-                            'session_id': session_id,
-                            'full_response': response_text
-                        })
-                        
-                        # Update statistics
-                        chat_stats['successful_requests'] += 1
-                        chat_stats['total_response_time'] += total_time
-                        
-                        # Broadcast session update to other clients
-                        await broadcast_session_update(session_id, 'message_added', {
-                            'message_count': chat_session.get_message_count(),
-                            'last_message_preview': user_message[:50] + ('...' if len(user_message) > 50 else '')
-                        })
-                        
-                    except Exception as e:
-                        chat_stats['failed_requests'] += 1
-                        await send_message(websocket, 'error', {
-                            'message': f'Error generating response: {str(e)}',
-                            'session_id': session_id
-                        })
-                        print(f"{Fore.RED}❌ Error in chat generation: {e}{Style.RESET_ALL}")
+                    }
+                    turn_streams[turn_id] = turn
+                    
+                    # Run the turn in the background so this loop keeps serving pings, typing
+                    # indicators, cancels and turns for other sessions on the same socket
+                    task = asyncio.create_task(run_chat_turn(turn, chat_session, user_message), name=turn_id)
+                    task.add_done_callback(functools.partial(finish_turn, turn))
+                    turn['task'] = task
+                    connection_turns[connection_id][request_id] = (session_id, task)
                 
-                elif message_type == 'typing_start':
-                    # Handle typing indicator
-                    session_id = connection_sessions.get(connection_id)
-                    if session_id:
-                        await broadcast_session_update(session_id, 'user_typing', {
-                            'connection_id': connection_id,
-                            'typing': True
-                        })
+                elif message_type == 'resume':
+                    # Replay a turn's missed chunks after reconnecting, then continue with the live tail
+                    await resume_turn(
+                        websocket, connection_id, request_id,
+                        message.get('turn_id'), int(message.get('last_chunk_number') or 0)
+                    )
+                
+                elif message_type == 'cancel':
+                    # Cancel one turn (target_request_id), every turn of a session, or every turn on this socket
+                    cancelled = cancel_turns(
+                        connection_id,
+                        request_id=message.get('target_request_id'),
+                        session_id=message.get('session_id')
+                    )
+                    if not cancelled:
+                        await send_message(websocket, 'error', {
+                            'message': 'No matching turn in flight'
+                        }, request_id)
                 
-                elif message_type == 'typing_stop':
-                    # Handle typing stop
-                    session_id = connection_sessions.get(connection_id)
-                    if session_id:
+                elif message_type == 'typing_start' or message_type == 'typing_stop':
+                    # Handle typing indicator for the given session, or every session this connection joined
+                    session_ids = [message['session_id']] if message.get('session_id') else list(connection_joined_sessions.get(connection_id, ()))
+                    for session_id in session_ids:
                         await broadcast_session_update(session_id, 'user_typing', {
                             'connection_id': connection_id,
-                            'typing': False
+                            'typing': message_type == 'typing_start'
                         })
                 
                 else:
                     await send_message(websocket, 'error', {
                         'message': f'Unknown message type: {message_type}'
-                    })
+                    }, request_id)
                     
-            except json.JSONDecodeError:
+            except FrameDecodeError:
                 await send_message(websocket, 'error', {
-                    'message': 'Invalid JSON format'
+                    'message': f'Invalid {codec.name} frame format'
                 })
             except Exception as e:
                 await send_message(websocket, 'error', {
                     'message': f'Server error: {str(e)}'
-                })
+                }, request_id)
                 print(f"{Fore.RED}❌ WebSocket error: {e}{Style.RESET_ALL}")
                 
     except WebSocketDisconnect:
-        print_websocket_disconnect(connection_id, "Client disconnected")
+        # Reaped connections were already reported when the reaper closed them
+        if connection_id in websocket_connections:
+            print_websocket_disconnect(connection_id, "Client disconnected")
     except Exception as e:
-        print_websocket_disconnect(connection_id, f"Error: {str(e)}")
-    finally:
-        # Clean up connection
         if connection_id in websocket_connections:
-            del websocket_connections[connection_id]
-        if connection_id in connection_sessions:
-            session_id = connection_sessions[connection_id]
-            del connection_sessions[connection_id]
-            
-            # Notify other clients about disconnection
-            try:
-                await broadcast_session_update(session_id, 'user_disconnected', {
-                    'connection_id': connection_id
-                })
-            except:
-                pass
-        
-        chat_stats['websocket_connections'] = max(0, chat_stats['websocket_connections'] - 1)
+            print_websocket_disconnect(connection_id, f"Error: {str(e)}")
+    finally:
+        await cleanup_connection(connection_id)
 
 @app.post("/sessions/new", response_model=NewSessionResponse)
 async def create_session_http(request: NewSessionRequest):
@@ -573,26 +1105,29 @@ async def create_session_http(request: NewSessionRequest):
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 @app.get("/sessions/{session_id}", response_model=SessionInfoResponse)
-async def get_session_info(session_id: str):
+async def get_session_info(session_id: str, request: Request):
     """
     Get information about a specific session
     """
     if session_id not in chat_sessions:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    chat_session = chat_sessions[session_id]
-    metadata = session_metadata[session_id]
-    summary = chat_session.get_conversation_summary()
-    
-    return SessionInfoResponse(
-        session_id=session_id,
-        model=summary['model_id'],
-        message_count=summary['total_messages'],
-        session_duration_seconds=summary['session_duration_seconds'],
-        user_messages=summary['user_messages'],
-        model_messages=summary['model_messages'],
-        created_at=metadata['created_at'].isoformat()
-    )
+    def build():
+        chat_session = chat_sessions[session_id]
+        metadata = session_metadata[session_id]
+        summary = chat_session.get_conversation_summary()
+        
+        return SessionInfoResponse(
+            session_id=session_id,
+            model=summary['model_id'],
+            message_count=summary['total_messages'],
+            session_duration_seconds=summary['session_duration_seconds'],
+            user_messages=summary['user_messages'],
+            model_messages=summary['model_messages'],
+            created_at=metadata['created_at'].isoformat()
+        )
+    
+    return conditional_cache.respond(request, f'session:{session_id}', resource_versions.session_version(session_id), build)
 
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
@@ -610,6 +1145,10 @@ async def delete_session(session_id: str):
     
     del chat_sessions[session_id]
     del session_metadata[session_id]
+    resource_versions.remove_session(session_id)
+    session_index.remove(session_id)
+    conditional_cache.forget(f'session:{session_id}')
+    session_locks.pop(session_id, None)
     
     return {"message": f"Session {session_id} deleted successfully"}
 
@@ -623,6 +1162,8 @@ async def clear_session(session_id: str):
     
     chat_sessions[session_id].clear_history()
     session_metadata[session_id]['last_activity'] = datetime.now()
+    resource_versions.bump_session(session_id)
+    session_index.touch(session_id, session_metadata[session_id]['last_activity'])
     
     # Notify connected clients
     try:
@@ -633,29 +1174,43 @@ async def clear_session(session_id: str):
     return {"message": f"Session {session_id} history cleared successfully"}
 
 @app.get("/sessions")
-async def list_sessions():
+async def list_sessions(request: Request,
+                        limit: int = Query(SESSIONS_PAGE_SIZE, ge=1, le=SESSIONS_MAX_PAGE_SIZE),
+                        cursor: Optional[str] = None,
+                        model: Optional[str] = None,
+                        sort: str = Query('created_at', pattern='^(created_at|last_activity)$'),
+                        order: str = Query('asc', pattern='^(asc|desc)$')):
     """
-    List all active sessions
+    List active sessions one page at a time, optionally filtered by model
     """
-    sessions = []
-    for session_id, metadata in session_metadata.items():
-        chat_session = chat_sessions[session_id]
-        summary = chat_session.get_conversation_summary()
+    def build():
+        try:
+            session_ids, next_cursor, total = session_index.page(sort, order, model, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Count connected clients for this session
-        connected_clients = sum(1 for conn_session in connection_sessions.values() if conn_session == session_id)
+        sessions = []
+        for session_id in session_ids:
+            chat_session = chat_sessions[session_id]
+            metadata = session_metadata[session_id]
+            summary = chat_session.get_conversation_summary()
+            
+            # Count connected clients for this session
+            connected_clients = sum(1 for joined in connection_joined_sessions.values() if session_id in joined)
+            
+            sessions.append({
+                "session_id": session_id,
+                "model": summary['model_id'],
+                "message_count": summary['total_messages'],
+                "duration_minutes": summary['session_duration_minutes'],
+                "connected_clients": connected_clients,
+                "created_at": metadata['created_at'].isoformat(),
+                "last_activity": metadata['last_activity'].isoformat()
+            })
         
-        sessions.append({
-            "session_id": session_id,
-            "model": summary['model_id'],
-            "message_count": summary['total_messages'],
-            "duration_minutes": summary['session_duration_minutes'],
-            "connected_clients": connected_clients,
-            "created_at": metadata['created_at'].isoformat(),
-            "last_activity": metadata['last_activity'].isoformat()
-        })
-    
-    return {"active_sessions": len(sessions), "sessions": sessions}
+        return {"active_sessions": total, "sessions": sessions, "next_cursor": next_cursor}
+    
+    return conditional_cache.respond(request, f'sessions?{request.url.query}', resource_versions.sessions_version, build)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check(request: Request):
@@ -675,38 +1230,67 @@ async def health_check(request: Request):
     print(f"  WebSocket Connections: {Fore.MAGENTA}{len(websocket_connections)}{Style.RESET_ALL}")
     print(f"{Fore.BLUE}└────────────────────────────────────────────────────────────┘{Style.RESET_ALL}")
     
-    return HealthResponse(
-        status='healthy',
-        model=MODEL_ID,
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        active_sessions=len(chat_sessions),
-        websocket_connections=len(websocket_connections)
-    )
+    def build():
+        return HealthResponse(
+            status='healthy',
+            model=MODEL_ID,
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            active_sessions=len(chat_sessions),
+            websocket_connections=len(websocket_connections)
+        )
+    
+    return conditional_cache.respond(request, 'health', resource_versions.stats_version, build)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Request metrics in the Prometheus text format
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 @app.get("/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request):
     """
     Detailed statistics endpoint
     """
-    uptime = datetime.now() - chat_stats['start_time']
-    avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
-                        if chat_stats['successful_requests'] > 0 else 0)
+    def build():
+        uptime = datetime.now() - chat_stats['start_time']
+        avg_response_time = (chat_stats['total_response_time'] / chat_stats['successful_requests'] 
+                            if chat_stats['successful_requests'] > 0 else 0)
+        
+        return StatsResponse(
+            uptime_seconds=int(uptime.total_seconds()),
+            total_requests=chat_stats['total_requests'],
+            successful_requests=chat_stats['successful_requests'],
+            failed_requests=chat_stats['failed_requests'],
+            cancelled_requests=chat_stats['cancelled_requests'],
+            average_response_time=round(avg_response_time, 3),
+            model=MODEL_ID,
+            start_time=chat_stats['start_time'].isoformat(),
+            active_sessions=len(chat_sessions),
+            total_sessions_created=chat_stats['total_sessions_created'],
+            websocket_connections=len(websocket_connections),
+            active_turns=sum(len(turns) for turns in connection_turns.values()),
+            bytes_sent=chat_stats['bytes_sent'],
+            bytes_received=chat_stats['bytes_received'],
+            frames_sent=chat_stats['frames_sent'],
+            frames_received=chat_stats['frames_received'],
+            encodings=encoding_stats,
+            heartbeats_sent=chat_stats['heartbeats_sent'],
+            reaped_idle_connections=chat_stats['reaped_idle_connections'],
+            reaped_unresponsive_connections=chat_stats['reaped_unresponsive_connections'],
+            resumable_turns=len(turn_streams),
+            resume_buffer_bytes=resume_buffer_bytes,
+            resumed_turns=chat_stats['resumed_turns'],
+            replayed_chunks=chat_stats['replayed_chunks'],
+            resume_misses=chat_stats['resume_misses'],
+            resume_buffers_evicted=chat_stats['resume_buffers_evicted']
+        )
     
-    return StatsResponse(
-        uptime_seconds=int(uptime.total_seconds()),
-        total_requests=chat_stats['total_requests'],
-        successful_requests=chat_stats['successful_requests'],
-        failed_requests=chat_stats['failed_requests'],
-        average_response_time=round(avg_response_time, 3),
-        model=MODEL_ID,
-        start_time=chat_stats['start_time'].isoformat(),
-        active_sessions=len(chat_sessions),
-        total_sessions_created=chat_stats['total_sessions_created'],
-        websocket_connections=len(websocket_connections)
-    )
+    return conditional_cache.respond(request, 'stats', resource_versions.stats_version, build)
 
 @app.get("/demo", response_class=HTMLResponse)
 async def demo_page():
@@ -872,6 +1456,11 @@ async def demo_page():
                         case 'pong':
                             // Handle ping/pong
                             break;
+                            
+                        case 'ping':
+                            // Answer server heartbeats so the connection is not reaped
+                            ws.send(JSON.stringify({type: 'pong'}));
+                            break;
                     }
                 };
                 
@@ -976,6 +1565,7 @@ async def root():
         "framework": "FastAPI + WebSockets",
         "model": MODEL_ID,
         "features": ["multi-turn conversations", "real-time bidirectional communication", "session management", "typing indicators"],
+        "encodings": list(CODECS),
         "endpoints": {
             "websocket": "WS /ws",
             "new_session": "POST /sessions/new",
@@ -998,7 +1588,8 @@ if __name__ == '__main__':
             host='0.0.0.0', 
             port=8000, 
             log_level='info',
-            access_log=False  # We handle our own logging
+            access_log=False,  # We handle our own logging
+            ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE
         )
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}👋 WebSocket Server interrupted by user{Style.RESET_ALL}")
\ No newline at end of file
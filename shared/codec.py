@@ -0,0 +1,193 @@
+from shared.serialization import dumps
+from typing import Optional
+from typing import Union
+from typing import Dict
+from typing import List
+from typing import Any
+import json
+
+try:
+    import msgpack
+except ImportError:  # MessagePack frames are optional
+    msgpack = None
+
+
+# Fields that compact (binary) encodings leave out because the client already has them:
+# chunks belong to the session and turn announced in `response_start`, and `response_complete`
+# does not need to resend text the client just assembled from the chunks.
+COMPACT_DROP_FIELDS: Dict[str, tuple] = {
+    'chunk': ('session_id', 'turn_id', 'timestamp'),
+    'response_complete': ('full_response',)
+}
+
+
+class FrameDecodeError(ValueError):
+    """
+    Raised when a received frame cannot be decoded with the negotiated encoding.
+    """
+
+
+class FrameCodec:
+    """
+    Base class for a WebSocket frame encoding negotiated during the connect handshake.
+    """
+
+    name: str = ''
+    subprotocol: str = ''
+    binary: bool = False
+    compact: bool = False
+
+    def prepare(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Strip redundant fields from an outgoing message when the encoding is compact.
+
+        Args:
+            message (Dict[str, Any]): The message to send.
+
+        Returns:
+            Dict[str, Any]: The message that should actually be encoded.
+        """
+        drop = COMPACT_DROP_FIELDS.get(message.get('type')) if self.compact else None
+        if not drop:
+            return message
+        return {key: value for key, value in message.items() if key not in drop}
+
+    def encode(self, message: Dict[str, Any]) -> Union[str, bytes]:
+        """
+        Encode a message into a frame payload.
+
+        Args:
+            message (Dict[str, Any]): The message to encode.
+
+        Returns:
+            Union[str, bytes]: A text payload for text encodings, bytes for binary ones.
+        """
+        raise NotImplementedError
+
+    def decode(self, data: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        Decode a frame payload into a message.
+
+        Args:
+            data (Union[str, bytes]): The received frame payload.
+
+        Returns:
+            Dict[str, Any]: The decoded message.
+
+        Raises:
+            FrameDecodeError: If the payload cannot be decoded.
+        """
+        raise NotImplementedError
+
+
+class JsonCodec(FrameCodec):
+    """
+    JSON text frames (the default, and what browsers and the demo page speak).
+    """
+
+    name = 'json'
+    subprotocol = 'chat.json'
+
+    def encode(self, message: Dict[str, Any]) -> str:
+        return dumps(self.prepare(message))
+
+    def decode(self, data: Union[str, bytes]) -> Dict[str, Any]:
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise FrameDecodeError(f"Invalid JSON frame: {e}")
+
+
+class MsgpackCodec(FrameCodec):
+    """
+    MessagePack binary frames with redundant per-chunk fields removed.
+    """
+
+    name = 'msgpack'
+    subprotocol = 'chat.msgpack'
+    binary = True
+    compact = True
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        return msgpack.packb(self.prepare(message), use_bin_type=True)
+
+    def decode(self, data: Union[str, bytes]) -> Dict[str, Any]:
+        # Peers may still send plain JSON text frames (e.g. hand-written control messages)
+        if isinstance(data, str):
+            return JSON_CODEC.decode(data)
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except Exception as e:
+            raise FrameDecodeError(f"Invalid MessagePack frame: {e}")
+
+
+JSON_CODEC = JsonCodec()
+
+CODECS: Dict[str, FrameCodec] = {JSON_CODEC.name: JSON_CODEC}
+if msgpack is not None:
+    CODECS[MsgpackCodec.name] = MsgpackCodec()
+
+
+def get_codec(name: Optional[str]) -> FrameCodec:
+    """
+    Look up a frame codec by name, falling back to JSON.
+
+    Args:
+        name (Optional[str]): The encoding name, e.g. 'json' or 'msgpack'.
+
+    Returns:
+        FrameCodec: The matching codec, or the JSON codec if it is unknown or unavailable.
+    """
+    return CODECS.get((name or '').lower(), JSON_CODEC)
+
+
+def get_codec_for_subprotocol(subprotocol: Optional[str]) -> FrameCodec:
+    """
+    Look up the codec for a negotiated WebSocket subprotocol.
+
+    Args:
+        subprotocol (Optional[str]): The subprotocol selected by the server, if any.
+
+    Returns:
+        FrameCodec: The matching codec, or the JSON codec if none was negotiated.
+    """
+    for codec in CODECS.values():
+        if codec.subprotocol == subprotocol:
+            return codec
+    return JSON_CODEC
+
+
+def negotiate_codec(offered_subprotocols: List[str], requested_encoding: Optional[str] = None) -> tuple[FrameCodec, Optional[str]]:
+    """
+    Pick the frame encoding for a new connection.
+
+    Subprotocols offered in the handshake win, in the client's order of preference.
+    Otherwise an explicit encoding name (e.g. from a query parameter) is honoured.
+
+    Args:
+        offered_subprotocols (List[str]): Values of the client's Sec-WebSocket-Protocol header.
+        requested_encoding (Optional[str]): Encoding name requested outside the subprotocol header.
+
+    Returns:
+        tuple[FrameCodec, Optional[str]]: The codec and the subprotocol to echo back (None if not offered).
+    """
+    for subprotocol in offered_subprotocols:
+        for codec in CODECS.values():
+            if codec.subprotocol == subprotocol:
+                return codec, subprotocol
+    return get_codec(requested_encoding), None
+
+
+def payload_size(data: Union[str, bytes]) -> int:
+    """
+    Size in bytes of a frame payload.
+
+    Args:
+        data (Union[str, bytes]): A text or binary payload.
+
+    Returns:
+        int: The number of bytes the payload occupies before transport compression.
+    """
+    if isinstance(data, str):
+        return len(data.encode('utf-8'))
+    return len(data)
@@ -0,0 +1,343 @@
+from typing import Callable
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+import asyncio
+import time
+import zlib
+import os
+
+try:
+    import brotli
+except ImportError:  # br is optional: pip install brotli
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional: pip install zstandard
+    zstandard = None
+
+
+# Encodings in server preference order; unavailable ones are skipped. Empty disables compression.
+COMPRESSION_ENCODINGS = [encoding.strip() for encoding in os.environ.get('COMPRESSION_ENCODINGS', 'zstd,br,gzip').split(',') if encoding.strip()]
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))  # bytes; smaller non-streaming bodies go out as-is
+COMPRESSION_FLUSH_MS = float(os.environ.get('COMPRESSION_FLUSH_MS', '0'))   # 0 flushes every streamed chunk; >0 coalesces chunks for up to this long
+
+# Responses compressed incrementally from their first byte; any other body sent in several parts is too
+STREAMING_CONTENT_TYPES = ('text/event-stream', 'application/x-ndjson')
+
+
+class StreamCompressor:
+    """
+    Incremental compressor whose output can be flushed at any chunk boundary.
+    """
+
+    encoding: str = None
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def flush(self) -> bytes:
+        """
+        Emit everything compressed so far as a complete, decodable block (the stream stays open).
+        """
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        """
+        End the compressed stream.
+        """
+        raise NotImplementedError
+
+
+class GzipCompressor(StreamCompressor):
+    encoding = 'gzip'
+
+    def __init__(self, level: int = 6):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 writes the gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(StreamCompressor):
+    encoding = 'br'
+
+    def __init__(self, quality: int = 5):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class ZstdCompressor(StreamCompressor):
+    encoding = 'zstd'
+
+    def __init__(self, level: int = 3):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+COMPRESSORS: Dict[str, Callable[[], StreamCompressor]] = {'gzip': GzipCompressor}
+if brotli is not None:
+    COMPRESSORS['br'] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS['zstd'] = ZstdCompressor
+
+
+def negotiate_encoding(accept_encoding: str, preferences: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick a content-coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): The request's Accept-Encoding header value.
+        preferences (Optional[List[str]]): Server preference order; defaults to COMPRESSION_ENCODINGS.
+
+    Returns:
+        Optional[str]: The chosen encoding, or None to send the response uncompressed.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    candidates = [encoding for encoding in (preferences if preferences is not None else COMPRESSION_ENCODINGS) if encoding in COMPRESSORS]
+    best, best_weight = None, 0.0
+    for encoding in candidates:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:  # Ties keep the server's preferred (earlier) encoding
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionStats:
+    """
+    Bytes in and out and compression CPU time per encoding.
+    """
+
+    def __init__(self):
+        self.encodings: Dict[str, Dict[str, float]] = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float, streamed: Optional[bool] = None):
+        """
+        Add compression work to an encoding's totals; ``streamed`` is set once per compressed response.
+        """
+        entry = self.encodings.setdefault(encoding, {'responses': 0, 'streamed_responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_seconds': 0.0})
+        entry['bytes_in'] += bytes_in
+        entry['bytes_out'] += bytes_out
+        entry['cpu_seconds'] += cpu_seconds
+        if streamed is not None:
+            entry['responses'] += 1
+            entry['streamed_responses'] += int(streamed)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-encoding totals plus compression ratio and CPU cost per MiB of input.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Keyed by encoding.
+        """
+        summary = {}
+        for encoding, entry in self.encodings.items():
+            summary[encoding] = {
+                **entry,
+                'cpu_seconds': round(entry['cpu_seconds'], 6),
+                'ratio': round(entry['bytes_in'] / entry['bytes_out'], 3) if entry['bytes_out'] else 0.0,
+                'cpu_ms_per_mib': round(entry['cpu_seconds'] * 1000 / (entry['bytes_in'] / 1048576), 3) if entry['bytes_in'] else 0.0
+            }
+        return summary
+
+
+# Shared by every CompressionMiddleware in the process; the servers report it from /stats
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware for negotiated gzip/br/zstd content-encoding.
+
+    Streaming responses (SSE, NDJSON, or any body sent in several parts) are compressed
+    incrementally and flushed at every chunk, or at most every ``flush_ms`` milliseconds when coalescing, so a compressed
+    stream reaches the client as promptly as an uncompressed one. Other responses are
+    compressed whole once they reach ``minimum_size`` bytes.
+    """
+
+    def __init__(self, app: Any, minimum_size: int = COMPRESSION_MIN_SIZE, flush_ms: float = COMPRESSION_FLUSH_MS, encodings: Optional[List[str]] = None, stats: CompressionStats = compression_stats):
+        """
+        Args:
+            app (Any): The ASGI application to wrap.
+            minimum_size (int): Smallest non-streaming body worth compressing.
+            flush_ms (float): Coalescing window for streamed chunks; 0 flushes every chunk.
+            encodings (Optional[List[str]]): Encodings in preference order; defaults to COMPRESSION_ENCODINGS.
+            stats (CompressionStats): Where to record compression cost.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.flush_seconds = flush_ms / 1000
+        self.encodings = encodings if encodings is not None else COMPRESSION_ENCODINGS
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ''
+        for name, value in scope.get('headers', []):
+            if name == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        try:
+            await self.app(scope, receive, responder.send)
+        finally:
+            responder.cancel_flush()
+
+
+class CompressionResponder:
+    """
+    Per-response state for CompressionMiddleware.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Callable):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[dict] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.mode: Optional[str] = None  # 'identity', 'whole' or 'stream'
+        self.send_lock = asyncio.Lock()
+        self.flush_task: Optional[asyncio.Task] = None
+        self.pending = False  # Compressed data is waiting for a coalesced flush
+        self.last_flush = 0.0
+
+    def timed(self, operation: Callable[..., bytes], data: bytes = None) -> bytes:
+        started = time.thread_time()
+        output = operation(data) if data is not None else operation()
+        self.middleware.stats.record(self.encoding, len(data) if data else 0, len(output), time.thread_time() - started, None)
+        return output
+
+    def cancel_flush(self):
+        if self.flush_task is not None and not self.flush_task.done():
+            self.flush_task.cancel()
+
+    def start_headers(self, streamed: bool) -> List[tuple]:
+        headers = []
+        for name, value in self.start_message.get('headers', []):
+            if name == b'content-length':
+                continue
+            if name == b'etag' and not value.startswith(b'W/'):
+                # The encoded bytes differ from the ones the strong tag names (same approach as nginx)
+                value = b'W/' + value
+            headers.append((name, value))
+        headers.append((b'content-encoding', self.encoding.encode('latin-1')))
+        headers.append((b'vary', b'Accept-Encoding'))
+        self.compressor = COMPRESSORS[self.encoding]()
+        self.middleware.stats.record(self.encoding, 0, 0, 0.0, streamed)
+        return headers
+
+    async def send(self, message: dict):
+        if message['type'] == 'http.response.start':
+            headers = dict(message.get('headers', []))
+            content_type = headers.get(b'content-type', b'').decode('latin-1').split(';')[0].strip()
+            self.start_message = message
+            if b'content-encoding' in headers or message.get('status', 200) in (204, 304):
+                self.mode = 'identity'
+                await self.downstream(message)
+            elif content_type in STREAMING_CONTENT_TYPES:
+                self.mode = 'stream'
+                await self.downstream({**message, 'headers': self.start_headers(streamed=True)})
+            else:
+                self.mode = 'whole'  # Wait for the body to decide whether it is worth compressing
+            return
+
+        if message['type'] != 'http.response.body' or self.mode == 'identity':
+            await self.downstream(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self.mode == 'whole' and more_body:
+            # A body sent in parts is a stream whatever its content type (e.g. SSE served as text/plain)
+            self.mode = 'stream'
+            await self.downstream({**self.start_message, 'headers': self.start_headers(streamed=True)})
+
+        if self.mode == 'whole':
+            if len(body) < self.middleware.minimum_size:
+                await self.downstream(self.start_message)
+                await self.downstream({'type': 'http.response.body', 'body': body})
+                return
+            headers = self.start_headers(streamed=False)
+            compressed = self.timed(self.compressor.compress, body) + self.timed(self.compressor.finish)
+            headers.append((b'content-length', str(len(compressed)).encode('latin-1')))
+            await self.downstream({**self.start_message, 'headers': headers})
+            await self.downstream({'type': 'http.response.body', 'body': compressed})
+            return
+
+        async with self.send_lock:
+            output = self.timed(self.compressor.compress, body) if body else b''
+            if not more_body:
+                self.cancel_flush()
+                self.pending = False
+                await self.downstream({'type': 'http.response.body', 'body': output + self.timed(self.compressor.finish)})
+            elif time.monotonic() - self.last_flush >= self.middleware.flush_seconds:
+                # Outside a coalescing window (always, when flush_ms is 0): flush right away
+                self.pending = False
+                self.last_flush = time.monotonic()
+                await self.downstream({'type': 'http.response.body', 'body': output + self.timed(self.compressor.flush), 'more_body': True})
+            else:
+                if output:
+                    await self.downstream({'type': 'http.response.body', 'body': output, 'more_body': True})
+                self.pending = True
+                if self.flush_task is None or self.flush_task.done():
+                    self.flush_task = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        """
+        Flush coalesced chunks once the current window closes.
+        """
+        await asyncio.sleep(max(0.0, self.last_flush + self.middleware.flush_seconds - time.monotonic()))
+        async with self.send_lock:
+            if self.pending:
+                self.pending = False
+                self.last_flush = time.monotonic()
+                try:
+                    await self.downstream({'type': 'http.response.body', 'body': self.timed(self.compressor.flush), 'more_body': True})
+                except Exception:
+                    pass  # The client went away; the response task will notice on its next send
@@ -0,0 +1,171 @@
+from fastapi.encoders import jsonable_encoder
+from shared.serialization import FastJSONResponse
+from collections import OrderedDict
+from fastapi import Response
+from fastapi import Request
+from typing import Callable
+from typing import Optional
+from typing import Dict
+from typing import Any
+import itertools
+import time
+import uuid
+import os
+
+
+ETAG_MAX_AGE = float(os.environ.get('ETAG_MAX_AGE', '10'))        # seconds a cached body may serve time-derived fields (uptime, durations)
+ETAG_CACHE_SIZE = int(os.environ.get('ETAG_CACHE_SIZE', '1024'))  # cached representations kept (LRU)
+
+
+class ResourceVersions:
+    """
+    Version counters for the state behind the polling endpoints.
+
+    Every session has its own version; the sessions list and the server stats each
+    have a global one. Versions are bumped at each mutation, so checking whether a
+    cached representation is still current costs one dict lookup. New versions are
+    drawn from one shared clock, which keeps them unique even when sessions change
+    from worker threads (no read-modify-write to lose).
+    """
+
+    def __init__(self):
+        self.clock = itertools.count(1)
+        self.sessions: Dict[str, int] = {}
+        self.sessions_version = 0
+        self.stats_version = 0
+
+    def session_version(self, session_id: str) -> int:
+        return self.sessions.get(session_id, 0)
+
+    def bump_session(self, session_id: str):
+        """
+        Record a change to a session (history, metadata); the sessions list changes with it.
+
+        Args:
+            session_id (str): The session that changed.
+        """
+        version = next(self.clock)
+        self.sessions[session_id] = version
+        self.sessions_version = version
+
+    def remove_session(self, session_id: str):
+        """
+        Record that a session went away.
+
+        Args:
+            session_id (str): The deleted session.
+        """
+        self.sessions.pop(session_id, None)
+        self.sessions_version = self.stats_version = next(self.clock)
+
+    def bump_stats(self):
+        self.stats_version = next(self.clock)
+
+    def watch(self, session_id: str, chat_session: Any):
+        """
+        Bump a session's version whenever its chat history changes.
+
+        Args:
+            session_id (str): The session ID.
+            chat_session (Any): The session's ChatSession.
+        """
+        chat_session.on_change = lambda _: self.bump_session(session_id)
+        self.bump_session(session_id)
+
+
+class VersionedStats(dict):
+    """
+    Stats dict that bumps the stats version on every assignment (including ``+=``).
+    """
+
+    def __init__(self, versions: ResourceVersions, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.versions = versions
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.versions.bump_stats()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag (RFC 9110 13.1.2).
+
+    Args:
+        if_none_match (Optional[str]): The request header value.
+        etag (str): The current entity tag.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ConditionalCache:
+    """
+    Encoded JSON bodies with strong ETags, reused until their version moves on.
+
+    A body is rebuilt only when the caller's version has changed or it is older than
+    ``max_age`` (so time-derived fields such as uptime stay reasonably fresh). The ETag
+    names one exact body, and a matching If-None-Match gets a 304 without rebuilding.
+    """
+
+    def __init__(self, max_age: float = ETAG_MAX_AGE, max_entries: int = ETAG_CACHE_SIZE):
+        """
+        Args:
+            max_age (float): Seconds a body may be reused while its version is unchanged.
+            max_entries (int): Representations kept before the least recently used is dropped.
+        """
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()  # key -> (version, rendered_at, etag, body)
+        self.epoch = uuid.uuid4().hex[:8]  # ETags from an earlier process never match
+        self.renders = 0
+        self.stats = {'not_modified': 0, 'reused': 0, 'rendered': 0}
+
+    def forget(self, key: str):
+        self.entries.pop(key, None)
+
+    def respond(self, request: Request, key: str, version: int, build: Callable[[], Any]) -> Response:
+        """
+        Answer a GET with a cached or freshly built JSON body, or 304.
+
+        Args:
+            request (Request): The incoming request (for If-None-Match).
+            key (str): Cache key identifying the representation (e.g. 'sessions', 'session:<id>').
+            version (int): Current version of the state behind the representation.
+            build (Callable[[], Any]): Builds the payload (a model or JSON-compatible data) when needed.
+
+        Returns:
+            Response: 304 Not Modified or 200 with the JSON body; both carry the ETag.
+        """
+        now = time.monotonic()
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version or now - entry[1] > self.max_age:
+            body = FastJSONResponse(jsonable_encoder(build())).body
+            self.renders += 1
+            entry = (version, now, f'"{self.epoch}-{version}-{self.renders}"', body)
+            self.entries[key] = entry
+            self.stats['rendered'] += 1
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.stats['reused'] += 1
+        self.entries.move_to_end(key)
+
+        headers = {'ETag': entry[2], 'Cache-Control': 'no-cache'}
+        if etag_matches(request.headers.get('if-none-match'), entry[2]):
+            self.stats['not_modified'] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry[3], media_type='application/json', headers=headers)
@@ -0,0 +1,148 @@
+from shared.serialization import dumps
+from typing import Callable
+from typing import Optional
+from typing import Dict
+from typing import Set
+from typing import Any
+import asyncio
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of encoded events for a single session.
+    """
+
+    def __init__(self, bus: 'SessionEventBus', session_id: str, max_queue: int):
+        self.bus = bus
+        self.session_id = session_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False  # Set when the subscriber fell too far behind
+        self.closed = False   # Set when the subscriber left or the session went away
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        if (self.dropped or self.closed) and self.queue.empty():
+            raise StopAsyncIteration
+        encoded = await self.queue.get()
+        if encoded is None:
+            raise StopAsyncIteration
+        return encoded
+
+    def close(self):
+        """
+        Stop receiving events and leave the bus.
+        """
+        self.bus.unsubscribe(self)
+
+
+class SessionEventBus:
+    """
+    In-process, session-scoped publish/subscribe bus.
+
+    Each event is encoded once per publish and the same string is handed to every
+    subscriber of the session. Subscribers get bounded queues; one that is full when
+    an event arrives is dropped instead of slowing the producer or growing memory.
+    """
+
+    def __init__(self, max_queue: int = 256, encoder: Callable[[Any], str] = dumps):
+        """
+        Args:
+            max_queue (int): Events buffered per subscriber before it is considered too slow.
+            encoder (Callable[[Any], str]): Serializer applied once per published event.
+        """
+        self.max_queue = max_queue
+        self.encoder = encoder
+        self.subscribers: Dict[str, Set[Subscription]] = {}
+        self.stats = {
+            'events_published': 0,
+            'events_delivered': 0,
+            'subscribers_dropped': 0,
+            'total_subscriptions': 0
+        }
+
+    def subscribe(self, session_id: str) -> Subscription:
+        """
+        Start receiving a session's events.
+
+        Args:
+            session_id (str): The session to follow.
+
+        Returns:
+            Subscription: An async iterator of encoded events; call ``close()`` when done.
+        """
+        subscription = Subscription(self, session_id, self.max_queue)
+        self.subscribers.setdefault(session_id, set()).add(subscription)
+        self.stats['total_subscriptions'] += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a subscription from the bus.
+
+        Args:
+            subscription (Subscription): The subscription to remove.
+        """
+        subscription.closed = True
+        subscribers = self.subscribers.get(subscription.session_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[subscription.session_id]
+
+    def publish(self, session_id: str, event: Dict[str, Any], encoded: Optional[str] = None) -> str:
+        """
+        Fan an event out to every subscriber of a session.
+
+        Args:
+            session_id (str): The session the event belongs to.
+            event (Dict[str, Any]): The event to publish.
+            encoded (Optional[str]): The event already encoded by the caller, if any.
+
+        Returns:
+            str: The encoded event, so producers can reuse it for their own response.
+        """
+        if encoded is None:
+            encoded = self.encoder(event)
+        self.stats['events_published'] += 1
+
+        for subscription in list(self.subscribers.get(session_id, ())):
+            try:
+                subscription.queue.put_nowait(encoded)
+                self.stats['events_delivered'] += 1
+            except asyncio.QueueFull:
+                # Too slow to keep up: it drains what it already has, then its stream ends
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+                self.stats['subscribers_dropped'] += 1
+
+        return encoded
+
+    def close_session(self, session_id: str):
+        """
+        End every subscription of a session (e.g. when the session is deleted).
+
+        Args:
+            session_id (str): The session that went away.
+        """
+        for subscription in list(self.subscribers.get(session_id, ())):
+            self.unsubscribe(subscription)
+            try:
+                subscription.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+
+    def subscriber_count(self, session_id: Optional[str] = None) -> int:
+        """
+        Count live subscriptions.
+
+        Args:
+            session_id (Optional[str]): Count only this session's subscribers if given.
+
+        Returns:
+            int: The number of live subscriptions.
+        """
+        if session_id is not None:
+            return len(self.subscribers.get(session_id, ()))
+        return sum(len(subscribers) for subscribers in self.subscribers.values())
@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+from typing import Iterator
+from typing import Optional
+from typing import Union
+from typing import Any
+import requests
+import os
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx only speaks HTTP/2 when the h2 package is installed)
+except ImportError:  # HTTP/2 clients are optional
+    httpx = None
+
+
+# HTTP version the chat clients use: '1.1' (requests, the default) or '2' (httpx with h2)
+HTTP_VERSION = os.environ.get('HTTP_VERSION', '1.1')
+
+
+@contextmanager
+def translate_errors():
+    """
+    Re-raise httpx transport errors as the requests exceptions the clients already handle.
+    """
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.ConnectError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+    except (httpx.RemoteProtocolError, httpx.ReadError) as e:
+        raise requests.exceptions.ChunkedEncodingError(str(e)) from e
+
+
+class Http2Response:
+    """
+    Wraps an httpx response so client code written against requests keeps working.
+    """
+
+    def __init__(self, response: 'httpx.Response'):
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.http_version = response.http_version
+
+    def json(self) -> Any:
+        with translate_errors():
+            self.response.read()
+        return self.response.json()
+
+    @property
+    def text(self) -> str:
+        with translate_errors():
+            self.response.read()
+        return self.response.text
+
+    @property
+    def content(self) -> bytes:
+        with translate_errors():
+            return self.response.read()
+
+    def iter_lines(self, decode_unicode: bool = True) -> Iterator[str]:
+        with translate_errors():
+            yield from self.response.iter_lines()
+
+    def close(self):
+        self.response.close()
+
+
+class HttpClient:
+    """
+    Connection-reusing HTTP client for the chat clients, speaking HTTP/1.1 or HTTP/2.
+
+    HTTP/1.1 uses a requests.Session (keep-alive); HTTP/2 uses httpx, where every
+    request, including concurrent streams, is multiplexed over a single connection.
+    Plain http:// URLs use cleartext HTTP/2 with prior knowledge (h2c).
+    """
+
+    def __init__(self, http2: bool = False, verify: Union[bool, str] = True):
+        """
+        Args:
+            http2 (bool): Use HTTP/2 if httpx and h2 are installed.
+            verify (Union[bool, str]): TLS verification flag or CA bundle path.
+        """
+        self.http2 = http2 and httpx is not None
+        if self.http2:
+            self.client = httpx.Client(http1=False, http2=True, verify=verify, timeout=None)
+        else:
+            self.client = requests.Session()
+            self.client.verify = verify
+
+    @property
+    def http_version(self) -> str:
+        return 'HTTP/2' if self.http2 else 'HTTP/1.1'
+
+    def request(self, method: str, url: str, stream: bool = False, timeout: Optional[float] = None, **kwargs) -> Union[requests.Response, Http2Response]:
+        """
+        Send a request; with ``stream=True`` the body is read lazily via ``iter_lines()``.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Absolute URL.
+            stream (bool): Don't read the body up front.
+            timeout (Optional[float]): Timeout in seconds.
+            **kwargs: ``json``, ``headers``, ``params`` and similar request options.
+
+        Returns:
+            Union[requests.Response, Http2Response]: A response with the requests-style interface.
+        """
+        if not self.http2:
+            return self.client.request(method, url, stream=stream, timeout=timeout, **kwargs)
+
+        with translate_errors():
+            request = self.client.build_request(method, url, timeout=timeout, **kwargs)
+            response = Http2Response(self.client.send(request, stream=True))
+        if not stream:
+            response.text
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+def create_http_client(http_version: Optional[str] = None) -> HttpClient:
+    """
+    Create the HTTP client a chat client should use.
+
+    Args:
+        http_version (Optional[str]): '1.1' or '2'; defaults to the HTTP_VERSION environment variable.
+
+    Returns:
+        HttpClient: The client, on HTTP/1.1 if HTTP/2 was requested but httpx[http2] is missing.
+    """
+    http2 = (http_version or HTTP_VERSION) in ('2', '2.0', 'h2', 'h2c')
+    if http2 and httpx is None:
+        print("WARNING: HTTP/2 needs httpx[http2] (pip install 'httpx[http2]'); using HTTP/1.1.")
+    return HttpClient(http2=http2, verify=os.environ.get('SSL_CA_BUNDLE', True))
@@ -1,4 +1,5 @@
 from shared.setup import initialize_genai_client
+from typing import Callable
 from typing import Optional
 from colorama import Style 
 from colorama import Fore
@@ -31,8 +32,18 @@ class ChatSession:
         self.model_id = model_id
         self.chat_history: List[Dict[str, Any]] = []
         self.session_start_time = time.time()
+        self.version = 0  # Incremented on every history change
+        self.on_change: Optional[Callable[['ChatSession'], None]] = None
         print(f"{Fore.GREEN}Chat session initialized with model: {model_id}{Style.RESET_ALL}")
-    
+
+    def mark_changed(self) -> None:
+        """
+        Record a history change; call after editing chat_history directly.
+        """
+        self.version += 1
+        if self.on_change is not None:
+            self.on_change(self)
+
     def add_message(self, role: str, content: str) -> None:
         """
         Add a message to the chat history.
@@ -45,6 +56,7 @@ class ChatSession:
             "role": role,
             "parts": [{"text": content}]
         })
+        self.mark_changed()
         print(f"{Fore.CYAN}Added {role} message to chat history{Style.RESET_ALL}")
     
     def get_chat_history(self) -> List[Dict[str, Any]]:
@@ -103,6 +115,7 @@ class ChatSession:
     def clear_history(self) -> None:
         """Clear the chat history."""
         self.chat_history.clear()
+        self.mark_changed()
         print(f"{Fore.YELLOW}Chat history cleared{Style.RESET_ALL}")
     
     def get_message_count(self) -> int:
@@ -162,13 +175,33 @@ def create_chat_session(model_id: str = "gemini-2.0-flash") -> ChatSession:
         print(f"{Fore.RED}Failed to create chat session: {e}{Style.RESET_ALL}")
         raise
 
-def generate_single_response(prompt: str, model_id: str = "gemini-2.0-flash") -> str:
+def build_contents(prompt: str, history: Optional[List[Dict[str, Any]]] = None) -> Any:
+    """
+    Build the model input for a single-shot prompt, optionally preceded by inline history.
+    
+    Args:
+        prompt (str): The prompt for content generation.
+        history (Optional[List[Dict[str, Any]]]): Earlier turns in chat-history form
+            ({"role": "user" | "model", "parts": [{"text": ...}]}).
+    
+    Returns:
+        Any: The prompt itself, or the history followed by the prompt as a user turn.
+    """
+    if not history:
+        return prompt
+    return list(history) + [{"role": "user", "parts": [{"text": prompt}]}]
+
+
+def generate_single_response(prompt: str, model_id: str = "gemini-2.0-flash", client: Optional[genai.Client] = None,
+                             history: Optional[List[Dict[str, Any]]] = None) -> str:
     """
     Generate a single response without maintaining context (original functionality).
     
     Args:
         prompt (str): The prompt for content generation.
         model_id (str): The model ID to use for generation.
+        client (Optional[genai.Client]): A shared client; a new one is created when omitted.
+        history (Optional[List[Dict[str, Any]]]): Inline history sent before the prompt.
     
     Returns:
         str: The generated content.
@@ -177,11 +210,11 @@ def generate_single_response(prompt: str, model_id: str = "gemini-2.0-flash") ->
         Exception: If content generation fails.
     """
     try:
-        client = initialize_genai_client()
+        client = client or initialize_genai_client()
         print(f"{Fore.BLUE}Generating single-turn content using model: {model_id}{Style.RESET_ALL}")
         start_time = time.time()
         
-        response = client.models.generate_content(model=model_id, contents=prompt)
+        response = client.models.generate_content(model=model_id, contents=build_contents(prompt, history))
         
         end_time = time.time()
         elapsed_time = end_time - start_time
@@ -193,4 +226,41 @@ def generate_single_response(prompt: str, model_id: str = "gemini-2.0-flash") ->
         
     except Exception as e:
         print(f"{Fore.RED}Failed to generate content{Style.RESET_ALL}")
-        print(f"{Fore.RED}Exception details: {e}{Style.RESET_ALL}")
\ No newline at end of file
+        print(f"{Fore.RED}Exception details: {e}{Style.RESET_ALL}")
+        raise
+
+
+async def generate_single_response_async(prompt: str, model_id: str = "gemini-2.0-flash", client: Optional[genai.Client] = None,
+                                         history: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Async variant of generate_single_response for servers running on an event loop.
+    
+    Args:
+        prompt (str): The prompt for content generation.
+        model_id (str): The model ID to use for generation.
+        client (Optional[genai.Client]): A shared client; a new one is created when omitted.
+        history (Optional[List[Dict[str, Any]]]): Inline history sent before the prompt.
+    
+    Returns:
+        str: The generated content.
+    
+    Raises:
+        Exception: If content generation fails.
+    """
+    try:
+        client = client or initialize_genai_client()
+        print(f"{Fore.BLUE}Generating single-turn content using model: {model_id}{Style.RESET_ALL}")
+        start_time = time.time()
+        
+        response = await client.aio.models.generate_content(model=model_id, contents=build_contents(prompt, history))
+        
+        elapsed_time = time.time() - start_time
+        response_text = response.text.strip()
+        print(f"{Fore.GREEN}Content generated successfully in {elapsed_time:.2f} seconds{Style.RESET_ALL}")
+        
+        return response_text
+        
+    except Exception as e:
+        print(f"{Fore.RED}Failed to generate content{Style.RESET_ALL}")
+        print(f"{Fore.RED}Exception details: {e}{Style.RESET_ALL}")
+        raise
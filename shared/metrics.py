@@ -0,0 +1,246 @@
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+import asyncio
+import bisect
+import time
+
+
+# Default latency buckets in seconds; long-lived streams land in the upper ones
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Metric:
+    """
+    A named family of samples, one per combination of label values.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.samples: Dict[Tuple[str, ...], object] = {}
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing total.
+    """
+
+    kind = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.samples[labels] = self.samples.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        return [f'{self.name}{_labels(self.labelnames, labels)} {value}' for labels, value in self.samples.items()]
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down, such as RPCs in flight.
+    """
+
+    kind = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        self.samples[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Cumulative-bucket histogram with a running sum and count per label set.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, *labels: str, value: float):
+        sample = self.samples.get(labels)
+        if sample is None:
+            # Per-bucket (not cumulative) counts, plus one overflow slot, the sum and the count
+            sample = self.samples[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        sample[0][bisect.bisect_left(self.buckets, value)] += 1
+        sample[1] += value
+        sample[2] += 1
+
+    def quantile(self, labels: Tuple[str, ...], q: float) -> float:
+        """
+        Estimate a quantile from the buckets (upper bound of the bucket it falls in).
+        """
+        sample = self.samples.get(labels)
+        if not sample or not sample[2]:
+            return 0.0
+        target = q * sample[2]
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), sample[0]):
+            seen += count
+            if seen >= target:
+                return bound if bound != float('inf') else self.buckets[-1]
+        return self.buckets[-1]
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, (counts, total, count) in self.samples.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}')
+            le = 'le="+Inf"'
+            lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {count}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics, rendered in the Prometheus text format.
+
+    Metrics are created once (asking for an existing name returns it) and updated from
+    the event loop thread, so recording a sample is a dict update with no locking.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def _get(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs) -> Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """
+        Returns:
+            str: Every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self.metrics.values():
+            if metric.samples:
+                lines.extend(metric.header())
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# Shared by the HTTP middleware and the gRPC interceptors; each server exposes it at /metrics
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request latency, status codes, response bytes and
+    requests in flight. Routes are labelled with their path template (e.g. /sessions/{session_id}).
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.requests = registry.counter('http_server_requests_total', 'HTTP requests completed.', ('method', 'route', 'status'))
+        self.latency = registry.histogram('http_server_request_duration_seconds', 'HTTP request latency, to the end of the response body.', ('method', 'route'))
+        self.response_bytes = registry.counter('http_server_response_bytes_total', 'HTTP response body bytes sent (after compression).', ('method', 'route'))
+        self.in_flight = registry.gauge('http_server_requests_in_flight', 'HTTP requests being handled.', ('method',))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status = 500
+        sent = 0
+
+        async def counting_send(message):
+            nonlocal status, sent
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                sent += len(message.get('body', b''))
+            await send(message)
+
+        started = time.perf_counter()
+        self.in_flight.inc(method)
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            self.in_flight.dec(method)
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            self.requests.inc(method, route, str(status))
+            self.latency.observe(method, route, value=time.perf_counter() - started)
+            self.response_bytes.inc(method, route, amount=sent)
+
+
+async def start_exporter(host: str, port: int, pages: Dict[str, Callable[[], Tuple[str, str]]]) -> asyncio.AbstractServer:
+    """
+    Serve a few read-only pages (such as /metrics) over plain HTTP/1.1, for processes that
+    have no HTTP server of their own.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind.
+        pages (Dict[str, Callable[[], Tuple[str, str]]]): Path to a callable returning (content type, body).
+
+    Returns:
+        asyncio.AbstractServer: The listening server; close it on shutdown.
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # headers are not needed
+            parts = request_line.decode('latin-1').split()
+            path = parts[1].split('?', 1)[0] if len(parts) >= 2 else ''
+            page: Optional[Callable] = pages.get(path)
+            if page is None:
+                status, content_type, body = '404 Not Found', 'text/plain; charset=utf-8', f"Not found. Pages: {', '.join(pages)}\n"
+            else:
+                status = '200 OK'
+                content_type, body = page()
+            payload = body.encode()
+            writer.write(f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n'
+                         f'Connection: close\r\n\r\n'.encode() + payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,136 @@
+from fastapi.responses import JSONResponse
+from json.encoder import encode_basestring
+from datetime import datetime
+from typing import Iterable
+from typing import Dict
+from typing import Any
+import json
+import time
+import os
+
+try:
+    import orjson
+except ImportError:  # Fast JSON is optional; the stdlib encoder is the fallback
+    orjson = None
+
+
+JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto').lower()  # auto (orjson when installed) or stdlib
+
+USE_ORJSON = orjson is not None and JSON_ENCODER != 'stdlib'
+ENCODER_NAME = 'orjson' if USE_ORJSON else 'stdlib'
+
+
+if USE_ORJSON:
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return _encoder.encode(obj).encode('utf-8')
+
+    def dumps(obj: Any) -> str:
+        return _encoder.encode(obj)
+
+dumps.__doc__ = "Encode an object as compact JSON text with the fastest available encoder."
+dumps_bytes.__doc__ = "Encode an object as compact UTF-8 JSON bytes with the fastest available encoder."
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the shared fast encoder (use as FastAPI's default_response_class).
+    """
+
+    def render(self, content: Any) -> bytes:
+        if not USE_ORJSON:
+            return super().render(content)
+        return dumps_bytes(content)
+
+
+class TimestampFormatter:
+    """
+    ISO-8601 local timestamps with the date and time-of-day part formatted once per second.
+
+    Event timestamps move forward monotonically, so consecutive events almost always share
+    the same second and only the microseconds need formatting.
+    """
+
+    def __init__(self):
+        self.second = None
+        self.prefix = ''
+
+    def now(self) -> str:
+        """
+        Returns:
+            str: The current local time, e.g. '2025-06-01T12:34:56.789012'.
+        """
+        now = time.time()
+        second = int(now)
+        if second != self.second:
+            self.prefix = datetime.fromtimestamp(second).isoformat()
+            self.second = second
+        return f'{self.prefix}.{int((now - second) * 1_000_000):06d}'
+
+
+timestamps = TimestampFormatter()
+
+
+def _encode_value(value: Any) -> str:
+    # Strings and scalars are by far the common case; everything else goes through the encoder
+    if type(value) is str:
+        return encode_basestring(value)
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if value is None:
+        return 'null'
+    if type(value) is int:
+        return str(value)
+    return dumps(value)
+
+
+class EventEnvelope:
+    """
+    Pre-encoded JSON for a family of events whose constant fields do not change within a turn.
+
+    The constant fields (e.g. type, session and turn IDs) and the keys of the variable ones are
+    encoded once; each event then only encodes its variable values, so per-chunk work is
+    escaping the delta text rather than re-serializing the whole object. With orjson the
+    whole event is handed to its C encoder instead, which beats splicing strings in Python.
+    """
+
+    def __init__(self, constant: Dict[str, Any], fields: Iterable[str]):
+        """
+        Args:
+            constant (Dict[str, Any]): Fields shared by every event of the family.
+            fields (Iterable[str]): Names of the per-event fields, in output order.
+        """
+        prefix = dumps(constant)[:-1]
+        self.prefix = prefix
+        self.keys = []
+        for field in fields:
+            separator = '' if prefix == '{' and not self.keys else ','
+            self.keys.append((field, f'{separator}{dumps(field)}:'))
+
+    def encode(self, event: Dict[str, Any]) -> str:
+        """
+        Encode one event.
+
+        Args:
+            event (Dict[str, Any]): The complete event, constant fields included.
+
+        Returns:
+            str: The event as JSON text.
+        """
+        if USE_ORJSON:
+            return orjson.dumps(event).decode()
+        parts = [self.prefix]
+        for field, key in self.keys:
+            parts.append(key)
+            parts.append(_encode_value(event[field]))
+        parts.append('}')
+        return ''.join(parts)
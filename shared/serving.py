@@ -0,0 +1,83 @@
+from colorama import Style
+from colorama import Fore
+from colorama import init 
+from typing import Optional
+from typing import Any
+import asyncio
+import uvicorn
+import os
+
+# Initialize colorama for cross-platform colored output
+init(autoreset=True)
+
+try:
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config as HypercornConfig
+except ImportError:  # HTTP/2 serving is optional
+    hypercorn_serve = None
+    HypercornConfig = None
+
+
+# Serving mode for the HTTP servers:
+#   http1 - uvicorn, HTTP/1.1 (default)
+#   h2c   - hypercorn, cleartext HTTP/2 (prior knowledge or Upgrade) alongside HTTP/1.1
+#   h2    - hypercorn, HTTP/2 over TLS negotiated with ALPN (needs SSL_CERTFILE and SSL_KEYFILE)
+HTTP_MODE = os.environ.get('HTTP_MODE', 'http1').lower()
+SSL_CERTFILE = os.environ.get('SSL_CERTFILE')
+SSL_KEYFILE = os.environ.get('SSL_KEYFILE')
+
+
+def describe_http_mode(mode: Optional[str] = None) -> str:
+    """
+    Human-readable name of a serving mode, for startup banners.
+
+    Args:
+        mode (Optional[str]): The serving mode; defaults to HTTP_MODE.
+
+    Returns:
+        str: e.g. 'HTTP/1.1', 'HTTP/2 (h2c)' or 'HTTP/2 (TLS)'.
+    """
+    mode = mode or HTTP_MODE
+    return {'h2c': 'HTTP/2 (h2c)', 'h2': 'HTTP/2 (TLS)'}.get(mode, 'HTTP/1.1')
+
+
+def run_server(app: Any, host: str, port: int, log_level: str = 'info', access_log: bool = False, mode: Optional[str] = None, **uvicorn_options):
+    """
+    Run an ASGI app over HTTP/1.1 with uvicorn or over HTTP/2 with hypercorn.
+
+    Falls back to uvicorn (HTTP/1.1) when hypercorn is not installed or TLS files are missing.
+
+    Args:
+        app (Any): The ASGI application.
+        host (str): Interface to bind.
+        port (int): Port to bind.
+        log_level (str): Server log level.
+        access_log (bool): Whether the server should write access logs.
+        mode (Optional[str]): 'http1', 'h2c' or 'h2'; defaults to the HTTP_MODE environment variable.
+        **uvicorn_options: Extra keyword arguments for uvicorn.run in HTTP/1.1 mode.
+    """
+    mode = (mode or HTTP_MODE).lower()
+
+    if mode in ('h2c', 'h2'):
+        if hypercorn_serve is None:
+            print(f"{Fore.YELLOW}WARNING: HTTP/2 mode needs hypercorn (pip install hypercorn); falling back to HTTP/1.1.{Style.RESET_ALL}")
+            mode = 'http1'
+        elif mode == 'h2' and not (SSL_CERTFILE and SSL_KEYFILE):
+            print(f"{Fore.RED}ERROR: HTTP/2 over TLS needs SSL_CERTFILE and SSL_KEYFILE; falling back to HTTP/1.1.{Style.RESET_ALL}")
+            mode = 'http1'
+
+    if mode not in ('h2c', 'h2'):
+        uvicorn.run(app, host=host, port=port, log_level=log_level, access_log=access_log, **uvicorn_options)
+        return
+
+    config = HypercornConfig()
+    config.bind = [f"{host}:{port}"]
+    config.loglevel = log_level.upper()
+    config.accesslog = '-' if access_log else None
+    if mode == 'h2':
+        config.certfile = SSL_CERTFILE
+        config.keyfile = SSL_KEYFILE
+        config.alpn_protocols = ['h2', 'http/1.1']
+
+    print(f"{Fore.CYAN}INFO: Serving {describe_http_mode(mode)} with hypercorn on {host}:{port}.{Style.RESET_ALL}")
+    asyncio.run(hypercorn_serve(app, config))
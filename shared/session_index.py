@@ -0,0 +1,180 @@
+from datetime import datetime
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+import binascii
+import bisect
+import base64
+import json
+import os
+
+
+SESSIONS_PAGE_SIZE = int(os.environ.get('SESSIONS_PAGE_SIZE', '100'))      # sessions per page when no limit is given
+SESSIONS_MAX_PAGE_SIZE = int(os.environ.get('SESSIONS_MAX_PAGE_SIZE', '1000'))  # largest limit a client may ask for
+
+SORT_FIELDS = ('created_at', 'last_activity')
+SORT_ORDERS = ('asc', 'desc')
+
+
+class SessionIndex:
+    """
+    Ordered secondary indexes over the live sessions, for paginated listing.
+
+    For every sort field the index keeps a sorted list of ``(timestamp, session_id)``
+    keys over all sessions, and another per model, so filtering by model never scans
+    the sessions of other models. A page is one binary search plus a slice:
+    O(log n + page size). Updates are a binary search plus a list insert or delete.
+
+    Cursors are opaque tokens naming the last key returned, so a page picks up right
+    after it even if sessions were created or deleted in between. A session whose
+    last_activity moved while a client was paging may show up twice or not at all,
+    which is inherent to sorting by a mutable field.
+    """
+
+    def __init__(self):
+        self.keys: Dict[str, Dict[str, object]] = {}  # session_id -> {'model': ..., 'created_at': ts, 'last_activity': ts}
+        self.orders: Dict[Optional[str], Dict[str, List[Tuple[float, str]]]] = {None: {field: [] for field in SORT_FIELDS}}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.keys
+
+    def _lists(self, model: str):
+        if model not in self.orders:
+            self.orders[model] = {field: [] for field in SORT_FIELDS}
+        return self.orders[None], self.orders[model]
+
+    def add(self, session_id: str, model: str, created_at: datetime, last_activity: Optional[datetime] = None):
+        """
+        Index a new session.
+
+        Args:
+            session_id (str): The session ID.
+            model (str): The session's model, for filtering.
+            created_at (datetime): Creation time.
+            last_activity (Optional[datetime]): Last activity time (defaults to created_at).
+        """
+        if session_id in self.keys:
+            self.remove(session_id)
+        keys = {
+            'model': model,
+            'created_at': created_at.timestamp(),
+            'last_activity': (last_activity or created_at).timestamp()
+        }
+        self.keys[session_id] = keys
+        for lists in self._lists(model):
+            for field in SORT_FIELDS:
+                bisect.insort(lists[field], (keys[field], session_id))
+
+    def touch(self, session_id: str, last_activity: datetime):
+        """
+        Move a session to its new position in the last_activity order.
+
+        Args:
+            session_id (str): The session ID.
+            last_activity (datetime): The new last activity time.
+        """
+        keys = self.keys.get(session_id)
+        if keys is None:
+            return
+        old = (keys['last_activity'], session_id)
+        keys['last_activity'] = last_activity.timestamp()
+        for lists in self._lists(keys['model']):
+            order = lists['last_activity']
+            position = bisect.bisect_left(order, old)
+            if position < len(order) and order[position] == old:
+                del order[position]
+            bisect.insort(order, (keys['last_activity'], session_id))
+
+    def remove(self, session_id: str):
+        """
+        Drop a session from every index.
+
+        Args:
+            session_id (str): The session ID.
+        """
+        keys = self.keys.pop(session_id, None)
+        if keys is None:
+            return
+        model = keys['model']
+        for lists in self._lists(model):
+            for field in SORT_FIELDS:
+                order = lists[field]
+                key = (keys[field], session_id)
+                position = bisect.bisect_left(order, key)
+                if position < len(order) and order[position] == key:
+                    del order[position]
+        if not self.orders[model]['created_at']:
+            del self.orders[model]
+
+    def page(self, sort: str = 'created_at', order: str = 'asc', model: Optional[str] = None,
+             limit: Optional[int] = None, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str], int]:
+        """
+        Return one page of session IDs.
+
+        Args:
+            sort (str): 'created_at' or 'last_activity'.
+            order (str): 'asc' or 'desc'.
+            model (Optional[str]): Only sessions using this model.
+            limit (Optional[int]): Page size (defaults to SESSIONS_PAGE_SIZE, capped at SESSIONS_MAX_PAGE_SIZE).
+            cursor (Optional[str]): The next_cursor of the previous page.
+
+        Returns:
+            Tuple[List[str], Optional[str], int]: Session IDs, the cursor for the next page
+            (None on the last page), and how many sessions match the filter.
+
+        Raises:
+            ValueError: If the sort, order, limit or cursor is invalid.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)}")
+        if order not in SORT_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(SORT_ORDERS)}")
+        limit = SESSIONS_PAGE_SIZE if not limit else limit
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        limit = min(limit, SESSIONS_MAX_PAGE_SIZE)
+
+        keys = self.orders.get(model or None, {}).get(sort, [])
+        after = decode_cursor(cursor, sort, order, model) if cursor else None
+
+        if order == 'asc':
+            start = bisect.bisect_right(keys, after) if after else 0
+            selected = keys[start:start + limit]
+            more = start + limit < len(keys)
+        else:
+            end = bisect.bisect_left(keys, after) if after else len(keys)
+            selected = keys[max(0, end - limit):end][::-1]
+            more = end - limit > 0
+
+        next_cursor = encode_cursor(sort, order, model, selected[-1]) if more and selected else None
+        return [session_id for _, session_id in selected], next_cursor, len(keys)
+
+
+def encode_cursor(sort: str, order: str, model: Optional[str], key: Tuple[float, str]) -> str:
+    """
+    Encode the position after ``key`` as an opaque URL-safe token.
+    """
+    raw = json.dumps([sort, order, model or '', key[0], key[1]], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str, order: str, model: Optional[str]) -> Tuple[float, str]:
+    """
+    Decode a cursor, checking that it belongs to the same sort, order and filter.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for a different query.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_order, cursor_model, timestamp, session_id = json.loads(raw)
+        key = (float(timestamp), str(session_id))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if (cursor_sort, cursor_order, cursor_model) != (sort, order, model or ''):
+        raise ValueError("Cursor does not match the sort, order and model of this query")
+    return key
@@ -0,0 +1,110 @@
+from typing import Hashable
+from typing import Dict
+from typing import List
+from typing import Set
+import math
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel for large numbers of resettable deadlines.
+
+    Deadlines are filed into fixed-width slots that span at least ``max_timeout``,
+    so advancing the wheel only visits the slots that have come due. Pushing a
+    deadline further out (e.g. on every received frame) only updates a dict; the
+    entry is re-filed lazily when its old slot comes due. Advancing therefore costs
+    O(expired + re-filed) rather than O(timers), and each live timer is re-filed at
+    most once per timeout period.
+    """
+
+    def __init__(self, tick: float, max_timeout: float):
+        """
+        Args:
+            tick (float): Slot width in seconds; deadlines fire up to one tick late.
+            max_timeout (float): Longest deadline (in seconds from now) the wheel must hold without re-filing.
+        """
+        self.tick = tick
+        self.slots: List[Set[Hashable]] = [set() for _ in range(math.ceil(max_timeout / tick) + 2)]
+        self.deadlines: Dict[Hashable, float] = {}
+        self.filed_at: Dict[Hashable, int] = {}
+        self.current_tick: int = None
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.deadlines
+
+    def _file(self, key: Hashable, deadline: float):
+        tick_index = math.ceil(deadline / self.tick)
+        if self.current_tick is not None:
+            # Never file into a slot that has already been passed, nor beyond one lap of the wheel
+            tick_index = min(max(tick_index, self.current_tick + 1), self.current_tick + len(self.slots) - 1)
+        self.slots[tick_index % len(self.slots)].add(key)
+        self.filed_at[key] = tick_index
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        Set (or move) the deadline for a key.
+
+        Args:
+            key (Hashable): Timer identifier.
+            deadline (float): Absolute expiry time on the same clock passed to ``advance``.
+        """
+        self.deadlines[key] = deadline
+        filed_tick = self.filed_at.get(key)
+        if filed_tick is not None and filed_tick <= math.ceil(deadline / self.tick):
+            return  # Already filed no later than the new deadline; re-filed when that slot fires
+
+        if filed_tick is not None:
+            self.slots[filed_tick % len(self.slots)].discard(key)
+        self._file(key, deadline)
+
+    def cancel(self, key: Hashable):
+        """
+        Remove a key's timer if it has one.
+
+        Args:
+            key (Hashable): Timer identifier.
+        """
+        self.deadlines.pop(key, None)
+        filed_tick = self.filed_at.pop(key, None)
+        if filed_tick is not None:
+            self.slots[filed_tick % len(self.slots)].discard(key)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """
+        Move the wheel to ``now`` and collect the timers that have expired.
+
+        Args:
+            now (float): Current time on the clock used for deadlines.
+
+        Returns:
+            List[Hashable]: Keys whose deadlines passed; they are removed from the wheel.
+        """
+        target_tick = math.floor(now / self.tick)
+        if self.current_tick is None:
+            self.current_tick = target_tick - 1
+
+        expired = []
+        # After a long stall only one lap needs visiting: every slot is covered once
+        start_tick = max(self.current_tick + 1, target_tick - len(self.slots) + 1)
+        for tick_index in range(start_tick, target_tick + 1):
+            self.current_tick = tick_index
+            slot = self.slots[tick_index % len(self.slots)]
+            if not slot:
+                continue
+            due, slot_keys = [], list(slot)
+            slot.clear()
+            for key in slot_keys:
+                del self.filed_at[key]
+                if self.deadlines[key] <= now:
+                    due.append(key)
+                else:
+                    self._file(key, self.deadlines[key])
+            for key in due:
+                del self.deadlines[key]
+            expired.extend(due)
+
+        self.current_tick = target_tick
+        return expired